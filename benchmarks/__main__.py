@@ -0,0 +1,83 @@
+import json
+import platform
+import tempfile
+from argparse import ArgumentParser
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+from benchmarks.pipeline import run_benchmark
+
+if __name__ == "__main__":
+    parser = ArgumentParser()
+    parser.add_argument(
+        "--scenarios",
+        help="Benchmark sizes as n_matches:n_teams",
+        type=str,
+        nargs="+",
+        default=["10000:50", "100000:500", "1000000:5000"],
+    )
+    parser.add_argument(
+        "--model",
+        help="Saved XGBoost model for the predict stage",
+        type=Path,
+        default=Path("hist_model.json"),
+    )
+    parser.add_argument("--n_fixtures", type=int, default=1000)
+    parser.add_argument(
+        "--no_memory",
+        help="Skip the tracemalloc run that records peak memory",
+        action="store_true",
+    )
+    parser.add_argument("--output_file", type=Path, default="benchmarks.json")
+    parser.add_argument(
+        "--compare",
+        help="Earlier benchmark output to compare against",
+        type=Path,
+        default=None,
+    )
+
+    args = parser.parse_args()
+    model_path = args.model if args.model.exists() else None
+    if model_path is None:
+        print(f"No model at {args.model}, skipping the predict stage")
+
+    rows = []
+    for scenario in args.scenarios:
+        n_matches, n_teams = (int(value) for value in scenario.split(":"))
+        print(f"Benchmarking {n_matches} matches between {n_teams} teams...")
+        with tempfile.TemporaryDirectory() as output_dir:
+            rows += run_benchmark(
+                n_matches,
+                n_teams,
+                Path(output_dir),
+                model_path=model_path,
+                trace_memory=not args.no_memory,
+                n_fixtures=args.n_fixtures,
+            )
+
+    benchmark = pd.DataFrame(rows)
+    if args.compare is not None:
+        with open(args.compare) as fp:
+            previous = pd.DataFrame(json.load(fp)["results"])
+        benchmark = benchmark.merge(
+            previous[["n_matches", "n_teams", "stage", "seconds"]],
+            on=["n_matches", "n_teams", "stage"],
+            how="left",
+            suffixes=("", "_previous"),
+        )
+        benchmark["ratio"] = benchmark["seconds"] / benchmark["seconds_previous"]
+    print(benchmark.to_string(index=False))
+
+    with open(args.output_file, "w") as fp:
+        json.dump(
+            {
+                "created": datetime.now().isoformat(timespec="seconds"),
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "results": rows,
+            },
+            fp,
+            indent=2,
+        )
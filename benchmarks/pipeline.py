@@ -0,0 +1,119 @@
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import pandas as pd
+
+from benchmarks.synthetic import generate_fixtures, generate_results
+from model.results import ResultsDataset
+from readers.kaggle import read_kaggle_data
+
+STAGES = [
+    "read_kaggle_data",
+    "populate_data_from_df",
+    "calculate_ratings",
+    "write_results_to_csv",
+    "create_test_df",
+    "predict",
+]
+
+
+def measure(fn: Callable, trace_memory: bool = False):
+    """Run ``fn`` and return its result, wall time and peak traced memory."""
+    if trace_memory:
+        tracemalloc.start()
+    try:
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1] if trace_memory else None
+    finally:
+        if trace_memory:
+            tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def run_pipeline(
+    results_csv: Path,
+    fixtures: pd.DataFrame,
+    output_dir: Path,
+    model_path: Optional[Path] = None,
+    trace_memory: bool = False,
+) -> Dict[str, Dict]:
+    """Time each stage of ingestion, feature generation and prediction.
+
+    The first three stages together are ``create_dataset_from_file``.
+    """
+    stages = {}
+
+    def run(name: str, fn: Callable):
+        result, elapsed, peak = measure(fn, trace_memory)
+        stages[name] = {"seconds": elapsed, "peak_bytes": peak}
+        return result
+
+    df = run("read_kaggle_data", lambda: read_kaggle_data(results_csv))
+    results = ResultsDataset()
+    run("populate_data_from_df", lambda: results.populate_data_from_df(df, True))
+    run("calculate_ratings", results.calculate_ratings)
+
+    training_csv = output_dir / "training_data.csv"
+    run("write_results_to_csv", lambda: results.write_results_to_csv(training_csv))
+    test_df = run("create_test_df", lambda: results.create_test_df(fixtures))
+
+    if model_path is not None:
+        from xgboost import XGBClassifier
+
+        from predictors.xgb_forest import process_input_data
+
+        model = XGBClassifier()
+        model.load_model(model_path)
+        features = pd.read_csv(training_csv)
+        run(
+            "predict",
+            lambda: (
+                model.predict_proba(process_input_data(features)),
+                model.predict_proba(process_input_data(test_df)),
+            ),
+        )
+
+    return stages
+
+
+def run_benchmark(
+    n_matches: int,
+    n_teams: int,
+    output_dir: Path,
+    model_path: Optional[Path] = None,
+    trace_memory: bool = True,
+    n_fixtures: int = 1000,
+    seed: int = 0,
+) -> List[Dict]:
+    """Benchmark the pipeline on synthetic results.
+
+    Timings come from a run without tracemalloc, which slows allocation
+    heavy code down, and peak memory from a second, traced run.
+    """
+    results_csv = output_dir / "results.csv"
+    generate_results(n_matches, n_teams, seed=seed).to_csv(results_csv, index=False)
+    fixtures = generate_fixtures(n_teams, n_fixtures, seed=seed)
+
+    timed = run_pipeline(results_csv, fixtures, output_dir, model_path)
+    traced = (
+        run_pipeline(results_csv, fixtures, output_dir, model_path, trace_memory=True)
+        if trace_memory
+        else {}
+    )
+    return [
+        {
+            "n_matches": n_matches,
+            "n_teams": n_teams,
+            "stage": stage,
+            "seconds": timed[stage]["seconds"],
+            "peak_mb": (
+                traced[stage]["peak_bytes"] / 2**20 if stage in traced else None
+            ),
+        }
+        for stage in STAGES
+        if stage in timed
+    ]
@@ -0,0 +1,68 @@
+from datetime import datetime
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+# One event per MatchType, weighted roughly like the real results file
+TOURNAMENTS = {
+    "Friendly": 0.35,
+    "Olympic Games": 0.15,
+    "Algarve Cup": 0.15,
+    "Euro": 0.1,
+    "FIFA World Cup": 0.1,
+    "FIFA World Cup qualification": 0.15,
+}
+
+
+def team_names(n_teams: int) -> np.ndarray:
+    return np.array([f"Team {i:05d}" for i in range(n_teams)], dtype=object)
+
+
+def generate_results(
+    n_matches: int,
+    n_teams: int,
+    start: datetime = datetime(1970, 1, 1),
+    end: datetime = datetime(2023, 7, 1),
+    seed: Optional[int] = 0,
+) -> pd.DataFrame:
+    """Random results in the format of the Kaggle results file.
+
+    Teams get a fixed strength and goals are Poisson distributed around the
+    strength difference, so ratings and rankings spread out like real ones.
+    """
+    rng = np.random.default_rng(seed)
+    names = team_names(n_teams)
+    strength = rng.normal(0, 0.5, n_teams)
+
+    home = rng.integers(0, n_teams, n_matches)
+    away = (home + rng.integers(1, n_teams, n_matches)) % n_teams
+    days = np.sort(rng.integers(0, (end - start).days, n_matches))
+    dates = np.datetime64(start.date(), "D") + days
+
+    difference = strength[home] - strength[away]
+    tournaments = rng.choice(list(TOURNAMENTS), n_matches, p=list(TOURNAMENTS.values()))
+    return pd.DataFrame(
+        {
+            "date": np.datetime_as_string(dates),
+            "home_team": names[home],
+            "away_team": names[away],
+            "home_score": rng.poisson(np.exp(0.3 + difference)),
+            "away_score": rng.poisson(np.exp(0.3 - difference)),
+            "tournament": tournaments,
+            "city": names[home],
+            "country": names[home],
+            "neutral": rng.random(n_matches) < 0.3,
+        }
+    )
+
+
+def generate_fixtures(
+    n_teams: int, n_fixtures: int, seed: Optional[int] = 0
+) -> pd.DataFrame:
+    """Random pairings in the format of the submission template."""
+    rng = np.random.default_rng(seed)
+    names = team_names(n_teams)
+    team1 = rng.integers(0, n_teams, n_fixtures)
+    team2 = (team1 + rng.integers(1, n_teams, n_fixtures)) % n_teams
+    return pd.DataFrame({"team1": names[team1], "team2": names[team2]})
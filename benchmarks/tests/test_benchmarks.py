@@ -0,0 +1,26 @@
+from benchmarks.pipeline import STAGES, run_benchmark
+from benchmarks.synthetic import generate_fixtures, generate_results
+
+
+def test_generate_results():
+    df = generate_results(500, 20, seed=1)
+
+    assert len(df) == 500
+    assert (df["home_team"] != df["away_team"]).all()
+    assert df["date"].is_monotonic_increasing
+    assert df["home_team"].nunique() == 20
+    assert generate_results(500, 20, seed=1).equals(df)
+
+
+def test_generate_fixtures():
+    fixtures = generate_fixtures(20, 50)
+
+    assert list(fixtures.columns) == ["team1", "team2"]
+    assert (fixtures["team1"] != fixtures["team2"]).all()
+
+
+def test_run_benchmark(tmp_path):
+    rows = run_benchmark(300, 10, tmp_path, n_fixtures=20)
+
+    assert [row["stage"] for row in rows] == STAGES[:-1]
+    assert all(row["seconds"] > 0 and row["peak_mb"] > 0 for row in rows)
@@ -1,18 +1,103 @@
+import pickle
 from pathlib import Path
+from typing import Optional
 
+from model.instrumentation import timed
 from model.results import ResultsDataset
+from model.snapshot import load_snapshot, save_snapshot
+from readers.database import read_database_chunks
 from readers.kaggle import read_kaggle_data
 
 
-def create_dataset_from_file(csv_file: Path) -> ResultsDataset:
+@timed("create_dataset_from_file")
+def create_dataset_from_file(
+    csv_file: Path,
+    columnar: bool = True,
+    state_file: Optional[Path] = None,
+    snapshot: Optional[Path] = None,
+    chunksize: Optional[int] = None,
+) -> ResultsDataset:
+    """Compute a dataset from a results file, resuming from saved state if any.
+
+    ``state_file`` is a pickled dataset and ``snapshot`` a snapshot directory;
+    only one of them can be given. Results in the file that the saved state
+    does not have yet are appended and the state saved again. With
+    ``chunksize``, the file is read and appended about that many rows at a
+    time rather than all at once.
+    """
+    if state_file is not None and snapshot is not None:
+        raise ValueError("Pass either a state file or a snapshot, not both")
+
+    if state_file is not None and Path(state_file).exists():
+        results = load_dataset(state_file)
+        _append_file(results, csv_file, chunksize)
+        save_dataset(results, state_file)
+        return results
+
+    if snapshot is not None and (Path(snapshot) / "manifest.json").exists():
+        # Not memory-mapped, as the snapshot files may be rewritten below
+        results = load_snapshot(snapshot, mmap=False)
+        if _append_file(results, csv_file, chunksize):
+            save_snapshot(results, snapshot)
+        return results
+
     results = ResultsDataset()
-    df = read_kaggle_data(csv_file)
+    if chunksize is None:
+        df = read_kaggle_data(csv_file)
+        results.populate_data_from_df(df, columnar=columnar)
+        results.calculate_ratings()
+    else:
+        _append_file(results, csv_file, chunksize)
+
+    if state_file is not None:
+        save_dataset(results, state_file)
+    if snapshot is not None:
+        save_snapshot(results, snapshot)
+
+    return results
 
-    results.populate_data_from_df(df)
-    results.calculate_ratings()
 
+def _append_file(
+    results: ResultsDataset, csv_file: Path, chunksize: Optional[int]
+) -> int:
+    if chunksize is None:
+        return results.append_data_from_df(read_kaggle_data(csv_file))
+    return sum(
+        results.append_data_from_df(df)
+        for df in read_kaggle_data(csv_file, chunksize=chunksize)
+    )
+
+
+@timed("create_dataset_from_db")
+def create_dataset_from_db(
+    conn,
+    results: Optional[ResultsDataset] = None,
+    chunk_size: int = 50_000,
+    **kwargs,
+) -> ResultsDataset:
+    """Add the scraped results in a database to ``results``, or a new dataset.
+
+    Rows are streamed in chunks and appended as they arrive, without
+    collecting them into one frame or a CSV first.
+    """
+    if results is None:
+        results = ResultsDataset()
+    for df in read_database_chunks(conn, chunk_size=chunk_size, **kwargs):
+        results.append_data_from_df(df)
     return results
 
 
+@timed("save_dataset")
+def save_dataset(results: ResultsDataset, state_file: Path) -> None:
+    with open(state_file, "wb") as fp:
+        pickle.dump(results, fp, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+@timed("load_dataset")
+def load_dataset(state_file: Path) -> ResultsDataset:
+    with open(state_file, "rb") as fp:
+        return pickle.load(fp)
+
+
 if __name__ == "__main__":
     results = create_dataset_from_file(Path("../data/results.csv"))
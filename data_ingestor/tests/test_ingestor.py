@@ -1,7 +1,11 @@
-from pytest import fixture
+from datetime import datetime
 
-from data_ingestor.ingestor import create_dataset_from_file
+from pytest import fixture, raises
+
+from data_ingestor.ingestor import create_dataset_from_file, load_dataset
 from model.entities import Tournament
+from model.instrumentation import instrumentation
+from model.snapshot import load_snapshot
 
 
 @fixture(scope="session")
@@ -24,3 +28,92 @@ def test_create_dataset_from_file(dummy_csv_file):
     assert len(results.events) == 1
     assert len(results.tournaments) == 1
     assert results.tournaments[0] == Tournament(name="Euro", year=1969)
+
+
+def test_columnar_ingestion_matches_row_ingestion(tmp_path, dummy_csv_file):
+    csv_file = tmp_path / "mixed.csv"
+    with open(csv_file, "w") as fp:
+        fp.write(dummy_csv_file.read_text())
+        fp.write("1970-05-01,France,Denmark,2,2,Friendly,Reims,France,FALSE\n")
+        fp.write("1971-05-01,Italy,England,0,1,FIFA World Cup,Rome,Italy,FALSE\n")
+    results = create_dataset_from_file(csv_file, columnar=False)
+    columnar_results = create_dataset_from_file(csv_file, columnar=True)
+
+    # MatchType members all compare equal, so match equality ignores the type
+    assert [match.type.name for match in columnar_results.matches] == [
+        "CONTINENTAL",
+        "CONTINENTAL",
+        "FRIENDLY",
+        "WORLD_CUP",
+    ]
+    assert [match.type.name for match in results.matches] == [
+        match.type.name for match in columnar_results.matches
+    ]
+    assert columnar_results.matches == results.matches
+    assert columnar_results.teams == results.teams
+    assert columnar_results.tournaments == results.tournaments
+
+
+def test_create_dataset_from_file_appends_to_state(tmp_path, dummy_csv_file):
+    state_file = tmp_path / "results.pkl"
+    create_dataset_from_file(dummy_csv_file, state_file=state_file)
+
+    updated_csv_file = tmp_path / "updated.csv"
+    with open(updated_csv_file, "w") as fp:
+        fp.write(dummy_csv_file.read_text())
+        fp.write("1970-05-01,France,Denmark,2,2,Euro,Reims,France,FALSE\n")
+
+    results = create_dataset_from_file(updated_csv_file, state_file=state_file)
+    expected = create_dataset_from_file(updated_csv_file)
+
+    assert len(results.matches) == 3
+    assert results.matches == expected.matches
+    assert results.get_world_ranking(
+        "France", datetime(1970, 5, 1)
+    ) == expected.get_world_ranking("France", datetime(1970, 5, 1))
+    assert load_dataset(state_file).matches == expected.matches
+
+
+def test_create_dataset_from_file_appends_to_snapshot(tmp_path, dummy_csv_file):
+    snapshot = tmp_path / "snapshot"
+    create_dataset_from_file(dummy_csv_file, snapshot=snapshot)
+
+    updated_csv_file = tmp_path / "updated.csv"
+    with open(updated_csv_file, "w") as fp:
+        fp.write(dummy_csv_file.read_text())
+        fp.write("1970-05-01,France,Denmark,2,2,Euro,Reims,France,FALSE\n")
+
+    results = create_dataset_from_file(updated_csv_file, snapshot=snapshot)
+    expected = create_dataset_from_file(updated_csv_file)
+
+    assert results.matches == expected.matches
+    assert load_snapshot(snapshot).matches == expected.matches
+    assert load_snapshot(snapshot).get_world_ranking(
+        "France", datetime(1970, 5, 1)
+    ) == expected.get_world_ranking("France", datetime(1970, 5, 1))
+
+    with raises(ValueError):
+        create_dataset_from_file(
+            dummy_csv_file, state_file=tmp_path / "results.pkl", snapshot=snapshot
+        )
+
+
+def test_chunked_ingestion_matches_whole_file(tmp_path, dummy_csv_file):
+    csv_file = tmp_path / "results.csv"
+    with open(csv_file, "w") as fp:
+        fp.write(dummy_csv_file.read_text())
+        fp.write("1970-05-01,France,Denmark,2,2,Euro,Reims,France,FALSE\n")
+        fp.write("1970-05-01,England,Italy,1,1,Euro,London,England,FALSE\n")
+        fp.write("1971-05-01,Italy,England,0,1,FIFA World Cup,Rome,Italy,FALSE\n")
+
+    instrumentation.start()
+    chunked = create_dataset_from_file(csv_file, chunksize=1)
+    report = instrumentation.stop()
+    expected = create_dataset_from_file(csv_file)
+
+    assert "matches.late" not in report["counters"]
+    assert chunked.matches == expected.matches
+    assert chunked.teams == expected.teams
+    assert chunked.get_world_ranking(
+        "Italy", datetime(1971, 5, 1)
+    ) == expected.get_world_ranking("Italy", datetime(1971, 5, 1))
@@ -0,0 +1,77 @@
+from dataclasses import dataclass
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+from model.entities import Match, MatchType, Team
+
+MATCH_TYPES = list(MatchType)
+# MatchType members all compare equal (it is also a dataclass), so code by name
+MATCH_TYPE_CODES = {
+    match_type.name: code for code, match_type in enumerate(MATCH_TYPES)
+}
+
+
+@dataclass
+class MatchArrays:
+    """Integer-encoded matches in replay order, teams coded by position in ``team_names``."""
+
+    home: np.ndarray
+    away: np.ndarray
+    day: np.ndarray
+    home_score: np.ndarray
+    away_score: np.ndarray
+    k: np.ndarray
+    match_type: np.ndarray
+    team_names: List[str]
+
+    def __len__(self) -> int:
+        return len(self.home)
+
+    @classmethod
+    def from_matches(cls, matches: List[Match], teams: List[Team]) -> "MatchArrays":
+        team_codes = {team.name: code for code, team in enumerate(teams)}
+        return cls(
+            home=np.array(
+                [team_codes[match.home_team.name] for match in matches], dtype=np.int32
+            ),
+            away=np.array(
+                [team_codes[match.away_team.name] for match in matches], dtype=np.int32
+            ),
+            day=dates_to_days([match.date for match in matches]),
+            home_score=np.array(
+                [match.home_score for match in matches], dtype=np.int16
+            ),
+            away_score=np.array(
+                [match.away_score for match in matches], dtype=np.int16
+            ),
+            k=np.array([match.type.value for match in matches], dtype=np.int16),
+            match_type=np.array(
+                [MATCH_TYPE_CODES[match.type.name] for match in matches], dtype=np.int8
+            ),
+            team_names=[team.name for team in teams],
+        )
+
+
+def dates_to_days(dates) -> np.ndarray:
+    return (
+        pd.DatetimeIndex(dates).values.astype("datetime64[D]").astype(np.int64)
+        if len(dates)
+        else np.empty(0, dtype=np.int64)
+    )
+
+
+def days_to_dates(days: np.ndarray) -> pd.DatetimeIndex:
+    return pd.DatetimeIndex(np.asarray(days, dtype="datetime64[D]"))
+
+
+def dates_to_ns(dates) -> np.ndarray:
+    return pd.DatetimeIndex(dates).asi8 if len(dates) else np.empty(0, dtype=np.int64)
+
+
+def ns_to_dates(values: np.ndarray) -> List[pd.Timestamp]:
+    # Match dates repeat a lot, so only build one Timestamp per distinct value
+    unique, inverse = np.unique(np.asarray(values), return_inverse=True)
+    dates = pd.DatetimeIndex(unique.astype("datetime64[ns]")).tolist()
+    return [dates[idx] for idx in inverse.tolist()]
@@ -1,9 +1,8 @@
+from bisect import bisect_left, bisect_right
 from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
-from typing import Dict, Optional
-
-import matplotlib.pyplot as plt
+from typing import Iterator, List, Optional, Tuple
 
 _DEFAULT_RATING = 1500
 _RATINGS_START_DATE = datetime.strptime("01/01/1950", "%d/%m/%Y")
@@ -26,33 +25,106 @@ class Result(Enum):
     DRAW = 2
 
 
+class RatingTimeline:
+    """Ratings keyed by date, held as parallel date/rating lists kept in date order."""
+
+    def __init__(
+        self,
+        dates: Optional[List[datetime]] = None,
+        ratings: Optional[List[int]] = None,
+    ):
+        self.dates: List[datetime] = []
+        self.ratings: List[int] = []
+        for date, rating in zip(dates or [], ratings or []):
+            self[date] = rating
+
+    def __setitem__(self, date: datetime, rating: int) -> None:
+        if not self.dates or date > self.dates[-1]:
+            self.dates.append(date)
+            self.ratings.append(rating)
+            return
+        idx = bisect_left(self.dates, date)
+        if idx < len(self.dates) and self.dates[idx] == date:
+            self.ratings[idx] = rating
+        else:
+            self.dates.insert(idx, date)
+            self.ratings.insert(idx, rating)
+
+    def __getitem__(self, date: datetime) -> int:
+        idx = bisect_left(self.dates, date)
+        if idx < len(self.dates) and self.dates[idx] == date:
+            return self.ratings[idx]
+        raise KeyError(date)
+
+    def __contains__(self, date: datetime) -> bool:
+        idx = bisect_left(self.dates, date)
+        return idx < len(self.dates) and self.dates[idx] == date
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def __iter__(self) -> Iterator[datetime]:
+        return iter(self.dates)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, RatingTimeline):
+            return self.dates == other.dates and self.ratings == other.ratings
+        if isinstance(other, dict):
+            return dict(self.items()) == other
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"RatingTimeline({dict(self.items())!r})"
+
+    def get(self, date: datetime, default: Optional[int] = None) -> Optional[int]:
+        try:
+            return self[date]
+        except KeyError:
+            return default
+
+    def keys(self) -> List[datetime]:
+        return list(self.dates)
+
+    def values(self) -> List[int]:
+        return list(self.ratings)
+
+    def items(self) -> List[Tuple[datetime, int]]:
+        return list(zip(self.dates, self.ratings))
+
+    def index_as_of(self, date: datetime) -> int:
+        """Position of the last entry dated on or before ``date``, -1 if none."""
+        return bisect_right(self.dates, date) - 1
+
+    def as_of(self, date: datetime, default: Optional[int] = None) -> Optional[int]:
+        idx = self.index_as_of(date)
+        return self.ratings[idx] if idx >= 0 else default
+
+    def date_as_of(self, date: datetime) -> Optional[datetime]:
+        idx = self.index_as_of(date)
+        return self.dates[idx] if idx >= 0 else None
+
+
 @dataclass
 class Team:
     name: str
-    rating: Dict[datetime, int]
+    rating: RatingTimeline
 
     def __init__(self, name: str, initial_rating: Optional[int] = None):
         self.name = name
         if initial_rating:
-            self.rating = {_RATINGS_START_DATE: initial_rating}
+            self.rating = RatingTimeline([_RATINGS_START_DATE], [initial_rating])
         else:
-            self.rating = {_RATINGS_START_DATE: _DEFAULT_RATING}
+            self.rating = RatingTimeline([_RATINGS_START_DATE], [_DEFAULT_RATING])
 
     def update_rating(self, date: datetime, rating: int) -> None:
         self.rating[date] = rating
 
     def get_rating(self, date: datetime) -> Optional[int]:
-        if self.rating.get(date):
-            return self.rating[date]
-        else:
-            previous_rating = _DEFAULT_RATING
-            for key, rating in self.rating.items():
-                if date < key:
-                    break
-                previous_rating = rating
-            return previous_rating
+        return self.rating.as_of(date, _DEFAULT_RATING)
 
     def show_rating_history(self) -> None:
+        import matplotlib.pyplot as plt
+
         fig, ax = plt.subplots()
         plt.title(self.name)
         x = [x for x in self.rating.keys()]
@@ -61,12 +133,7 @@ class Team:
         plt.show()
 
     def get_last_played_date(self, date: datetime) -> Optional[datetime]:
-        last_played = None
-        for match_date in self.rating.keys():
-            if match_date > date:
-                return last_played
-            last_played = match_date
-        return last_played
+        return self.rating.date_as_of(date)
 
 
 @dataclass
@@ -93,20 +160,25 @@ class Match:
     type: MatchType = MatchType.OTHER_TOURNAMENTS
 
     def find_event_type(self, event_name: str) -> None:
-        if "qualifiers" in event_name.lower() or "qualification" in event_name.lower():
-            self.type = MatchType.QUALIFIERS
-        elif "world cup" in event_name.lower():
-            self.type = MatchType.WORLD_CUP
-        elif "olympic" in event_name.lower():
-            self.type = MatchType.OLYMPIC_GAMES
-        elif "friend" in event_name.lower():
-            self.type = MatchType.FRIENDLY
-        elif (
-            "concacaf" in event_name.lower()
-            or "copa america" in event_name.lower()
-            or "euro" in event_name.lower()
-            or "african cup" in event_name.lower()
-        ):
-            self.type = MatchType.CONTINENTAL
-        else:
-            self.type = MatchType.OTHER_TOURNAMENTS
+        self.type = classify_event_type(event_name)
+
+
+def classify_event_type(event_name: str) -> MatchType:
+    event_name = event_name.lower()
+    if "qualifiers" in event_name or "qualification" in event_name:
+        return MatchType.QUALIFIERS
+    elif "world cup" in event_name:
+        return MatchType.WORLD_CUP
+    elif "olympic" in event_name:
+        return MatchType.OLYMPIC_GAMES
+    elif "friend" in event_name:
+        return MatchType.FRIENDLY
+    elif (
+        "concacaf" in event_name
+        or "copa america" in event_name
+        or "euro" in event_name
+        or "african cup" in event_name
+    ):
+        return MatchType.CONTINENTAL
+    else:
+        return MatchType.OTHER_TOURNAMENTS
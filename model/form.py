@@ -0,0 +1,106 @@
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Tuple
+
+from model.entities import Match
+from model.instrumentation import timed
+
+
+@dataclass
+class TeamForm:
+    dates: List[datetime] = field(default_factory=list)
+    scored: List[int] = field(default_factory=lambda: [0])
+    conceded: List[int] = field(default_factory=lambda: [0])
+
+    def add(self, date: datetime, scored: int, conceded: int) -> None:
+        self.dates.append(date)
+        self.scored.append(self.scored[-1] + scored)
+        self.conceded.append(self.conceded[-1] + conceded)
+
+    def goals_between(self, start: int, end: int) -> Tuple[int, int]:
+        return (
+            self.scored[end] - self.scored[start],
+            self.conceded[end] - self.conceded[start],
+        )
+
+
+class FormIndex:
+    """Per-team match dates with cumulative goals scored and conceded.
+
+    Positions line up with ``ResultsDataset.matches_by_team`` so a bisect on the
+    dates also slices the team's match list.
+    """
+
+    def __init__(self):
+        self.teams: Dict[str, TeamForm] = defaultdict(TeamForm)
+        self.n_matches = 0
+
+    @classmethod
+    @timed("FormIndex.from_matches")
+    def from_matches(cls, matches: Iterable[Match]) -> "FormIndex":
+        index = cls()
+        for match in matches:
+            index.add_match(match)
+        return index
+
+    def add_match(self, match: Match) -> None:
+        self.teams[match.home_team.name].add(
+            match.date, match.home_score, match.away_score
+        )
+        self.teams[match.away_team.name].add(
+            match.date, match.away_score, match.home_score
+        )
+        self.n_matches += 1
+
+    def team(self, team_name: str) -> TeamForm:
+        return self.teams.get(team_name) or TeamForm()
+
+    def last_n_range(self, team_name: str, date: datetime, n_games: int) -> slice:
+        end = bisect_left(self.team(team_name).dates, date)
+        return slice(max(end - n_games, 0), end)
+
+    def window_range(self, team_name: str, date: datetime, n_days: int) -> slice:
+        dates = self.team(team_name).dates
+        start = bisect_right(dates, date - timedelta(days=n_days))
+        end = bisect_left(dates, date)
+        return slice(start, max(start, end))
+
+    def goals_in_last_n(
+        self, team_name: str, date: datetime, n_games: int = 5
+    ) -> Tuple[int, int]:
+        games = self.last_n_range(team_name, date, n_games)
+        return self.team(team_name).goals_between(games.start, games.stop)
+
+    def goals_in_window(
+        self, team_name: str, date: datetime, n_days: int = 90
+    ) -> Tuple[int, int]:
+        games = self.window_range(team_name, date, n_days)
+        return self.team(team_name).goals_between(games.start, games.stop)
+
+    def form_features(
+        self,
+        team_name: str,
+        date: datetime,
+        n_games: Iterable[int] = (5,),
+        n_days: Iterable[int] = (),
+    ) -> Dict[str, int]:
+        features = {}
+        for n in n_games:
+            games = self.last_n_range(team_name, date, n)
+            scored, conceded = self.team(team_name).goals_between(
+                games.start, games.stop
+            )
+            features[f"last_{n}_played"] = games.stop - games.start
+            features[f"last_{n}_scored"] = scored
+            features[f"last_{n}_conceded"] = conceded
+        for n in n_days:
+            games = self.window_range(team_name, date, n)
+            scored, conceded = self.team(team_name).goals_between(
+                games.start, games.stop
+            )
+            features[f"days_{n}_played"] = games.stop - games.start
+            features[f"days_{n}_scored"] = scored
+            features[f"days_{n}_conceded"] = conceded
+        return features
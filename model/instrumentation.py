@@ -0,0 +1,160 @@
+import cProfile
+import functools
+import io
+import json
+import pstats
+import time
+import tracemalloc
+from argparse import ArgumentParser, Namespace
+from collections import defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+
+class Instrumentation:
+    """Named timers and counters, optionally with cProfile and tracemalloc.
+
+    Everything is off until ``start`` is called. While disabled, ``timed``
+    functions only pay for one attribute check per call.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.timers: Dict[str, Dict[str, float]] = {}
+        self.counters: Dict[str, int] = defaultdict(int)
+        self._profiler: Optional[cProfile.Profile] = None
+        self._trace_memory = False
+        self._started = 0.0
+
+    def start(self, cpu_profile: bool = False, trace_memory: bool = False) -> None:
+        self.timers = {}
+        self.counters = defaultdict(int)
+        self.enabled = True
+        self._started = time.perf_counter()
+        self._trace_memory = trace_memory
+        if trace_memory:
+            tracemalloc.start()
+        if cpu_profile:
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+
+    def stop(self, n_entries: int = 30) -> Dict:
+        report = {
+            "wall_seconds": time.perf_counter() - self._started,
+            "timers": dict(sorted(self.timers.items())),
+            "counters": dict(sorted(self.counters.items())),
+        }
+        if self._profiler is not None:
+            self._profiler.disable()
+            report["profile"] = _profile_entries(self._profiler, n_entries)
+            self._profiler = None
+        if self._trace_memory:
+            snapshot = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            report["memory"] = {
+                "current_mb": current / 2**20,
+                "peak_mb": peak / 2**20,
+                "top": [
+                    {"location": str(stat.traceback), "mb": stat.size / 2**20}
+                    for stat in snapshot.statistics("lineno")[:n_entries]
+                ],
+            }
+            self._trace_memory = False
+        self.enabled = False
+        return report
+
+    def add_time(self, name: str, seconds: float, calls: int = 1) -> None:
+        timer = self.timers.get(name)
+        if timer is None:
+            timer = self.timers[name] = {"calls": 0, "seconds": 0.0}
+        timer["calls"] += calls
+        timer["seconds"] += seconds
+
+    def count(self, name: str, n: int = 1) -> None:
+        if self.enabled:
+            self.counters[name] += n
+
+    @contextmanager
+    def timer(self, name: str):
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - start)
+
+
+instrumentation = Instrumentation()
+
+
+def timed(name: str) -> Callable:
+    """Accumulate the time spent in the decorated function under ``name``."""
+
+    def decorator(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not instrumentation.enabled:
+                return fn(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                instrumentation.add_time(name, time.perf_counter() - start)
+
+        return wrapper
+
+    return decorator
+
+
+def add_profile_arguments(parser: ArgumentParser) -> None:
+    parser.add_argument(
+        "--profile",
+        help="Write a JSON report of stage timings and counters to this file",
+        type=Path,
+        default=None,
+    )
+    parser.add_argument(
+        "--profile_cpu",
+        help="Include cProfile statistics in the --profile report",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--profile_memory",
+        help="Include tracemalloc statistics in the --profile report",
+        action="store_true",
+    )
+
+
+def start_profile(args: Namespace) -> None:
+    if args.profile is not None:
+        instrumentation.start(
+            cpu_profile=args.profile_cpu, trace_memory=args.profile_memory
+        )
+
+
+def finish_profile(args: Namespace) -> None:
+    if args.profile is not None and instrumentation.enabled:
+        with open(args.profile, "w") as fp:
+            json.dump(instrumentation.stop(), fp, indent=2)
+        print(f"Profile written to {args.profile}")
+
+
+def _profile_entries(profiler: cProfile.Profile, n_entries: int):
+    stats = pstats.Stats(profiler, stream=io.StringIO()).sort_stats("cumulative")
+    entries = []
+    for function in stats.fcn_list[:n_entries]:
+        calls, _, total, cumulative, _ = stats.stats[function]
+        filename, line, name = function
+        entries.append(
+            {
+                "function": f"{filename}:{line}({name})",
+                "calls": calls,
+                "total_seconds": total,
+                "cumulative_seconds": cumulative,
+            }
+        )
+    return entries
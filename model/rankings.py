@@ -0,0 +1,189 @@
+import heapq
+from bisect import bisect_left, insort
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from model.arrays import dates_to_ns, ns_to_dates
+from model.instrumentation import timed
+
+
+class RankingEngine:
+    """World rankings maintained incrementally while matches are replayed.
+
+    Active teams are kept in a list sorted by (-rating, first seen), so a rank is
+    a bisect. Teams that have not played within ``n_years`` drop out of the
+    table until they play again. Ranks for teams on the days they played are
+    recorded so historical lookups for those days do not need a replay.
+
+    Only ``update`` and ``record`` move the engine forward; lookups for later
+    dates leave it untouched, so matches can still be added after them.
+    """
+
+    def __init__(self, n_years: int = 4):
+        self.window = timedelta(n_years * 365)
+        self.date: Optional[datetime] = None
+        self._table: List[Tuple[int, int]] = []
+        self._keys: Dict[str, Tuple[int, int]] = {}
+        self._order: Dict[str, int] = {}
+        self._last_played: Dict[str, datetime] = {}
+        self._expiry: List[Tuple[datetime, int, str]] = []
+        self._history: Dict[Tuple[str, datetime], int] = {}
+
+    def __len__(self) -> int:
+        return len(self._table)
+
+    @timed("RankingEngine.update")
+    def update(self, team_name: str, rating: int, date: datetime) -> None:
+        if self.date is not None and date < self.date:
+            raise ValueError(f"Ranking update for {date} is before {self.date}")
+        self.date = date
+
+        order = self._order.setdefault(team_name, len(self._order))
+        self._remove(team_name)
+        key = (-rating, order)
+        insort(self._table, key)
+        self._keys[team_name] = key
+        self._last_played[team_name] = date
+        heapq.heappush(self._expiry, (date, order, team_name))
+
+    def advance(self, date: datetime) -> None:
+        if self.date is None or date > self.date:
+            self.date = date
+        while self._expiry and date - self._expiry[0][0] >= self.window:
+            last_played, _, team_name = heapq.heappop(self._expiry)
+            if self._last_played.get(team_name) == last_played:
+                self._remove(team_name)
+
+    @timed("RankingEngine.record")
+    def record(self, date: datetime, team_names: Iterable[str]) -> None:
+        self.advance(date)
+        for team_name in team_names:
+            self._history[(team_name, date)] = self.current_rank(team_name)
+
+    def current_rank(self, team_name: str) -> Optional[int]:
+        key = self._keys.get(team_name)
+        if key is None:
+            return None
+        return bisect_left(self._table, key) + 1
+
+    def rank(self, team_name: str, date: datetime) -> Optional[int]:
+        if (team_name, date) in self._history:
+            return self._history[(team_name, date)]
+        if self.date is not None and date < self.date:
+            raise KeyError((team_name, date))
+        return self.ranks(date, [team_name])[0]
+
+    def ranks(self, date: datetime, team_names: Iterable[str]) -> List[Optional[int]]:
+        """Ranks on ``date``, no earlier than the engine, of ``team_names``.
+
+        Teams due to drop out by ``date`` are discounted from the bisect on
+        the table rather than the table being rebuilt.
+        """
+        expired = self._expired_keys(date)
+        expired_keys = sorted(expired.values())
+        ranks = []
+        for team_name in team_names:
+            key = self._keys.get(team_name)
+            if key is None or team_name in expired:
+                ranks.append(None)
+            else:
+                ranks.append(
+                    bisect_left(self._table, key) - bisect_left(expired_keys, key) + 1
+                )
+        return ranks
+
+    def rankings(self, date: datetime) -> Dict[str, int]:
+        expired = self._expired_keys(date)
+        team_names = list(self._order)
+        rankings = {}
+        for _, order in self._table:
+            team_name = team_names[order]
+            if team_name not in expired:
+                rankings[team_name] = len(rankings) + 1
+        return rankings
+
+    def _expired_keys(self, date: datetime) -> Dict[str, Tuple[int, int]]:
+        """Keys of the tabled teams that are out of the window on ``date``.
+
+        Walks the expiry heap from its root and only descends below entries
+        that are due, so the cost grows with the number of due entries rather
+        than with the table.
+        """
+        if self.date is not None and date < self.date:
+            raise KeyError(date)
+        cutoff = date - self.window
+        expired = {}
+        frontier = [(self._expiry[0], 0)] if self._expiry else []
+        while frontier:
+            (last_played, _, team_name), index = heapq.heappop(frontier)
+            if last_played > cutoff:
+                continue
+            if team_name in self._keys and self._last_played[team_name] == last_played:
+                expired[team_name] = self._keys[team_name]
+            for child in (2 * index + 1, 2 * index + 2):
+                if child < len(self._expiry):
+                    heapq.heappush(frontier, (self._expiry[child], child))
+        return expired
+
+    def _remove(self, team_name: str) -> None:
+        key = self._keys.pop(team_name, None)
+        if key is not None:
+            del self._table[bisect_left(self._table, key)]
+
+    def to_arrays(self, team_codes: Dict[str, int]) -> Dict[str, np.ndarray]:
+        team_names = list(self._order)
+        history = list(self._history.items())
+        return {
+            "team": np.array([team_codes[name] for name in team_names], dtype=np.int32),
+            "rating": np.array(
+                [-self._keys.get(name, (0, 0))[0] for name in team_names],
+                dtype=np.int64,
+            ),
+            "active": np.array([name in self._keys for name in team_names]),
+            "last_played": dates_to_ns(
+                [self._last_played[name] for name in team_names]
+            ),
+            "history_team": np.array(
+                [team_codes[name] for (name, _), _ in history], dtype=np.int32
+            ),
+            "history_date": dates_to_ns([date for (_, date), _ in history]),
+            "history_rank": np.array([rank for _, rank in history], dtype=np.int32),
+            "window_days": np.array([self.window.days]),
+            "date": dates_to_ns([self.date] if self.date is not None else []),
+        }
+
+    @classmethod
+    def from_arrays(
+        cls, arrays: Dict[str, np.ndarray], team_names: List[str]
+    ) -> "RankingEngine":
+        engine = cls()
+        engine.window = timedelta(days=int(arrays["window_days"][0]))
+        last_played = ns_to_dates(arrays["last_played"])
+        for order, (code, rating, active, date) in enumerate(
+            zip(
+                arrays["team"].tolist(),
+                arrays["rating"].tolist(),
+                arrays["active"].tolist(),
+                last_played,
+            )
+        ):
+            name = team_names[code]
+            engine._order[name] = order
+            engine._last_played[name] = date
+            if active:
+                engine._keys[name] = (-rating, order)
+                heapq.heappush(engine._expiry, (date, order, name))
+        engine._table = sorted(engine._keys.values())
+        engine._history = {
+            (team_names[code], date): rank
+            for code, date, rank in zip(
+                arrays["history_team"].tolist(),
+                ns_to_dates(arrays["history_date"]),
+                arrays["history_rank"].tolist(),
+            )
+        }
+        dates = ns_to_dates(arrays["date"])
+        engine.date = dates[0] if dates else None
+        return engine
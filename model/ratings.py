@@ -1,6 +1,12 @@
+from dataclasses import dataclass
 from datetime import timedelta
+from typing import Optional, Tuple
 
-from model.entities import Match
+import numpy as np
+
+from model.arrays import MatchArrays
+from model.entities import _DEFAULT_RATING, Match
+from model.instrumentation import timed
 
 
 class ELORater:
@@ -44,9 +50,153 @@ class ELORater:
         away_rating = match.away_team.get_rating(match.date - timedelta(days=1))
         return home_rating, away_rating
 
+    @timed("ELORater.update_ratings")
     def update_ratings(self, match: Match) -> None:
         home_rating, away_rating = self.get_ratings(match)
         points_change = self.calculate_points_change(match)
 
         match.home_team.update_rating(match.date, home_rating + int(points_change))
         match.away_team.update_rating(match.date, away_rating - int(points_change))
+
+
+DEFAULT_GOAL_INDEX = (1.5, 11, 8)
+
+
+@dataclass
+class EloTimeline:
+    home_before: np.ndarray
+    away_before: np.ndarray
+    home_after: np.ndarray
+    away_after: np.ndarray
+    expected: np.ndarray
+    ratings: np.ndarray
+
+
+def _replay_kernel(
+    home,
+    away,
+    day,
+    home_score,
+    away_score,
+    k,
+    goal_two,
+    goal_offset,
+    goal_scale,
+    ratings,
+    day_start,
+    last_day,
+    home_before,
+    away_before,
+    home_after,
+    away_after,
+    expected,
+):
+    for i in range(len(home)):
+        h = home[i]
+        a = away[i]
+        if last_day[h] < day[i]:
+            day_start[h] = ratings[h]
+            last_day[h] = day[i]
+        if last_day[a] < day[i]:
+            day_start[a] = ratings[a]
+            last_day[a] = day[i]
+
+        goal_difference = home_score[i] - away_score[i]
+        if abs(goal_difference) <= 1:
+            G = 1
+        elif abs(goal_difference) == 2:
+            G = goal_two
+        else:
+            G = (goal_offset + abs(goal_difference)) / goal_scale
+
+        if goal_difference > 0:
+            W = 1
+        elif goal_difference < 0:
+            W = 0
+        else:
+            W = 0.5
+
+        We = 1 / (10 ** (-(ratings[h] - ratings[a]) / 400) + 1)
+        points_change = int(k[i] * G * (W - We))
+
+        home_before[i] = day_start[h]
+        away_before[i] = day_start[a]
+        ratings[h] = day_start[h] + points_change
+        ratings[a] = day_start[a] - points_change
+        home_after[i] = ratings[h]
+        away_after[i] = ratings[a]
+        expected[i] = We
+
+
+_jit_replay_kernel = None
+
+
+def _get_jit_replay_kernel():
+    """Compile the replay kernel on first use, ``None`` without numba."""
+    global _jit_replay_kernel
+    if _jit_replay_kernel is None:
+        try:
+            from numba import njit
+        except ImportError:
+            _jit_replay_kernel = False
+        else:
+            _jit_replay_kernel = njit(cache=True)(_replay_kernel)
+    return _jit_replay_kernel or None
+
+
+@timed("replay_elo")
+def replay_elo(
+    matches: MatchArrays,
+    initial_ratings: Optional[np.ndarray] = None,
+    use_numba: bool = True,
+    k: Optional[np.ndarray] = None,
+    goal_index: Tuple[float, float, float] = DEFAULT_GOAL_INDEX,
+) -> EloTimeline:
+    n_teams = len(matches.team_names)
+    if initial_ratings is None:
+        initial_ratings = np.full(n_teams, _DEFAULT_RATING, dtype=np.int64)
+    if k is None:
+        k = matches.k
+    n_matches = len(matches)
+
+    jit_replay_kernel = _get_jit_replay_kernel() if use_numba else None
+    if jit_replay_kernel is not None:
+        ratings = np.array(initial_ratings, dtype=np.int64)
+        outputs = [np.empty(n_matches, dtype=np.int64) for _ in range(4)]
+        outputs.append(np.empty(n_matches, dtype=np.float64))
+        jit_replay_kernel(
+            matches.home,
+            matches.away,
+            matches.day,
+            matches.home_score.astype(np.int64),
+            matches.away_score.astype(np.int64),
+            np.asarray(k, dtype=np.float64),
+            *[float(value) for value in goal_index],
+            ratings,
+            ratings.copy(),
+            np.full(n_teams, np.iinfo(np.int64).min, dtype=np.int64),
+            *outputs,
+        )
+        return EloTimeline(*outputs, ratings=ratings)
+
+    # Plain Python ints and floats keep the arithmetic identical to ELORater
+    ratings = np.asarray(initial_ratings, dtype=np.int64).tolist()
+    outputs = [[0] * n_matches for _ in range(4)] + [[0.0] * n_matches]
+    _replay_kernel(
+        matches.home.tolist(),
+        matches.away.tolist(),
+        matches.day.tolist(),
+        matches.home_score.tolist(),
+        matches.away_score.tolist(),
+        np.asarray(k).tolist(),
+        *goal_index,
+        ratings,
+        list(ratings),
+        [np.iinfo(np.int64).min] * n_teams,
+        *outputs,
+    )
+    return EloTimeline(
+        *[np.array(output, dtype=np.int64) for output in outputs[:4]],
+        expected=np.array(outputs[4], dtype=np.float64),
+        ratings=np.array(ratings, dtype=np.int64),
+    )
@@ -0,0 +1,49 @@
+from typing import Callable, Dict, Generic, Hashable, List, Optional, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class Registry(Generic[K, V]):
+    """Hash index over an ordered list of entities.
+
+    ``items`` is the list owned by the caller and stays the ordered view of the
+    registry. Entities appended to it directly are picked up on the next miss.
+    """
+
+    def __init__(self, items: List[V], key: Callable[[V], K]):
+        self.items = items
+        self._key = key
+        self._index: Dict[K, V] = {}
+        self._indexed = 0
+        self._reindex()
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __contains__(self, key: K) -> bool:
+        return self.get(key) is not None
+
+    def get(self, key: K) -> Optional[V]:
+        item = self._index.get(key)
+        if item is None and self._indexed != len(self.items):
+            self._reindex()
+            item = self._index.get(key)
+        return item
+
+    def get_or_create(self, key: K, factory: Callable[[], V]) -> V:
+        item = self.get(key)
+        if item is None:
+            item = factory()
+            self.items.append(item)
+            self._index[key] = item
+            self._indexed += 1
+        return item
+
+    def _reindex(self) -> None:
+        if self._indexed > len(self.items):
+            self._index = {}
+            self._indexed = 0
+        for item in self.items[self._indexed :]:
+            self._index.setdefault(self._key(item), item)
+        self._indexed = len(self.items)
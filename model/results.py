@@ -2,82 +2,136 @@ from collections import defaultdict
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Sequence, Tuple, Union
 
 import numpy as np
 import pandas as pd
 from pandas import DataFrame
-from tqdm import tqdm
 
-from model.entities import Event, Match, MatchType, Result, Team, Tournament
-from model.ratings import ELORater
+from model.arrays import MatchArrays
+from model.entities import (
+    _RATINGS_START_DATE,
+    Event,
+    Match,
+    MatchType,
+    RatingTimeline,
+    Result,
+    Team,
+    Tournament,
+    classify_event_type,
+)
+from model.form import FormIndex
+from model.instrumentation import instrumentation, timed
+from model.rankings import RankingEngine
+from model.ratings import ELORater, replay_elo
+from model.registry import Registry
+from model.store import MatchStore
 
 
 @dataclass
 class ResultsDataset:
     events: List[Event] = field(default_factory=list)
-    matches: List[Match] = field(default_factory=list)
+    matches: Union[List[Match], MatchStore] = field(default_factory=list)
     tournaments: List[Tournament] = field(default_factory=list)
     teams: List[Team] = field(default_factory=list)
     matches_by_team: Dict[str, List[Match]] = field(
         default_factory=lambda: defaultdict(list)
     )
+    ranking_engine: Optional[RankingEngine] = None
+    _event_registry: Optional[Registry[str, Event]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _team_registry: Optional[Registry[str, Team]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _tournament_registry: Optional[Registry[Tuple[str, int], Tournament]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _form_index: Optional[FormIndex] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def __getstate__(self) -> Dict:
+        state = self.__dict__.copy()
+        for registry in ["_event_registry", "_team_registry", "_tournament_registry"]:
+            state[registry] = None
+        return state
+
+    @property
+    def event_registry(self) -> Registry[str, Event]:
+        if (
+            self._event_registry is None
+            or self._event_registry.items is not self.events
+        ):
+            self._event_registry = Registry(self.events, key=lambda event: event.name)
+        return self._event_registry
+
+    @property
+    def team_registry(self) -> Registry[str, Team]:
+        if self._team_registry is None or self._team_registry.items is not self.teams:
+            self._team_registry = Registry(self.teams, key=lambda team: team.name)
+        return self._team_registry
+
+    @property
+    def tournament_registry(self) -> Registry[Tuple[str, int], Tournament]:
+        if (
+            self._tournament_registry is None
+            or self._tournament_registry.items is not self.tournaments
+        ):
+            self._tournament_registry = Registry(
+                self.tournaments,
+                key=lambda tournament: (tournament.name, tournament.year),
+            )
+        return self._tournament_registry
 
-    def populate_data_from_df(self, df: DataFrame) -> None:
-        self._get_events_from_df(df)
-        self._get_matches_from_df(df)
+    @property
+    def form_index(self) -> FormIndex:
+        if self._form_index is None or self._form_index.n_matches != len(self.matches):
+            self._form_index = FormIndex.from_matches(self.matches)
+        return self._form_index
+
+    @timed("ResultsDataset.populate_data_from_df")
+    def populate_data_from_df(self, df: DataFrame, columnar: bool = False) -> None:
+        n_matches = len(self.matches)
+        if columnar:
+            self._get_matches_from_columns(df)
+        else:
+            self._get_events_from_df(df)
+            self._get_matches_from_df(df)
+        instrumentation.count("matches.ingested", len(self.matches) - n_matches)
 
     def get_event_from_name(self, event_name: str) -> Optional[Event]:
-        for event in self.events:
-            if event.name == event_name:
-                return event
-        return None
+        return self.event_registry.get(event_name)
 
     def get_team_from_name(self, team_name: str) -> Optional[Team]:
-        for team in self.teams:
-            if team.name == team_name:
-                return team
-        return None
+        return self.team_registry.get(team_name)
 
     def get_tournament_from_year(
         self, tournament_name: str, year: int
     ) -> Optional[Tournament]:
-        for tournament in self.tournaments:
-            if tournament.name == tournament_name and tournament.year == year:
-                return tournament
-        return None
+        return self.tournament_registry.get((tournament_name, year))
 
     def _create_team(self, team_name: str) -> Team:
-        team_names = [x.name for x in self.teams]
-        if team_name not in team_names:
-            team = Team(name=team_name)
-            self.teams.append(team)
-        else:
-            team = self.get_team_from_name(team_name)
-        return team
+        return self.team_registry.get_or_create(team_name, lambda: Team(name=team_name))
 
     def _get_events_from_df(self, df: DataFrame) -> None:
         for index, row in df.iterrows():
             self._add_event(row["tournament"])
 
-    def _add_event(self, event_name: str) -> None:
-        event_names = [x.name for x in self.events]
-        if event_name not in event_names:
-            self.events.append(Event(name=event_name))
+    def _add_event(self, event_name: str) -> Event:
+        return self.event_registry.get_or_create(
+            event_name, lambda: Event(name=event_name)
+        )
 
     def _create_tournament(self, event_name: str, year: int) -> Tournament:
-        event = self.get_event_from_name(event_name)
-        for tournament in self.tournaments:
-            if tournament.name == event.name and tournament.year == year:
-                return tournament
-
-        tournament = Tournament(event_name, year)
-        self.tournaments.append(tournament)
-        return tournament
+        event = self._add_event(event_name)
+        return self.tournament_registry.get_or_create(
+            (event.name, year), lambda: Tournament(event.name, year)
+        )
 
     def _get_matches_from_df(self, df: DataFrame) -> None:
         df["date"] = pd.to_datetime(df["date"])
-        df = df.sort_values("date")
+        df = df.sort_values("date", kind="stable")
         for index, row in df.iterrows():
             match = Match(
                 home_team=self._create_team(row["home_team"]),
@@ -91,51 +145,246 @@ class ResultsDataset:
                 neutral=bool(row["neutral"]),
             )
             match.find_event_type(row["tournament"])
-            self.matches.append(match)
+            self._add_matches([match])
+
+    def _get_matches_from_columns(self, df: DataFrame) -> None:
+        for event_name in pd.unique(df["tournament"]):
+            self._add_event(event_name)
+
+        df = df.assign(date=pd.to_datetime(df["date"])).sort_values(
+            "date", kind="stable"
+        )
+
+        team_codes, team_names = pd.factorize(
+            np.column_stack([df["home_team"], df["away_team"]]).ravel(),
+            use_na_sentinel=False,
+        )
+        teams = np.empty(len(team_names), dtype=object)
+        teams[:] = [self._create_team(team_name) for team_name in team_names]
+        home_teams = teams[team_codes[0::2]]
+        away_teams = teams[team_codes[1::2]]
+
+        event_codes, event_names = pd.factorize(
+            df["tournament"].to_numpy(), use_na_sentinel=False
+        )
+        match_types = np.empty(len(event_names), dtype=object)
+        match_types[:] = [classify_event_type(name) for name in event_names]
+
+        tournament_codes, tournament_keys = pd.MultiIndex.from_arrays(
+            [df["tournament"].to_numpy(), df["date"].dt.year.to_numpy()]
+        ).factorize()
+        tournaments = np.empty(len(tournament_keys), dtype=object)
+        tournaments[:] = [
+            self._create_tournament(name, year) for name, year in tournament_keys
+        ]
+
+        matches = [
+            Match(
+                home_team=home_team,
+                away_team=away_team,
+                date=date,
+                home_score=home_score,
+                away_score=away_score,
+                tournament=tournament,
+                city=city,
+                country=country,
+                neutral=neutral,
+                type=match_type,
+            )
+            for (
+                home_team,
+                away_team,
+                date,
+                home_score,
+                away_score,
+                tournament,
+                city,
+                country,
+                neutral,
+                match_type,
+            ) in zip(
+                home_teams.tolist(),
+                away_teams.tolist(),
+                df["date"].tolist(),
+                df["home_score"].tolist(),
+                df["away_score"].tolist(),
+                tournaments[tournament_codes].tolist(),
+                df["city"].tolist(),
+                df["country"].tolist(),
+                df["neutral"].to_numpy().astype(bool).tolist(),
+                match_types[event_codes].tolist(),
+            )
+        ]
+        self._add_matches(matches)
+
+    def _add_matches(self, matches: List[Match]) -> None:
+        self.matches.extend(matches)
+        if isinstance(self.matches, MatchStore):
+            # The store groups its rows by team itself
+            return
+        for match in matches:
             self.matches_by_team[match.home_team.name].append(match)
             self.matches_by_team[match.away_team.name].append(match)
 
-    def calculate_ratings(self) -> None:
+    def compact(self) -> None:
+        """Hold the matches in a ``MatchStore`` rather than as ``Match`` objects.
+
+        Matches read back as ``MatchView`` objects and keep being added as
+        usual, for datasets too large to keep one object per match.
+        """
+        if isinstance(self.matches, MatchStore):
+            return
+        store = MatchStore.from_matches(self.matches)
+        self.matches = store
+        self.matches_by_team = store.by_team
+
+    def _match_arrays(self) -> MatchArrays:
+        if isinstance(self.matches, MatchStore):
+            return self.matches.to_arrays(self.teams)
+        return MatchArrays.from_matches(self.matches, self.teams)
+
+    @timed("ResultsDataset.calculate_ratings")
+    def calculate_ratings(self, n_years: int = 4, vectorized: bool = False) -> None:
+        new_ratings = None
+        if vectorized:
+            timeline = replay_elo(
+                self._match_arrays(),
+                np.array([team.get_rating(_RATINGS_START_DATE) for team in self.teams]),
+            )
+            new_ratings = zip(
+                timeline.home_after.tolist(), timeline.away_after.tolist()
+            )
+
+        self.ranking_engine = RankingEngine(n_years=n_years)
+        self._rate_matches(0, new_ratings)
+
+    def _rate_matches(self, start: int, new_ratings=None) -> None:
         rating_system = ELORater()
-        for match in self.matches:
-            rating_system.update_ratings(match)
+        played_today = []
+        instrumentation.count("matches.rated", len(self.matches) - start)
+        for idx in range(start, len(self.matches)):
+            match = self.matches[idx]
+            if new_ratings is not None:
+                home_rating, away_rating = next(new_ratings)
+                match.home_team.update_rating(match.date, home_rating)
+                match.away_team.update_rating(match.date, away_rating)
+            else:
+                rating_system.update_ratings(match)
+            for team in (match.home_team, match.away_team):
+                self.ranking_engine.update(
+                    team.name, team.get_rating(match.date), match.date
+                )
+                played_today.append(team.name)
+            if idx + 1 == len(self.matches) or self.matches[idx + 1].date != match.date:
+                self.ranking_engine.record(match.date, played_today)
+                played_today = []
+
+    @timed("ResultsDataset.append_data_from_df")
+    def append_data_from_df(self, df: DataFrame, n_years: int = 4) -> int:
+        if not self.matches:
+            self.populate_data_from_df(df, columnar=True)
+            self.calculate_ratings(n_years=n_years)
+            return len(self.matches)
+
+        df = df.assign(date=pd.to_datetime(df["date"]))
+        last_date = self.matches[-1].date
+        new_df = df[df["date"] > last_date]
+
+        old_df = df[df["date"] <= last_date]
+        late_df = old_df
+        if len(old_df):
+            # Only built when needed, as appending in-order chunks would
+            # otherwise scan every match once per chunk
+            known = {
+                (match.date, match.home_team.name, match.away_team.name)
+                for match in self.matches
+            }
+            is_known = [
+                key in known
+                for key in zip(old_df["date"], old_df["home_team"], old_df["away_team"])
+            ]
+            late_df = old_df[np.logical_not(is_known)]
+
+        if len(late_df) or self.ranking_engine is None:
+            # Matches that were never rated are rated along with the new ones
+            if len(late_df):
+                instrumentation.count("matches.late", len(late_df))
+            self._replay_with(pd.concat([late_df, new_df]), n_years)
+            return len(late_df) + len(new_df)
+
+        if new_df.empty:
+            return 0
+        form_index = self.form_index
+        start = len(self.matches)
+        self._get_matches_from_columns(new_df)
+        for match in self.matches[start:]:
+            form_index.add_match(match)
+        self._rate_matches(start)
+        return len(self.matches) - start
+
+    def _replay_with(self, df: DataFrame, n_years: int) -> None:
+        self._get_matches_from_columns(df)
+        self.matches.sort(key=lambda match: match.date)
+        if not isinstance(self.matches, MatchStore):
+            self.matches_by_team.clear()
+            for match in self.matches:
+                self.matches_by_team[match.home_team.name].append(match)
+                self.matches_by_team[match.away_team.name].append(match)
+        for team in self.teams:
+            team.rating = RatingTimeline(team.rating.dates[:1], team.rating.ratings[:1])
+        self._form_index = None
+        self.calculate_ratings(n_years=n_years)
 
+    @timed("ResultsDataset.calculate_rankings")
     def calculate_rankings(self, date: datetime, n_years: int = 4) -> Dict[str, int]:
         current_ratings = {}
         for team in self.teams:
-            try:
-                if date - team.get_last_played_date(date) < timedelta(n_years * 365):
-                    current_ratings[team.name] = team.get_rating(date)
-                else:
-                    current_ratings[team.name] = np.nan
-            except TypeError:
-                current_ratings[team.name] = np.nan
-        return {
+            last_played = team.get_last_played_date(date)
+            if last_played is not None and date - last_played < timedelta(
+                n_years * 365
+            ):
+                current_ratings[team.name] = team.get_rating(date)
+        rankings = {
             key: rank
             for rank, key in enumerate(
                 sorted(current_ratings, key=current_ratings.get, reverse=True), 1
             )
         }
+        return {team.name: rankings.get(team.name, np.nan) for team in self.teams}
+
+    @timed("ResultsDataset.get_world_ranking")
+    def get_world_ranking(self, team_name: str, date: datetime) -> int:
+        if self.ranking_engine is not None:
+            try:
+                rank = self.ranking_engine.rank(team_name, date)
+                return np.nan if rank is None else rank
+            except KeyError:
+                pass
+        return self.calculate_rankings(date)[team_name]
+
+    def get_world_rankings(
+        self, date: datetime, team_names: Optional[List[str]] = None
+    ) -> Dict[str, int]:
+        if team_names is None:
+            team_names = [team.name for team in self.teams]
+        engine = self.ranking_engine
+        if engine is not None and (engine.date is None or date >= engine.date):
+            ranks = engine.ranks(date, team_names)
+            return {
+                team_name: np.nan if rank is None else rank
+                for team_name, rank in zip(team_names, ranks)
+            }
+        return self.calculate_rankings(date)
 
     def get_most_recent_matches(
         self, team_name: str, date: datetime, n_days: int = 90
     ) -> Optional[List[Match]]:
-        team_matches = []
-        for match in self.matches_by_team[team_name]:
-            if date - timedelta(days=n_days) < match.date < date:
-                if team_name in [match.home_team.name, match.away_team.name]:
-                    team_matches.append(match)
-        return team_matches
+        games = self.form_index.window_range(team_name, date, n_days)
+        return self.matches_by_team[team_name][games]
 
     def get_last_n_games(self, team_name: str, date: datetime, n_games: int = 5):
-        team_matches = []
-        for match in self.matches_by_team[team_name]:
-            if match.date < date:
-                team_matches.append(match)
-        if len(team_matches) < n_games:
-            return team_matches
-        else:
-            return team_matches[-n_games:]
+        games = self.form_index.last_n_range(team_name, date, n_games)
+        return self.matches_by_team[team_name][games]
 
     @staticmethod
     def get_team_goals_from_matches(team_name: str, matches: List[Match]) -> (int, int):
@@ -150,12 +399,23 @@ class ResultsDataset:
                 conceded += match.home_score
         return scored, conceded
 
-    def write_results_to_csv(self, output_path: Path) -> None:
-        df = pd.DataFrame()
-        for idx, match in enumerate(tqdm(self.matches)):
-            match_dict = self._match_to_dict(match)
-            df = pd.concat([df, pd.DataFrame(match_dict, index=[idx])])
-        df.to_csv(output_path, index=False)
+    @timed("ResultsDataset.write_results_to_csv")
+    def write_results_to_csv(self, output_path: Path, chunk_size: int = 10000) -> None:
+        from tqdm import tqdm
+
+        columns = defaultdict(list)
+        header = True
+        instrumentation.count("rows.written", len(self.matches))
+        with open(output_path, "w", newline="") as fp:
+            for idx, match in enumerate(tqdm(self.matches), 1):
+                for key, value in self._match_to_dict(match).items():
+                    columns[key].append(value)
+                if idx % chunk_size == 0:
+                    pd.DataFrame(columns).to_csv(fp, index=False, header=header)
+                    columns.clear()
+                    header = False
+            if columns or header:
+                pd.DataFrame(columns).to_csv(fp, index=False, header=header)
 
     def _match_to_dict(self, match: Match):
         if match.home_score > match.away_score:
@@ -168,15 +428,11 @@ class ResultsDataset:
         home_rating = match.home_team.get_rating(match.date - timedelta(days=1))
         away_rating = match.away_team.get_rating(match.date - timedelta(days=1))
 
-        world_rankings = self.calculate_rankings(match.date)
-
-        last_games_home = self.get_last_n_games(match.home_team.name, match.date)
-        last_games_away = self.get_last_n_games(match.away_team.name, match.date)
-        home_scored, home_conceded = self.get_team_goals_from_matches(
-            match.home_team.name, last_games_home
+        home_scored, home_conceded = self.form_index.goals_in_last_n(
+            match.home_team.name, match.date
         )
-        away_scored, away_conceded = self.get_team_goals_from_matches(
-            match.away_team.name, last_games_away
+        away_scored, away_conceded = self.form_index.goals_in_last_n(
+            match.away_team.name, match.date
         )
 
         return {
@@ -186,8 +442,8 @@ class ResultsDataset:
             "home_rating": home_rating,
             "away_rating": away_rating,
             "match_type": str(match.type),
-            "home_ranking": world_rankings[match.home_team.name],
-            "away_ranking": world_rankings[match.away_team.name],
+            "home_ranking": self.get_world_ranking(match.home_team.name, match.date),
+            "away_ranking": self.get_world_ranking(match.away_team.name, match.date),
             "home_recent_scored": home_scored,
             "away_recent_scored": away_scored,
             "home_recent_conceded": home_conceded,
@@ -195,15 +451,111 @@ class ResultsDataset:
             "result": result.value,
         }
 
-    def create_test_df(self, submission_df: pd.DataFrame) -> pd.DataFrame:
-        test_df = pd.DataFrame()
-        for index, row in submission_df.iterrows():
-            fixture_dict = self._fixture_to_dict(
-                row["team1"], row["team2"], datetime(2023, 7, 20)
-            )
-            test_df = pd.concat([test_df, pd.DataFrame(fixture_dict, index=[index])])
+    @timed("ResultsDataset.create_test_df")
+    def create_test_df(
+        self,
+        submission_df: pd.DataFrame,
+        date: datetime = datetime(2023, 7, 20),
+        match_type: MatchType = MatchType.WORLD_CUP,
+    ) -> pd.DataFrame:
+        if submission_df.empty:
+            return pd.DataFrame()
+        test_df = self.fixture_features(
+            submission_df["team1"], submission_df["team2"], date, match_type
+        )
+        test_df.index = submission_df.index
         return test_df
 
+    @timed("ResultsDataset.fixture_features")
+    def fixture_features(
+        self,
+        home_team_names: Sequence[str],
+        away_team_names: Sequence[str],
+        dates: Union[datetime, Sequence[datetime]],
+        match_types: Union[MatchType, Sequence[MatchType]] = MatchType.WORLD_CUP,
+    ) -> pd.DataFrame:
+        team_codes = {team.name: code for code, team in enumerate(self.teams)}
+        home_codes = self._encode_fixture_teams(home_team_names, team_codes)
+        away_codes = self._encode_fixture_teams(away_team_names, team_codes)
+        n_fixtures = len(home_codes)
+
+        if isinstance(dates, (datetime, str)):
+            dates = [dates] * n_fixtures
+        if isinstance(match_types, MatchType):
+            match_types = [match_types] * n_fixtures
+        date_codes, unique_dates = pd.factorize(pd.to_datetime(pd.Series(dates)))
+
+        features = {
+            name: np.zeros(n_fixtures, dtype=dtype)
+            for name, dtype in [
+                ("home_rating", np.int64),
+                ("away_rating", np.int64),
+                ("home_ranking", np.float64),
+                ("away_ranking", np.float64),
+                ("home_recent_scored", np.int64),
+                ("away_recent_scored", np.int64),
+                ("home_recent_conceded", np.int64),
+                ("away_recent_conceded", np.int64),
+            ]
+        }
+        for date_code, date in enumerate(unique_dates):
+            rows = np.flatnonzero(date_codes == date_code)
+            teams = np.unique(np.concatenate([home_codes[rows], away_codes[rows]]))
+            rankings = self.get_world_rankings(
+                date, [self.teams[code].name for code in teams.tolist()]
+            )
+
+            rating = np.zeros(len(self.teams), dtype=np.int64)
+            ranking = np.full(len(self.teams), np.nan)
+            scored = np.zeros(len(self.teams), dtype=np.int64)
+            conceded = np.zeros(len(self.teams), dtype=np.int64)
+            for code in teams.tolist():
+                team = self.teams[code]
+                rating[code] = team.get_rating(date)
+                ranking[code] = rankings[team.name]
+                scored[code], conceded[code] = self.form_index.goals_in_last_n(
+                    team.name, date
+                )
+
+            for side, codes in [("home", home_codes[rows]), ("away", away_codes[rows])]:
+                features[f"{side}_rating"][rows] = rating[codes]
+                features[f"{side}_ranking"][rows] = ranking[codes]
+                features[f"{side}_recent_scored"][rows] = scored[codes]
+                features[f"{side}_recent_conceded"][rows] = conceded[codes]
+
+        for column in ["home_ranking", "away_ranking"]:
+            if not np.isnan(features[column]).any():
+                features[column] = features[column].astype(np.int64)
+
+        team_names = np.array([team.name for team in self.teams], dtype=object)
+        return pd.DataFrame(
+            {
+                "home_team": team_names[home_codes],
+                "away_team": team_names[away_codes],
+                "home_rating": features["home_rating"],
+                "away_rating": features["away_rating"],
+                "match_type": [str(match_type) for match_type in match_types],
+                "home_ranking": features["home_ranking"],
+                "away_ranking": features["away_ranking"],
+                "home_recent_scored": features["home_recent_scored"],
+                "away_recent_scored": features["away_recent_scored"],
+                "home_recent_conceded": features["home_recent_conceded"],
+                "away_recent_conceded": features["away_recent_conceded"],
+            }
+        )
+
+    def _encode_fixture_teams(
+        self, team_names: Sequence[str], team_codes: Dict[str, int]
+    ) -> np.ndarray:
+        codes, unique_names = pd.factorize(pd.Series(team_names, dtype=object))
+        unique_codes = []
+        for team_name in unique_names:
+            team_name = self.remap_team_name(team_name)
+            if team_name not in team_codes:
+                raise KeyError(f"Unknown team {team_name}")
+            unique_codes.append(team_codes[team_name])
+        return np.array(unique_codes, dtype=np.int64)[codes]
+
     def _fixture_to_dict(
         self,
         home_team_name: str,
@@ -213,15 +565,11 @@ class ResultsDataset:
     ) -> Dict:
         home_team = self.get_team_from_name(self.remap_team_name(home_team_name))
         away_team = self.get_team_from_name(self.remap_team_name(away_team_name))
-        world_rankings = self.calculate_rankings(date)
-
-        last_games_home = self.get_last_n_games(home_team.name, date)
-        last_games_away = self.get_last_n_games(away_team.name, date)
-        home_scored, home_conceded = self.get_team_goals_from_matches(
-            home_team.name, last_games_home
+        home_scored, home_conceded = self.form_index.goals_in_last_n(
+            home_team.name, date
         )
-        away_scored, away_conceded = self.get_team_goals_from_matches(
-            away_team.name, last_games_away
+        away_scored, away_conceded = self.form_index.goals_in_last_n(
+            away_team.name, date
         )
         return {
             "home_team": home_team.name,
@@ -229,8 +577,8 @@ class ResultsDataset:
             "home_rating": home_team.get_rating(date),
             "away_rating": away_team.get_rating(date),
             "match_type": str(match_type),
-            "home_ranking": world_rankings[home_team.name],
-            "away_ranking": world_rankings[away_team.name],
+            "home_ranking": self.get_world_ranking(home_team.name, date),
+            "away_ranking": self.get_world_ranking(away_team.name, date),
             "home_recent_scored": home_scored,
             "away_recent_scored": away_scored,
             "home_recent_conceded": home_conceded,
@@ -1,5 +1,45 @@
-import selenium
+from typing import List, Optional
+
+FLASHSCORE_URL = (
+    "https://www.flashscore.co.uk/football/world/world-cup-women/#/plFV0LBD/live"
+)
 
 
 class FlashscoreScraper:
-    
\ No newline at end of file
+    """Reads match elements from a Flashscore results page.
+
+    Selenium and the browser are only started when a page is first loaded.
+    """
+
+    def __init__(self, url: str = FLASHSCORE_URL, chrome_bin: Optional[str] = None):
+        self.url = url
+        self.chrome_bin = chrome_bin
+        self._driver = None
+
+    @property
+    def driver(self):
+        if self._driver is None:
+            from selenium import webdriver
+            from selenium.webdriver.chrome.options import Options as ChromeOptions
+
+            if self.chrome_bin:
+                chrome_options = ChromeOptions()
+                chrome_options.add_argument("--headless")
+                chrome_options.add_argument("--disable-dev-shm-usage")
+                chrome_options.add_argument("--no-sandbox")
+                self._driver = webdriver.Chrome(options=chrome_options)
+            else:
+                self._driver = webdriver.Chrome()
+        return self._driver
+
+    def get_match_elements(self) -> List:
+        from selenium.webdriver.common.by import By
+
+        self.driver.get(self.url)
+        summary = self.driver.find_elements(By.CLASS_NAME, "event--summary")
+        return summary[0].find_elements(By.CLASS_NAME, "event__match--twoLine")
+
+    def close(self) -> None:
+        if self._driver is not None:
+            self._driver.quit()
+            self._driver = None
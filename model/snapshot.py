@@ -0,0 +1,233 @@
+import json
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from model.arrays import MATCH_TYPE_CODES, dates_to_ns, ns_to_dates
+from model.entities import Event, RatingTimeline, Team, Tournament
+from model.instrumentation import timed
+from model.rankings import RankingEngine
+from model.results import ResultsDataset
+from model.store import MatchStore
+
+SNAPSHOT_VERSION = 1
+
+
+@timed("save_snapshot")
+def save_snapshot(results: ResultsDataset, directory: Path) -> None:
+    """Write a computed dataset as one ``.npy`` file per array plus a manifest."""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    team_codes = {team.name: code for code, team in enumerate(results.teams)}
+    tournament_codes = {
+        (tournament.name, tournament.year): code
+        for code, tournament in enumerate(results.tournaments)
+    }
+    cities, city_codes = _encode_strings([match.city for match in results.matches])
+    countries, country_codes = _encode_strings(
+        [match.country for match in results.matches]
+    )
+
+    arrays = {
+        "team_names": _string_array([team.name for team in results.teams]),
+        "rating_offsets": np.cumsum(
+            [0] + [len(team.rating) for team in results.teams], dtype=np.int64
+        ),
+        "rating_dates": dates_to_ns(
+            [date for team in results.teams for date in team.rating.dates]
+        ),
+        "rating_values": np.array(
+            [rating for team in results.teams for rating in team.rating.ratings],
+            dtype=np.int64,
+        ),
+        "event_names": _string_array([event.name for event in results.events]),
+        "tournament_names": _string_array(
+            [tournament.name for tournament in results.tournaments]
+        ),
+        "tournament_years": np.array(
+            [tournament.year for tournament in results.tournaments], dtype=np.int32
+        ),
+        "match_home": np.array(
+            [team_codes[match.home_team.name] for match in results.matches],
+            dtype=np.int32,
+        ),
+        "match_away": np.array(
+            [team_codes[match.away_team.name] for match in results.matches],
+            dtype=np.int32,
+        ),
+        "match_date": dates_to_ns([match.date for match in results.matches]),
+        "match_home_score": np.array(
+            [match.home_score for match in results.matches], dtype=np.int16
+        ),
+        "match_away_score": np.array(
+            [match.away_score for match in results.matches], dtype=np.int16
+        ),
+        "match_tournament": np.array(
+            [
+                (
+                    tournament_codes[(match.tournament.name, match.tournament.year)]
+                    if match.tournament is not None
+                    else -1
+                )
+                for match in results.matches
+            ],
+            dtype=np.int32,
+        ),
+        "match_type": np.array(
+            [MATCH_TYPE_CODES[match.type.name] for match in results.matches],
+            dtype=np.int8,
+        ),
+        "match_neutral": np.array(
+            [bool(match.neutral) for match in results.matches], dtype=bool
+        ),
+        "cities": cities,
+        "match_city": city_codes,
+        "countries": countries,
+        "match_country": country_codes,
+    }
+    if results.ranking_engine is not None:
+        for name, array in results.ranking_engine.to_arrays(team_codes).items():
+            arrays[f"ranking_{name}"] = array
+
+    for name, array in arrays.items():
+        np.save(directory / f"{name}.npy", array, allow_pickle=False)
+
+    with open(directory / "manifest.json", "w") as fp:
+        json.dump(
+            {
+                "version": SNAPSHOT_VERSION,
+                "arrays": sorted(arrays),
+                "n_teams": len(results.teams),
+                "n_matches": len(results.matches),
+            },
+            fp,
+            indent=2,
+        )
+
+
+@timed("load_snapshot")
+def load_snapshot(directory: Path, mmap: bool = True) -> ResultsDataset:
+    """Load a snapshot with its matches in a ``MatchStore``.
+
+    With ``mmap``, the match arrays are memory-mapped copy-on-write and the
+    store reads them in place, so they are not loaded until used and the
+    snapshot files are never written to.
+    """
+    directory = Path(directory)
+    with open(directory / "manifest.json") as fp:
+        manifest = json.load(fp)
+    if manifest["version"] != SNAPSHOT_VERSION:
+        raise ValueError(f"Unsupported snapshot version {manifest['version']}")
+
+    arrays = {
+        name: np.load(
+            directory / f"{name}.npy",
+            mmap_mode="c" if mmap else None,
+            allow_pickle=False,
+        )
+        for name in manifest["arrays"]
+    }
+
+    team_names = arrays["team_names"].tolist()
+    offsets = arrays["rating_offsets"].tolist()
+    rating_dates = ns_to_dates(arrays["rating_dates"])
+    rating_values = arrays["rating_values"].tolist()
+    teams = []
+    for code, name in enumerate(team_names):
+        team = Team(name=name)
+        start, end = offsets[code], offsets[code + 1]
+        team.rating = RatingTimeline()
+        team.rating.dates = rating_dates[start:end]
+        team.rating.ratings = rating_values[start:end]
+        teams.append(team)
+
+    tournaments = [
+        Tournament(name, year)
+        for name, year in zip(
+            arrays["tournament_names"].tolist(), arrays["tournament_years"].tolist()
+        )
+    ]
+    strings, (city_codes, country_codes) = _merge_strings(
+        [
+            (arrays["cities"], arrays["match_city"]),
+            (arrays["countries"], arrays["match_country"]),
+        ]
+    )
+    matches = MatchStore.from_columns(
+        {
+            "home": arrays["match_home"],
+            "away": arrays["match_away"],
+            "day": arrays["match_date"]
+            .astype("datetime64[ns]")
+            .astype("datetime64[D]")
+            .astype(np.int64),
+            "home_score": arrays["match_home_score"],
+            "away_score": arrays["match_away_score"],
+            "tournament": arrays["match_tournament"],
+            "city": city_codes,
+            "country": country_codes,
+            "neutral": arrays["match_neutral"],
+            "match_type": arrays["match_type"],
+        },
+        teams,
+        tournaments,
+        strings,
+    )
+
+    results = ResultsDataset(
+        events=[Event(name=name) for name in arrays["event_names"].tolist()],
+        matches=matches,
+        tournaments=tournaments,
+        teams=teams,
+        matches_by_team=matches.by_team,
+    )
+
+    ranking_arrays = {
+        name[len("ranking_") :]: array
+        for name, array in arrays.items()
+        if name.startswith("ranking_")
+    }
+    if ranking_arrays:
+        results.ranking_engine = RankingEngine.from_arrays(ranking_arrays, team_names)
+
+    return results
+
+
+def _string_array(values: List[str]) -> np.ndarray:
+    return np.array(values, dtype=str) if values else np.empty(0, dtype="U1")
+
+
+def _encode_strings(values: List) -> (np.ndarray, np.ndarray):
+    table: Dict[str, int] = {}
+    codes = np.array(
+        [
+            table.setdefault(value, len(table)) if isinstance(value, str) else -1
+            for value in values
+        ],
+        dtype=np.int32,
+    )
+    return _string_array(list(table)), codes
+
+
+def _merge_strings(
+    tables: List[Tuple[np.ndarray, np.ndarray]],
+) -> Tuple[List[str], List[np.ndarray]]:
+    """Recode several string tables and their codes against one shared table."""
+    strings: List[str] = []
+    string_codes: Dict[str, int] = {}
+    recoded = []
+    for table, codes in tables:
+        # The trailing -1 keeps missing values (code -1) missing
+        remap = np.array(
+            [
+                string_codes.setdefault(value, len(string_codes))
+                for value in table.tolist()
+            ]
+            + [-1],
+            dtype=np.int32,
+        )
+        recoded.append(remap[codes])
+    strings.extend(string_codes)
+    return strings, recoded
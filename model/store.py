@@ -0,0 +1,389 @@
+from collections.abc import Mapping, Sequence
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from model.arrays import MATCH_TYPE_CODES, MATCH_TYPES, MatchArrays, dates_to_days
+from model.entities import Match, MatchType, Team, Tournament
+
+_COLUMNS = {
+    "home": np.int32,
+    "away": np.int32,
+    "day": np.int64,
+    "home_score": np.int8,
+    "away_score": np.int8,
+    "tournament": np.int32,
+    "city": np.int32,
+    "country": np.int32,
+    "neutral": np.int8,
+    "match_type": np.int8,
+}
+_MATCH_FIELDS = [
+    "home_team",
+    "away_team",
+    "date",
+    "home_score",
+    "away_score",
+    "tournament",
+    "city",
+    "country",
+    "neutral",
+    "type",
+]
+_SCORE_RANGE = np.iinfo(np.int8)
+
+
+class MatchView:
+    """A ``Match`` read from one row of a ``MatchStore``."""
+
+    __slots__ = ("store", "index")
+
+    def __init__(self, store: "MatchStore", index: int):
+        self.store = store
+        self.index = index
+
+    def _get(self, column: str) -> int:
+        return int(self.store._columns[column][self.index])
+
+    @property
+    def home_team(self) -> Team:
+        return self.store.teams[self._get("home")]
+
+    @property
+    def away_team(self) -> Team:
+        return self.store.teams[self._get("away")]
+
+    @property
+    def date(self) -> pd.Timestamp:
+        return self.store._date(self._get("day"))
+
+    @property
+    def home_score(self) -> int:
+        return self._get("home_score")
+
+    @property
+    def away_score(self) -> int:
+        return self._get("away_score")
+
+    @property
+    def tournament(self) -> Optional[Tournament]:
+        code = self._get("tournament")
+        return self.store.tournaments[code] if code >= 0 else None
+
+    @property
+    def city(self) -> Optional[str]:
+        return self.store._string(self._get("city"))
+
+    @property
+    def country(self) -> Optional[str]:
+        return self.store._string(self._get("country"))
+
+    @property
+    def neutral(self) -> Optional[bool]:
+        neutral = self._get("neutral")
+        return bool(neutral) if neutral >= 0 else None
+
+    @property
+    def type(self) -> MatchType:
+        return MATCH_TYPES[self._get("match_type")]
+
+    @type.setter
+    def type(self, match_type: MatchType) -> None:
+        self.store._columns["match_type"][self.index] = MATCH_TYPE_CODES[
+            match_type.name
+        ]
+
+    def find_event_type(self, event_name: str) -> None:
+        Match.find_event_type(self, event_name)
+
+    def to_match(self) -> Match:
+        return Match(**{name: getattr(self, name) for name in _MATCH_FIELDS})
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, (Match, MatchView)):
+            return NotImplemented
+        # MatchType members all compare equal, so types are compared by name
+        return self.type.name == other.type.name and all(
+            _same(getattr(self, name), getattr(other, name)) for name in _MATCH_FIELDS
+        )
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"MatchView({self.index}, {self.to_match()!r})"
+
+
+class MatchRows(Sequence):
+    """Views of selected store rows, in the order given."""
+
+    def __init__(self, store: "MatchStore", rows: np.ndarray):
+        self.store = store
+        self.rows = rows
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [MatchView(self.store, row) for row in self.rows[idx].tolist()]
+        return MatchView(self.store, int(self.rows[idx]))
+
+
+class TeamMatches(Mapping):
+    """Each team's matches in store order, the compact ``matches_by_team``.
+
+    Row numbers are grouped by team once per change to the store, which
+    costs eight bytes per match rather than two list entries.
+    """
+
+    def __init__(self, store: "MatchStore"):
+        self.store = store
+        self._version = -1
+        self._rows = np.empty(0, dtype=np.int32)
+        self._offsets = np.zeros(1, dtype=np.int64)
+
+    def _index(self) -> None:
+        if self._version == self.store._version:
+            return
+        store = self.store
+        n_matches = len(store)
+        codes = np.concatenate([store.column("home"), store.column("away")])
+        rows = np.tile(np.arange(n_matches, dtype=np.int32), 2)
+        order = np.lexsort((rows, codes))
+        self._rows = rows[order]
+        self._offsets = np.searchsorted(codes[order], np.arange(len(store.teams) + 1))
+        self._version = store._version
+
+    def __getitem__(self, team_name: str) -> MatchRows:
+        self._index()
+        code = self.store.team_codes.get(team_name)
+        if code is None:
+            return MatchRows(self.store, self._rows[:0])
+        start, end = self._offsets[code], self._offsets[code + 1]
+        return MatchRows(self.store, self._rows[start:end])
+
+    def __iter__(self) -> Iterator[str]:
+        self._index()
+        counts = np.diff(self._offsets)
+        return iter(team.name for team, count in zip(self.store.teams, counts) if count)
+
+    def __len__(self) -> int:
+        self._index()
+        return int(np.count_nonzero(np.diff(self._offsets)))
+
+
+class MatchStore(Sequence):
+    """Matches held as one small integer column per field.
+
+    Teams, tournaments and city/country strings are coded into shared tables,
+    dates are whole days since the epoch, scores are ``int8`` and match types
+    are ``MATCH_TYPE_CODES``. That comes to under 50 bytes a match including
+    the per-team index, against several hundred for a list of ``Match``
+    objects. Indexing returns ``MatchView`` objects that read like a ``Match``.
+    """
+
+    def __init__(self):
+        self.teams: List[Team] = []
+        self.team_codes: Dict[str, int] = {}
+        self.tournaments: List[Tournament] = []
+        self._tournament_codes: Dict[Tuple[str, int], int] = {}
+        self.strings: List[str] = []
+        self._string_codes: Dict[str, int] = {}
+        self._columns = {name: np.empty(0, dtype) for name, dtype in _COLUMNS.items()}
+        self._length = 0
+        self._version = 0
+        self._dates: Dict[int, pd.Timestamp] = {}
+        self.by_team = TeamMatches(self)
+
+    @classmethod
+    def from_matches(cls, matches: Iterable[Match]) -> "MatchStore":
+        store = cls()
+        store.extend(matches)
+        return store
+
+    @classmethod
+    def from_columns(
+        cls,
+        columns: Dict[str, np.ndarray],
+        teams: List[Team],
+        tournaments: List[Tournament],
+        strings: List[str],
+    ) -> "MatchStore":
+        """A store over already coded columns, e.g. memory-mapped arrays.
+
+        Columns that already have the store's dtype are used as they are,
+        so they are only copied once the store is extended.
+        """
+        store = cls()
+        store.teams = list(teams)
+        store.team_codes = {team.name: code for code, team in enumerate(store.teams)}
+        store.tournaments = list(tournaments)
+        store._tournament_codes = {
+            (tournament.name, tournament.year): code
+            for code, tournament in enumerate(store.tournaments)
+        }
+        store.strings = list(strings)
+        store._string_codes = {value: code for code, value in enumerate(store.strings)}
+        for side in ["home_score", "away_score"]:
+            scores = columns[side]
+            if len(scores) and (
+                scores.min() < _SCORE_RANGE.min or scores.max() > _SCORE_RANGE.max
+            ):
+                raise ValueError(f"{side} out of range for a MatchStore")
+        store._columns = {
+            name: np.asarray(columns[name], dtype=dtype)
+            for name, dtype in _COLUMNS.items()
+        }
+        store._length = len(store._columns["home"])
+        return store
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [MatchView(self, row) for row in range(*idx.indices(self._length))]
+        if idx < 0:
+            idx += self._length
+        if not 0 <= idx < self._length:
+            raise IndexError("match index out of range")
+        return MatchView(self, idx)
+
+    def __iter__(self) -> Iterator[MatchView]:
+        return (MatchView(self, row) for row in range(self._length))
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, (list, MatchStore)):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"MatchStore({self._length} matches, {len(self.teams)} teams)"
+
+    def column(self, name: str) -> np.ndarray:
+        return self._columns[name][: self._length]
+
+    @property
+    def nbytes(self) -> int:
+        return sum(self.column(name).nbytes for name in _COLUMNS)
+
+    def append(self, match: Match) -> None:
+        self.extend([match])
+
+    def extend(self, matches: Iterable[Match]) -> None:
+        matches = list(matches)
+        if not matches:
+            return
+        rows = {
+            "home": [self._team_code(match.home_team) for match in matches],
+            "away": [self._team_code(match.away_team) for match in matches],
+            "day": dates_to_days([match.date for match in matches]),
+            "home_score": [match.home_score for match in matches],
+            "away_score": [match.away_score for match in matches],
+            "tournament": [
+                self._tournament_code(match.tournament) for match in matches
+            ],
+            "city": [self._string_code(match.city) for match in matches],
+            "country": [self._string_code(match.country) for match in matches],
+            "neutral": [
+                -1 if match.neutral is None else bool(match.neutral)
+                for match in matches
+            ],
+            "match_type": [MATCH_TYPE_CODES[match.type.name] for match in matches],
+        }
+        for side in ["home_score", "away_score"]:
+            scores = np.asarray(rows[side])
+            if scores.min() < _SCORE_RANGE.min or scores.max() > _SCORE_RANGE.max:
+                raise ValueError(f"{side} out of range for a MatchStore")
+
+        start = self._length
+        self._reserve(start + len(matches))
+        for name, values in rows.items():
+            self._columns[name][start : start + len(matches)] = values
+        self._length += len(matches)
+        self._version += 1
+
+    def sort(self, key=None, reverse: bool = False) -> None:
+        """Stable sort, by date unless ``key`` is given, as ``list.sort`` would."""
+        if key is None:
+            order = np.argsort(self.column("day"), kind="stable")
+            if reverse:
+                order = order[::-1]
+        else:
+            keys = [key(match) for match in self]
+            order = sorted(range(self._length), key=keys.__getitem__, reverse=reverse)
+        for name in _COLUMNS:
+            self._columns[name][: self._length] = self.column(name)[order]
+        self._version += 1
+
+    def to_arrays(self, teams: List[Team]) -> MatchArrays:
+        """``MatchArrays.from_matches`` without going through the views."""
+        team_codes = {team.name: code for code, team in enumerate(teams)}
+        remap = np.array([team_codes[team.name] for team in self.teams], dtype=np.int32)
+        k = np.array([match_type.value for match_type in MATCH_TYPES], dtype=np.int16)
+        match_type = self.column("match_type").copy()
+        return MatchArrays(
+            home=remap[self.column("home")],
+            away=remap[self.column("away")],
+            day=self.column("day").copy(),
+            home_score=self.column("home_score").astype(np.int16),
+            away_score=self.column("away_score").astype(np.int16),
+            k=k[match_type],
+            match_type=match_type,
+            team_names=[team.name for team in teams],
+        )
+
+    def _reserve(self, n_matches: int) -> None:
+        capacity = len(self._columns["home"])
+        if n_matches <= capacity:
+            return
+        capacity = max(n_matches, 2 * capacity, 1024)
+        for name, dtype in _COLUMNS.items():
+            column = np.empty(capacity, dtype=dtype)
+            column[: self._length] = self.column(name)
+            self._columns[name] = column
+
+    def _team_code(self, team: Team) -> int:
+        code = self.team_codes.get(team.name)
+        if code is None:
+            code = self.team_codes[team.name] = len(self.teams)
+            self.teams.append(team)
+        return code
+
+    def _tournament_code(self, tournament: Optional[Tournament]) -> int:
+        if tournament is None:
+            return -1
+        key = (tournament.name, tournament.year)
+        code = self._tournament_codes.get(key)
+        if code is None:
+            code = self._tournament_codes[key] = len(self.tournaments)
+            self.tournaments.append(tournament)
+        return code
+
+    def _string_code(self, value: Optional[str]) -> int:
+        if not isinstance(value, str):
+            return -1
+        code = self._string_codes.get(value)
+        if code is None:
+            code = self._string_codes[value] = len(self.strings)
+            self.strings.append(value)
+        return code
+
+    def _string(self, code: int) -> Optional[str]:
+        return self.strings[code] if code >= 0 else np.nan
+
+    def _date(self, day: int) -> pd.Timestamp:
+        # Dates repeat a lot, so only build one Timestamp per distinct day
+        date = self._dates.get(day)
+        if date is None:
+            date = self._dates[day] = pd.Timestamp(day, unit="D")
+        return date
+
+
+def _same(a, b) -> bool:
+    if isinstance(a, float) and isinstance(b, float) and a != a and b != b:
+        return True
+    return a == b
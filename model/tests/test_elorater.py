@@ -1,7 +1,10 @@
 from datetime import datetime
 
+import pytest
+
+from model.arrays import MatchArrays
 from model.entities import Match, MatchType, Team
-from model.ratings import ELORater
+from model.ratings import ELORater, replay_elo
 
 team_a = Team(name="A", initial_rating=630)
 team_b = Team(name="B", initial_rating=500)
@@ -66,3 +69,45 @@ def test_calculate_away_win():
     rater = ELORater()
     points_change = rater.calculate_points_change(away_win)
     assert points_change == -20.3645075938427
+
+
+@pytest.mark.parametrize("use_numba", [True, False])
+def test_replay_elo_matches_elorater(use_numba):
+    if use_numba:
+        pytest.importorskip("numba")
+    teams = [Team(name="A"), Team(name="B"), Team(name="C")]
+    a, b, c = teams
+    matches = [
+        Match(a, b, datetime(2000, 1, 1), 3, 0, type=MatchType.WORLD_CUP),
+        Match(b, c, datetime(2000, 1, 1), 1, 1, type=MatchType.FRIENDLY),
+        Match(c, a, datetime(2000, 1, 5), 6, 1, type=MatchType.QUALIFIERS),
+        Match(a, b, datetime(2000, 1, 5), 0, 2, type=MatchType.CONTINENTAL),
+    ]
+    arrays = MatchArrays.from_matches(matches, teams)
+
+    rater = ELORater()
+    expected = []
+    for match in matches:
+        rater.update_ratings(match)
+        expected.append(
+            (
+                match.home_team.get_rating(match.date),
+                match.away_team.get_rating(match.date),
+            )
+        )
+
+    timeline = replay_elo(arrays, use_numba=use_numba)
+    assert list(zip(timeline.home_after, timeline.away_after)) == expected
+    assert list(timeline.ratings) == [team.rating.ratings[-1] for team in teams]
+
+
+def test_match_arrays_code_k_by_match_type():
+    teams = [Team(name="A"), Team(name="B")]
+    matches = [
+        Match(*teams, datetime(2000, 1, 1), 1, 0, type=MatchType.FRIENDLY),
+        Match(*teams, datetime(2000, 1, 2), 1, 0, type=MatchType.WORLD_CUP),
+    ]
+    arrays = MatchArrays.from_matches(matches, teams)
+
+    assert list(arrays.k) == [MatchType.FRIENDLY.value, MatchType.WORLD_CUP.value]
+    assert arrays.match_type[0] != arrays.match_type[1]
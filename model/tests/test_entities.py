@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from model.entities import _DEFAULT_RATING, Team
+from model.entities import _DEFAULT_RATING, RatingTimeline, Team
 
 team_a = Team(name="TEAM A")
 team_b = Team(name="TEAM B", initial_rating=600)
@@ -28,3 +28,26 @@ def test_team_last_played():
     assert last_played == datetime(2000, 3, 24)
     last_played = team_b.get_last_played_date(datetime(2000, 5, 1))
     assert last_played == datetime(2000, 4, 22)
+
+
+def test_team_get_rating_as_of_date():
+    assert team_b.get_rating(datetime(2000, 3, 24)) == 601
+    assert team_b.get_rating(datetime(2000, 4, 21)) == 601
+    assert team_b.get_rating(datetime(2001, 1, 1)) == 602
+
+
+def test_rating_timeline_keeps_date_order():
+    timeline = RatingTimeline()
+    timeline[datetime(2001, 1, 1)] = 1510
+    timeline[datetime(2000, 1, 1)] = 1490
+    timeline[datetime(2000, 6, 1)] = 1500
+    timeline[datetime(2000, 6, 1)] = 1505
+
+    assert timeline.keys() == [
+        datetime(2000, 1, 1),
+        datetime(2000, 6, 1),
+        datetime(2001, 1, 1),
+    ]
+    assert timeline.values() == [1490, 1505, 1510]
+    assert timeline.as_of(datetime(2000, 12, 31)) == 1505
+    assert timeline.as_of(datetime(1999, 1, 1)) is None
@@ -0,0 +1,44 @@
+from datetime import datetime
+
+from model.entities import Match, Team
+from model.form import FormIndex
+
+team_a = Team(name="A")
+team_b = Team(name="B")
+team_c = Team(name="C")
+matches = [
+    Match(team_a, team_b, datetime(2000, 1, 1), 2, 0),
+    Match(team_c, team_a, datetime(2000, 3, 1), 1, 1),
+    Match(team_a, team_c, datetime(2000, 5, 1), 0, 3),
+    Match(team_b, team_a, datetime(2000, 6, 1), 4, 2),
+]
+index = FormIndex.from_matches(matches)
+
+
+def test_goals_in_last_n():
+    assert index.goals_in_last_n("A", datetime(2000, 6, 1), n_games=2) == (1, 4)
+    assert index.goals_in_last_n("A", datetime(2000, 6, 2), n_games=5) == (5, 8)
+    assert index.goals_in_last_n("A", datetime(1999, 1, 1)) == (0, 0)
+    assert index.goals_in_last_n("D", datetime(2000, 6, 2)) == (0, 0)
+
+
+def test_goals_in_window():
+    assert index.goals_in_window("A", datetime(2000, 6, 1), n_days=93) == (1, 4)
+    assert index.goals_in_window("A", datetime(2000, 6, 1), n_days=32) == (0, 3)
+
+
+def test_form_features():
+    features = index.form_features(
+        "A", datetime(2000, 7, 1), n_games=(1, 3), n_days=(365,)
+    )
+    assert features == {
+        "last_1_played": 1,
+        "last_1_scored": 2,
+        "last_1_conceded": 4,
+        "last_3_played": 3,
+        "last_3_scored": 3,
+        "last_3_conceded": 8,
+        "days_365_played": 4,
+        "days_365_scored": 5,
+        "days_365_conceded": 8,
+    }
@@ -0,0 +1,56 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[2]
+
+# Generous enough for a cold start on a slow machine; pandas alone is most of it
+IMPORT_BUDGET_SECONDS = 2.5
+
+LAZY_MODULES = ["matplotlib", "numba", "selenium", "tqdm", "xgboost", "sklearn"]
+
+
+def run_python(*args: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *args],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def parse_importtime(stderr: str) -> dict:
+    cumulative = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, total, name = line.split("|")
+        try:
+            cumulative[name.strip()] = int(total) / 1e6
+        except ValueError:
+            continue
+    return cumulative
+
+
+@pytest.mark.parametrize(
+    "module",
+    ["model.results", "model.scraper", "data_ingestor.ingestor"],
+)
+def test_heavy_modules_load_lazily(module):
+    result = run_python(
+        "-c",
+        f"import sys, {module}; "
+        f"print(','.join(m for m in {LAZY_MODULES!r} if m in sys.modules))",
+    )
+    assert result.stdout.strip() == ""
+
+
+def test_import_time_budget():
+    result = run_python("-X", "importtime", "-c", "import model.results")
+    cumulative = parse_importtime(result.stderr)
+
+    assert "matplotlib" not in cumulative
+    assert cumulative["model.results"] < IMPORT_BUDGET_SECONDS
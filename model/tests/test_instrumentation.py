@@ -0,0 +1,62 @@
+import pandas as pd
+
+from model.instrumentation import instrumentation, timed
+from model.results import ResultsDataset
+
+
+@timed("double")
+def double(x):
+    return 2 * x
+
+
+def test_disabled_records_nothing():
+    assert double(2) == 4
+    instrumentation.count("calls")
+
+    assert not instrumentation.enabled
+    assert "double" not in instrumentation.timers
+    assert "calls" not in instrumentation.counters
+
+
+def test_report_timers_counters_and_profiles():
+    instrumentation.start(cpu_profile=True, trace_memory=True)
+    for x in range(3):
+        double(x)
+    instrumentation.count("calls", 3)
+    with instrumentation.timer("block"):
+        [0] * 1000
+    report = instrumentation.stop()
+
+    assert not instrumentation.enabled
+    assert report["timers"]["double"]["calls"] == 3
+    assert report["timers"]["block"]["calls"] == 1
+    assert report["counters"] == {"calls": 3}
+    assert any("double" in entry["function"] for entry in report["profile"])
+    assert report["memory"]["peak_mb"] > 0
+
+
+def test_dataset_stages_are_instrumented():
+    df = pd.DataFrame(
+        {
+            "date": ["1991-11-17", "1991-11-19", "1991-11-19"],
+            "home_team": ["China", "Norway", "Denmark"],
+            "away_team": ["Norway", "Denmark", "China"],
+            "home_score": [4, 4, 2],
+            "away_score": [0, 0, 2],
+            "tournament": ["FIFA World Cup"] * 3,
+            "city": ["Guangzhou"] * 3,
+            "country": ["China"] * 3,
+            "neutral": [False, True, False],
+        }
+    )
+    instrumentation.start()
+    results = ResultsDataset()
+    results.populate_data_from_df(df, columnar=True)
+    results.calculate_ratings()
+    report = instrumentation.stop()
+
+    assert report["counters"] == {"matches.ingested": 3, "matches.rated": 3}
+    assert report["timers"]["ELORater.update_ratings"]["calls"] == 3
+    assert report["timers"]["RankingEngine.update"]["calls"] == 6
+    assert report["timers"]["RankingEngine.record"]["calls"] == 2
+    assert report["timers"]["ResultsDataset.calculate_ratings"]["calls"] == 1
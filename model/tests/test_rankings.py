@@ -0,0 +1,81 @@
+import random
+from datetime import datetime, timedelta
+
+from model.rankings import RankingEngine
+
+
+def test_ranking_engine_orders_by_rating():
+    engine = RankingEngine()
+    engine.update("A", 1500, datetime(2000, 1, 1))
+    engine.update("B", 1500, datetime(2000, 1, 1))
+    engine.update("C", 1600, datetime(2000, 1, 1))
+
+    assert engine.rankings(datetime(2000, 1, 1)) == {"A": 2, "B": 3, "C": 1}
+
+    engine.update("B", 1700, datetime(2000, 2, 1))
+    assert engine.rank("B", datetime(2000, 2, 1)) == 1
+    assert engine.rank("A", datetime(2000, 2, 1)) == 3
+
+
+def test_ranking_engine_expires_inactive_teams():
+    engine = RankingEngine(n_years=1)
+    engine.update("A", 1500, datetime(2000, 1, 1))
+    engine.update("B", 1600, datetime(2000, 6, 1))
+
+    assert engine.rank("A", datetime(2000, 12, 1)) == 2
+    assert engine.rank("A", datetime(2001, 1, 1)) is None
+    assert engine.rank("B", datetime(2001, 1, 1)) == 1
+
+
+def test_ranking_engine_history():
+    engine = RankingEngine()
+    engine.update("A", 1500, datetime(2000, 1, 1))
+    engine.update("B", 1400, datetime(2000, 1, 1))
+    engine.record(datetime(2000, 1, 1), ["A", "B"])
+    engine.update("B", 1600, datetime(2000, 2, 1))
+    engine.record(datetime(2000, 2, 1), ["B"])
+
+    assert engine.rank("B", datetime(2000, 1, 1)) == 2
+    assert engine.rank("B", datetime(2000, 2, 1)) == 1
+
+
+def test_ranking_lookups_do_not_advance_engine():
+    engine = RankingEngine(n_years=1)
+    engine.update("A", 1500, datetime(2000, 1, 1))
+    engine.update("B", 1600, datetime(2000, 6, 1))
+    engine.record(datetime(2000, 6, 1), ["B"])
+
+    assert engine.rankings(datetime(2001, 3, 1)) == {"B": 1}
+    assert engine.date == datetime(2000, 6, 1)
+
+    engine.update("A", 1700, datetime(2000, 7, 1))
+    assert engine.rank("A", datetime(2001, 3, 1)) == 1
+    assert engine.rank("B", datetime(2001, 3, 1)) == 2
+
+
+def test_ranks_discount_teams_expiring_after_the_engine_date():
+    rng = random.Random(0)
+    engine = RankingEngine(n_years=1)
+    latest = {}
+    orders = {}
+    date = datetime(2000, 1, 1)
+    for _ in range(300):
+        date += timedelta(days=rng.randint(0, 5))
+        team_name = f"T{rng.randint(0, 40)}"
+        rating = rng.randint(1300, 1700)
+        engine.update(team_name, rating, date)
+        latest[team_name] = (rating, date, orders.setdefault(team_name, len(orders)))
+
+    for days in [0, 30, 200, 400]:
+        query = date + timedelta(days=days)
+        active = sorted(
+            (-rating, order, team_name)
+            for team_name, (rating, played, order) in latest.items()
+            if query - played < engine.window
+        )
+        expected = {team_name: rank for rank, (_, _, team_name) in enumerate(active, 1)}
+
+        assert engine.rankings(query) == expected
+        assert engine.ranks(query, list(latest)) == [
+            expected.get(team_name) for team_name in latest
+        ]
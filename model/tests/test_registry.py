@@ -0,0 +1,20 @@
+from model.entities import Team
+from model.registry import Registry
+
+
+def test_registry_get_or_create():
+    teams = []
+    registry = Registry(teams, key=lambda team: team.name)
+
+    team = registry.get_or_create("A", lambda: Team(name="A"))
+    assert registry.get_or_create("A", lambda: Team(name="A")) is team
+    assert teams == [team]
+    assert registry.get("B") is None
+
+
+def test_registry_sees_direct_appends():
+    teams = [Team(name="A")]
+    registry = Registry(teams, key=lambda team: team.name)
+    teams.append(Team(name="B"))
+
+    assert registry.get("B") is teams[1]
@@ -0,0 +1,83 @@
+from datetime import datetime
+
+import pandas as pd
+from pytest import fixture
+
+from model.results import ResultsDataset
+
+
+def results_df():
+    return pd.DataFrame(
+        {
+            "date": ["1991-11-17", "1991-11-19", "1991-11-21", "1991-11-24"],
+            "home_team": ["China", "Norway", "China", "Norway"],
+            "away_team": ["Norway", "Denmark", "Denmark", "United States"],
+            "home_score": [4, 4, 2, 1],
+            "away_score": [0, 0, 2, 2],
+            "tournament": ["FIFA World Cup"] * 4,
+            "city": ["Guangzhou"] * 4,
+            "country": ["China"] * 4,
+            "neutral": [False, True, False, True],
+        }
+    )
+
+
+@fixture
+def results():
+    results = ResultsDataset()
+    results.populate_data_from_df(results_df(), columnar=True)
+    results.calculate_ratings()
+    return results
+
+
+def test_write_results_to_csv_chunks(results, tmp_path):
+    results.write_results_to_csv(tmp_path / "whole.csv")
+    results.write_results_to_csv(tmp_path / "chunked.csv", chunk_size=3)
+
+    whole = (tmp_path / "whole.csv").read_bytes()
+    assert whole == (tmp_path / "chunked.csv").read_bytes()
+    assert len(pd.read_csv(tmp_path / "whole.csv")) == 4
+
+
+def test_create_test_df(results):
+    submission_df = pd.DataFrame(
+        {"team1": ["China", "USA"], "team2": ["Denmark", "Norway"]}, index=[3, 7]
+    )
+    test_df = results.create_test_df(submission_df)
+
+    assert list(test_df.index) == [3, 7]
+    assert list(test_df["home_team"]) == ["China", "United States"]
+    assert test_df["home_rating"].dtype == "int64"
+
+
+def test_fixture_features_match_single_fixtures(results):
+    fixtures = [
+        ("China", "Denmark", datetime(1991, 11, 20)),
+        ("Norway", "USA", datetime(1991, 11, 20)),
+        ("Denmark", "Norway", datetime(1991, 11, 25)),
+        ("China", "United States", datetime(1991, 11, 18)),
+    ]
+    home, away, dates = zip(*fixtures)
+    features = results.fixture_features(home, away, dates)
+
+    expected = pd.DataFrame(
+        [results._fixture_to_dict(*fixture) for fixture in fixtures]
+    )
+    pd.testing.assert_frame_equal(features, expected, check_dtype=False)
+
+
+def test_append_to_unrated_dataset_rates_existing_matches_once():
+    df = results_df()
+    unrated = ResultsDataset()
+    unrated.populate_data_from_df(df[:2], columnar=True)
+
+    assert unrated.append_data_from_df(df) == 2
+
+    expected = ResultsDataset()
+    expected.append_data_from_df(df)
+    assert len(unrated.matches) == 4
+    assert unrated.matches == expected.matches
+    assert unrated.teams == expected.teams
+    assert unrated.get_world_ranking(
+        "Norway", datetime(1991, 11, 24)
+    ) == expected.get_world_ranking("Norway", datetime(1991, 11, 24))
@@ -0,0 +1,45 @@
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from model.results import ResultsDataset
+from model.snapshot import load_snapshot, save_snapshot
+from model.store import MatchStore
+
+
+def test_snapshot_round_trip(tmp_path):
+    df = pd.DataFrame(
+        {
+            "date": ["1991-11-17", "1991-11-19", "1991-11-21", "1996-07-21"],
+            "home_team": ["China", "Norway", "China", "Norway"],
+            "away_team": ["Norway", "Denmark", "Denmark", "Brazil"],
+            "home_score": [4, 4, 2, 2],
+            "away_score": [0, 0, 2, 2],
+            "tournament": ["FIFA World Cup"] * 3 + ["Olympic Games"],
+            "city": ["Guangzhou", "Jiangmen", np.nan, "Orlando"],
+            "country": ["China", "China", "China", "United States"],
+            "neutral": [False, True, False, True],
+        }
+    )
+    results = ResultsDataset()
+    results.populate_data_from_df(df, columnar=True)
+    results.calculate_ratings()
+
+    save_snapshot(results, tmp_path / "snapshot")
+    loaded = load_snapshot(tmp_path / "snapshot")
+
+    assert loaded.teams == results.teams
+    assert loaded.tournaments == results.tournaments
+    assert loaded.events == results.events
+    assert [str(match.type) for match in loaded.matches] == [
+        str(match.type) for match in results.matches
+    ]
+    assert isinstance(loaded.matches, MatchStore)
+    assert loaded.matches == results.matches
+    assert np.isnan(loaded.matches[2].city)
+    for date in [datetime(1991, 11, 21), datetime(1996, 7, 21), datetime(1999, 1, 1)]:
+        assert loaded.calculate_rankings(date) == results.calculate_rankings(date)
+        assert loaded.get_world_ranking("Norway", date) == results.get_world_ranking(
+            "Norway", date
+        )
@@ -0,0 +1,89 @@
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from model.entities import Match, MatchType, Team
+from model.results import ResultsDataset
+from model.store import MatchStore, MatchView
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame(
+        {
+            "date": ["1991-11-21", "1991-11-17", "1991-11-19", "1996-07-21"],
+            "home_team": ["China", "China", "Norway", "Norway"],
+            "away_team": ["Denmark", "Norway", "Denmark", "Brazil"],
+            "home_score": [2, 4, 4, 2],
+            "away_score": [2, 0, 0, 2],
+            "tournament": ["FIFA World Cup"] * 3 + ["Olympic Games"],
+            "city": [np.nan, "Guangzhou", "Jiangmen", "Orlando"],
+            "country": ["China", "China", "China", "United States"],
+            "neutral": [False, False, True, True],
+        }
+    )
+
+
+def test_views_match_original_matches(df):
+    results = ResultsDataset()
+    results.populate_data_from_df(df, columnar=True)
+    store = MatchStore.from_matches(results.matches)
+
+    assert len(store) == 4
+    assert store == results.matches
+    assert all(isinstance(match, MatchView) for match in store)
+    assert store[-1].to_match() == results.matches[-1]
+    assert store[0].home_score == 4 and isinstance(store[0].home_score, int)
+    assert np.isnan(store[2].city)
+    assert store.nbytes == 4 * 32
+
+
+def test_compact_dataset_gives_same_features(df):
+    results = ResultsDataset()
+    results.populate_data_from_df(df, columnar=True)
+    results.calculate_ratings()
+    compact = ResultsDataset()
+    compact.compact()
+    compact.populate_data_from_df(df, columnar=True)
+    compact.calculate_ratings(vectorized=True)
+
+    assert compact.teams == results.teams
+    assert list(compact.matches_by_team["Norway"]) == list(
+        results.matches_by_team["Norway"]
+    )
+    date = datetime(1996, 7, 21)
+    assert compact.get_last_n_games("Norway", date) == results.get_last_n_games(
+        "Norway", date
+    )
+    fixtures = pd.DataFrame({"team1": ["China", "Norway"], "team2": ["Brazil"] * 2})
+    pd.testing.assert_frame_equal(
+        compact.create_test_df(fixtures), results.create_test_df(fixtures)
+    )
+
+
+def test_sort_and_append():
+    teams = [Team("A"), Team("B")]
+    store = MatchStore.from_matches(
+        [
+            Match(teams[0], teams[1], datetime(2000, 1, 2), 1, 0),
+            Match(
+                teams[1], teams[0], datetime(2000, 1, 1), 3, 3, type=MatchType.FRIENDLY
+            ),
+        ]
+    )
+    store.append(Match(teams[0], teams[1], datetime(1999, 1, 1), 0, 1))
+    store.sort(key=lambda match: match.date)
+
+    assert [match.date.year for match in store] == [1999, 2000, 2000]
+    assert [match.home_score for match in store] == [0, 3, 1]
+    assert [match.type.name for match in store] == [
+        "OTHER_TOURNAMENTS",
+        "FRIENDLY",
+        "OTHER_TOURNAMENTS",
+    ]
+    assert store[1] != store[2].to_match()
+    assert [match.home_score for match in store.by_team["A"]] == [0, 3, 1]
+    with pytest.raises(ValueError):
+        store.append(Match(teams[0], teams[1], datetime(2000, 1, 3), 200, 0))
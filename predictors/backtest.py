@@ -0,0 +1,191 @@
+import time
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from sklearn.metrics import log_loss
+from xgboost import XGBClassifier
+
+from model.instrumentation import add_profile_arguments, finish_profile, start_profile
+from predictors.xgb_forest import process_input_data
+
+_worker_state: Dict = {}
+
+
+@dataclass
+class Fold:
+    cutoff: datetime
+    end: datetime
+    train: np.ndarray
+    test: np.ndarray
+
+
+def tournament_cutoffs(
+    df: pd.DataFrame, match_type: str = "WORLD_CUP", min_gap_days: int = 180
+) -> List[datetime]:
+    """First day of each tournament of ``match_type`` in a feature frame.
+
+    Matches of that type more than ``min_gap_days`` apart are taken to belong
+    to different tournaments.
+    """
+    dates = df.loc[df["match_type"].str.endswith(match_type), "date"]
+    dates = dates.drop_duplicates().sort_values()
+    starts = dates[dates.diff().fillna(pd.Timedelta.max) > timedelta(min_gap_days)]
+    return list(starts)
+
+
+def create_folds(
+    dates: pd.Series, cutoffs: List[datetime], min_train: int = 200
+) -> List[Fold]:
+    """Train on everything before a cutoff, test up to the next cutoff."""
+    dates = dates.to_numpy()
+    order = np.argsort(dates, kind="stable")
+    sorted_dates = dates[order]
+
+    folds = []
+    cutoffs = sorted(cutoffs)
+    last_day = pd.Timestamp(sorted_dates[-1]) + timedelta(days=1)
+    for cutoff, end in zip(cutoffs, cutoffs[1:] + [last_day]):
+        start = np.searchsorted(sorted_dates, np.datetime64(cutoff), side="left")
+        stop = np.searchsorted(sorted_dates, np.datetime64(end), side="left")
+        if start < min_train or stop == start:
+            continue
+        folds.append(
+            Fold(cutoff, end, np.sort(order[:start]), np.sort(order[start:stop]))
+        )
+    return folds
+
+
+def _set_features(X: pd.DataFrame, y: np.ndarray, params: Dict) -> None:
+    _worker_state["X"] = X
+    _worker_state["y"] = y
+    _worker_state["params"] = params
+
+
+def evaluate_fold(fold: Fold) -> Dict:
+    X, y, params = _worker_state["X"], _worker_state["y"], _worker_state["params"]
+    X_train, y_train = X.iloc[fold.train], y[fold.train]
+    X_test, y_test = X.iloc[fold.test], y[fold.test]
+
+    start = time.perf_counter()
+    model = XGBClassifier(
+        objective="multi:softmax",
+        num_class=3,
+        enable_categorical=True,
+        tree_method="hist",
+        n_jobs=1,
+        **params,
+    )
+    model.fit(X_train, y_train)
+    fit_time = time.perf_counter() - start
+
+    # Predicting the training set's result frequencies for every match
+    frequencies = np.bincount(y_train, minlength=3) / len(y_train)
+    return {
+        "cutoff": fold.cutoff,
+        "end": fold.end,
+        "n_train": len(fold.train),
+        "n_test": len(fold.test),
+        "log_loss": log_loss(y_test, model.predict_proba(X_test), labels=[0, 1, 2]),
+        "baseline_log_loss": log_loss(
+            y_test, np.tile(frequencies, (len(y_test), 1)), labels=[0, 1, 2]
+        ),
+        "fit_time": fit_time,
+    }
+
+
+def run_backtest(
+    df: pd.DataFrame,
+    cutoffs: List[datetime],
+    params: Optional[Dict] = None,
+    n_workers: Optional[int] = None,
+    min_train: int = 200,
+) -> pd.DataFrame:
+    """Walk-forward log loss of the model retrained at every cutoff.
+
+    ``df`` is a training feature frame with a parsed ``date`` column. The
+    feature matrix is built once and handed to each worker when it starts,
+    and folds only index into it.
+    """
+    params = params or {}
+    folds = create_folds(df["date"], cutoffs, min_train=min_train)
+    y = df["result"].to_numpy()
+    X = process_input_data(df.drop(columns="result"))
+
+    if n_workers == 1:
+        _set_features(X, y, params)
+        scores = [evaluate_fold(fold) for fold in folds]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=n_workers, initializer=_set_features, initargs=(X, y, params)
+        ) as executor:
+            scores = list(executor.map(evaluate_fold, folds))
+
+    return pd.DataFrame(
+        scores,
+        columns=[
+            "cutoff",
+            "end",
+            "n_train",
+            "n_test",
+            "log_loss",
+            "baseline_log_loss",
+            "fit_time",
+        ],
+    )
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser()
+    parser.add_argument("training_data", type=Path)
+    parser.add_argument("--output_file", type=str, default="backtest.csv")
+    parser.add_argument(
+        "--cutoffs",
+        help="Cutoff dates in dd/mm/yyyy format, defaults to the start of each "
+        "tournament of --match_type",
+        type=str,
+        nargs="+",
+        default=None,
+    )
+    parser.add_argument("--match_type", type=str, default="WORLD_CUP")
+    parser.add_argument("--min_train", type=int, default=200)
+    parser.add_argument("--n_workers", type=int, default=None)
+    parser.add_argument("--max_depth", type=int, default=3)
+    parser.add_argument("--n_estimators", type=int, default=60)
+    parser.add_argument("--learning_rate", type=float, default=0.1)
+
+    add_profile_arguments(parser)
+
+    args = parser.parse_args()
+    start_profile(args)
+    try:
+        train_df = pd.read_csv(args.training_data)
+        train_df["date"] = pd.to_datetime(train_df["date"], format="%d/%m/%Y")
+
+        if args.cutoffs:
+            cutoffs = [datetime.strptime(cutoff, "%d/%m/%Y") for cutoff in args.cutoffs]
+        else:
+            cutoffs = tournament_cutoffs(train_df, args.match_type)
+
+        backtest = run_backtest(
+            train_df,
+            cutoffs,
+            params={
+                "max_depth": args.max_depth,
+                "n_estimators": args.n_estimators,
+                "learning_rate": args.learning_rate,
+            },
+            n_workers=args.n_workers,
+            min_train=args.min_train,
+        )
+        print(backtest.to_string(index=False))
+        mean_log_loss = np.average(backtest["log_loss"], weights=backtest["n_test"])
+        print(f"Mean log loss: {mean_log_loss:.3f}")
+        backtest.to_csv(args.output_file, index=False)
+    finally:
+        finish_profile(args)
@@ -0,0 +1,202 @@
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from itertools import product
+from multiprocessing import shared_memory
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from model.arrays import MATCH_TYPES, MatchArrays, dates_to_days
+from model.instrumentation import add_profile_arguments, finish_profile, start_profile
+from model.ratings import DEFAULT_GOAL_INDEX, replay_elo
+
+_SHARED_FIELDS = ["home", "away", "day", "home_score", "away_score", "k", "match_type"]
+# Friendlies and World Cup matches are swept independently by default
+DEFAULT_K_GRID = {"FRIENDLY": [10, 20, 30], "WORLD_CUP": [40, 60, 80]}
+_worker_state: Dict = {}
+_shared_blocks: List[shared_memory.SharedMemory] = []
+
+
+@dataclass(frozen=True)
+class SweepConfig:
+    k_values: Tuple[float, ...] = tuple(match_type.value for match_type in MATCH_TYPES)
+    goal_index: Tuple[float, float, float] = DEFAULT_GOAL_INDEX
+
+    def to_dict(self) -> Dict:
+        row = {
+            f"k_{match_type.name.lower()}": k
+            for match_type, k in zip(MATCH_TYPES, self.k_values)
+        }
+        row["goal_two"], row["goal_offset"], row["goal_scale"] = self.goal_index
+        return row
+
+
+@dataclass
+class Holdout:
+    index: np.ndarray
+    result: np.ndarray = field(repr=False)
+
+
+def create_holdout(arrays: MatchArrays, holdout_df: pd.DataFrame) -> Holdout:
+    team_codes = {name: code for code, name in enumerate(arrays.team_names)}
+    match_index = {
+        key: idx
+        for idx, key in enumerate(
+            zip(arrays.day.tolist(), arrays.home.tolist(), arrays.away.tolist())
+        )
+    }
+    days = dates_to_days(pd.to_datetime(holdout_df["date"], format="%d/%m/%Y"))
+
+    index = []
+    result = []
+    for day, home_team, away_team, outcome in zip(
+        days.tolist(),
+        holdout_df["home_team"],
+        holdout_df["away_team"],
+        holdout_df["result"],
+    ):
+        key = (day, team_codes.get(home_team), team_codes.get(away_team))
+        if key in match_index:
+            index.append(match_index[key])
+            result.append({0: 1.0, 1: 0.0, 2: 0.5}[outcome])
+
+    return Holdout(np.array(index, dtype=np.int64), np.array(result))
+
+
+def expected_log_loss(expected: np.ndarray, result: np.ndarray) -> float:
+    expected = expected.clip(1e-15, 1 - 1e-15)
+    return float(
+        -np.mean(result * np.log(expected) + (1 - result) * np.log(1 - expected))
+    )
+
+
+def evaluate_config(
+    config: SweepConfig,
+    arrays: Optional[MatchArrays] = None,
+    holdout: Optional[Holdout] = None,
+) -> float:
+    if arrays is None:
+        arrays = _worker_state["arrays"]
+        holdout = _worker_state["holdout"]
+    k = np.asarray(config.k_values, dtype=np.float64)[arrays.match_type]
+    timeline = replay_elo(arrays, k=k, goal_index=config.goal_index)
+    return expected_log_loss(timeline.expected[holdout.index], holdout.result)
+
+
+def _share(name: str, array: np.ndarray) -> Tuple[str, str, Tuple, str]:
+    block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[:] = array
+    _shared_blocks.append(block)
+    return name, block.name, array.shape, array.dtype.str
+
+
+def _attach(specs: List[Tuple[str, str, Tuple, str]], team_names: List[str]) -> None:
+    shared = {}
+    for name, block_name, shape, dtype in specs:
+        block = shared_memory.SharedMemory(name=block_name)
+        _shared_blocks.append(block)
+        shared[name] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+
+    _worker_state["holdout"] = Holdout(
+        shared.pop("holdout_index"), shared.pop("holdout_result")
+    )
+    _worker_state["arrays"] = MatchArrays(team_names=team_names, **shared)
+
+
+def run_sweep(
+    arrays: MatchArrays,
+    holdout: Holdout,
+    configs: List[SweepConfig],
+    n_workers: Optional[int] = None,
+) -> pd.DataFrame:
+    arrays_to_share = {name: getattr(arrays, name) for name in _SHARED_FIELDS}
+    arrays_to_share["holdout_index"] = holdout.index
+    arrays_to_share["holdout_result"] = holdout.result
+
+    specs = [_share(name, array) for name, array in arrays_to_share.items()]
+    try:
+        with ProcessPoolExecutor(
+            max_workers=n_workers,
+            initializer=_attach,
+            initargs=(specs, arrays.team_names),
+        ) as executor:
+            losses = list(executor.map(evaluate_config, configs, chunksize=4))
+    finally:
+        while _shared_blocks:
+            block = _shared_blocks.pop()
+            block.close()
+            block.unlink()
+
+    df = pd.DataFrame([config.to_dict() for config in configs])
+    df["log_loss"] = losses
+    return df.sort_values("log_loss", ignore_index=True)
+
+
+def create_grid(
+    k_values: Dict[str, List[float]],
+    goal_twos: List[float],
+    goal_offsets: List[float],
+    goal_scales: List[float],
+) -> List[SweepConfig]:
+    """Every combination of K per match type name and goal index.
+
+    Match types missing from ``k_values`` keep their default K.
+    """
+    k_axes = [
+        k_values.get(match_type.name, [match_type.value]) for match_type in MATCH_TYPES
+    ]
+    return [
+        SweepConfig(k_values=tuple(k), goal_index=(goal_two, goal_offset, goal_scale))
+        for k, goal_two, goal_offset, goal_scale in product(
+            product(*k_axes), goal_twos, goal_offsets, goal_scales
+        )
+    ]
+
+
+if __name__ == "__main__":
+    from data_ingestor.ingestor import create_dataset_from_file
+
+    parser = ArgumentParser()
+    parser.add_argument("raw_data", help="Match results file to replay", type=Path)
+    parser.add_argument(
+        "holdout_data", help="Holdout matches, e.g. womens_test_data.csv", type=Path
+    )
+    parser.add_argument("--output_file", type=str, default="elo_sweep.csv")
+    for match_type in MATCH_TYPES:
+        parser.add_argument(
+            f"--k_{match_type.name.lower()}",
+            type=float,
+            nargs="+",
+            default=DEFAULT_K_GRID.get(match_type.name, [match_type.value]),
+        )
+    parser.add_argument("--goal_two", type=float, nargs="+", default=[1.5])
+    parser.add_argument("--goal_offset", type=float, nargs="+", default=[11])
+    parser.add_argument("--goal_scale", type=float, nargs="+", default=[8])
+    parser.add_argument("--n_workers", type=int, default=None)
+
+    add_profile_arguments(parser)
+
+    args = parser.parse_args()
+    start_profile(args)
+    try:
+        results = create_dataset_from_file(args.raw_data)
+        arrays = MatchArrays.from_matches(results.matches, results.teams)
+        holdout = create_holdout(arrays, pd.read_csv(args.holdout_data))
+        print(f"Matched {len(holdout.index)} holdout matches")
+
+        k_values = {
+            match_type.name: getattr(args, f"k_{match_type.name.lower()}")
+            for match_type in MATCH_TYPES
+        }
+        configs = create_grid(
+            k_values, args.goal_two, args.goal_offset, args.goal_scale
+        )
+        print(f"Evaluating {len(configs)} configurations...")
+        sweep = run_sweep(arrays, holdout, configs, n_workers=args.n_workers)
+        print(sweep.head())
+        sweep.to_csv(args.output_file, index=False)
+    finally:
+        finish_profile(args)
@@ -0,0 +1,74 @@
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from predictors.backtest import create_folds, run_backtest, tournament_cutoffs
+
+rng = np.random.default_rng(0)
+n = 600
+features_df = pd.DataFrame(
+    {
+        "date": pd.Timestamp("2000-01-01")
+        + pd.to_timedelta(rng.integers(0, 365 * 8, n), unit="D"),
+        "home_rating": rng.integers(1300, 2100, n),
+        "away_rating": rng.integers(1300, 2100, n),
+        "match_type": rng.choice(["MatchType.FRIENDLY", "MatchType.CONTINENTAL"], n),
+        "home_ranking": rng.integers(1, 50, n),
+        "away_ranking": rng.integers(1, 50, n),
+        "home_recent_scored": rng.integers(0, 15, n),
+        "away_recent_scored": rng.integers(0, 15, n),
+        "home_recent_conceded": rng.integers(0, 15, n),
+        "away_recent_conceded": rng.integers(0, 15, n),
+    }
+)
+features_df["result"] = np.where(
+    features_df["home_rating"] > features_df["away_rating"], 0, 1
+)
+features_df.loc[::5, "result"] = 2
+cutoffs = [datetime(2003, 6, 1), datetime(2005, 6, 1), datetime(2007, 6, 1)]
+
+
+def test_tournament_cutoffs():
+    df = pd.DataFrame(
+        {
+            "date": pd.to_datetime(
+                ["1991-11-16", "1991-11-20", "1993-01-01", "1995-06-05", "1995-06-06"]
+            ),
+            "match_type": [
+                "MatchType.WORLD_CUP",
+                "MatchType.WORLD_CUP",
+                "MatchType.FRIENDLY",
+                "MatchType.WORLD_CUP",
+                "MatchType.WORLD_CUP",
+            ],
+        }
+    )
+    assert tournament_cutoffs(df) == [
+        pd.Timestamp("1991-11-16"),
+        pd.Timestamp("1995-06-05"),
+    ]
+
+
+def test_create_folds_never_train_on_the_future():
+    folds = create_folds(features_df["date"], cutoffs)
+
+    assert len(folds) == 3
+    dates = features_df["date"]
+    for fold in folds:
+        assert (dates.iloc[fold.train] < fold.cutoff).all()
+        assert (dates.iloc[fold.test] >= fold.cutoff).all()
+        assert (dates.iloc[fold.test] < fold.end).all()
+    assert sum(len(fold.test) for fold in folds) == (dates >= cutoffs[0]).sum()
+
+
+def test_run_backtest_parallel_matches_serial():
+    params = {"n_estimators": 5, "max_depth": 2}
+    serial = run_backtest(features_df, cutoffs, params=params, n_workers=1)
+    parallel = run_backtest(features_df, cutoffs, params=params, n_workers=2)
+
+    assert len(serial) == 3
+    assert (serial["log_loss"] < serial["baseline_log_loss"]).all()
+    pd.testing.assert_frame_equal(
+        serial.drop(columns="fit_time"), parallel.drop(columns="fit_time")
+    )
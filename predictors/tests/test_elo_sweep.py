@@ -0,0 +1,67 @@
+from datetime import datetime
+
+import pandas as pd
+
+from model.arrays import MatchArrays
+from model.entities import Match, MatchType, Team
+from predictors.elo_sweep import (
+    SweepConfig,
+    create_grid,
+    create_holdout,
+    evaluate_config,
+    run_sweep,
+)
+
+teams = [Team(name="A"), Team(name="B"), Team(name="C")]
+matches = [
+    Match(teams[0], teams[1], datetime(2000, 1, 1), 2, 0, type=MatchType.FRIENDLY),
+    Match(teams[1], teams[2], datetime(2000, 2, 1), 1, 1, type=MatchType.WORLD_CUP),
+    Match(teams[2], teams[0], datetime(2000, 3, 1), 0, 3, type=MatchType.CONTINENTAL),
+    Match(teams[0], teams[1], datetime(2000, 4, 1), 1, 0, type=MatchType.WORLD_CUP),
+]
+holdout_df = pd.DataFrame(
+    {
+        "date": ["01/03/2000", "01/04/2000", "01/05/2000"],
+        "home_team": ["C", "A", "A"],
+        "away_team": ["A", "B", "C"],
+        "result": [1, 0, 2],
+    }
+)
+
+
+def test_create_holdout():
+    arrays = MatchArrays.from_matches(matches, teams)
+    holdout = create_holdout(arrays, holdout_df)
+
+    assert list(holdout.index) == [2, 3]
+    assert list(holdout.result) == [0.0, 1.0]
+
+
+def test_run_sweep_matches_in_process_evaluation():
+    arrays = MatchArrays.from_matches(matches, teams)
+    holdout = create_holdout(arrays, holdout_df)
+    configs = create_grid({"FRIENDLY": [10, 20]}, [1.5], [11], [8, 10])
+
+    sweep = run_sweep(arrays, holdout, configs, n_workers=2)
+
+    assert len(sweep) == 4
+    expected = sorted(evaluate_config(config, arrays, holdout) for config in configs)
+    assert list(sweep["log_loss"]) == expected
+    assert SweepConfig() in configs
+
+
+def test_create_grid_sweeps_k_per_match_type():
+    configs = create_grid(
+        {"FRIENDLY": [10, 20], "WORLD_CUP": [40, 60]}, [1.5], [11], [8]
+    )
+
+    rows = pd.DataFrame([config.to_dict() for config in configs])
+    assert len(configs) == 4
+    assert sorted(zip(rows["k_friendly"], rows["k_world_cup"])) == [
+        (10, 40),
+        (10, 60),
+        (20, 40),
+        (20, 60),
+    ]
+    assert set(rows["k_continental"]) == {MatchType.CONTINENTAL.value}
+    assert SweepConfig() in configs
@@ -0,0 +1,55 @@
+import numpy as np
+
+from predictors.tournament import (
+    WORLD_CUP_2023,
+    TournamentFormat,
+    TournamentSimulator,
+    simulate_tournament,
+)
+
+tournament = TournamentFormat(
+    groups={"A": ["A1", "A2", "A3", "A4"], "B": ["B1", "B2", "B3", "B4"]},
+    knockout=[("1A", "2B"), ("1B", "2A")],
+)
+ratings = np.array([2000, 1500, 1500, 1400, 1600, 1600, 1500, 1500])
+
+
+def test_group_standings_are_permutations():
+    simulator = TournamentSimulator(tournament, ratings, 1000, np.random.default_rng(0))
+    standings = simulator.play_group([0, 1, 2, 3])
+
+    assert standings.shape == (1000, 4)
+    assert (np.sort(standings, axis=1) == [0, 1, 2, 3]).all()
+    assert (standings[:, 0] == 0).mean() > 0.5
+
+
+def test_simulate_tournament_probabilities():
+    odds = simulate_tournament(tournament, ratings, 20_000, chunk_size=5000, seed=1)
+
+    assert tournament.stages == ["group", "semi_final", "final", "winner"]
+    assert list(odds.columns) == tournament.stages
+    assert (odds["group"] == 1).all()
+    np.testing.assert_allclose(odds.sum(), [8, 4, 2, 1])
+    assert odds["winner"].idxmax() == "A1"
+    assert (odds.diff(axis=1).iloc[:, 1:] <= 0).all().all()
+
+
+def test_simulate_tournament_workers_match_serial():
+    serial = simulate_tournament(tournament, ratings, 3000, chunk_size=1000, seed=2)
+    parallel = simulate_tournament(
+        tournament, ratings, 3000, n_workers=2, chunk_size=1000, seed=2
+    )
+
+    assert serial.equals(parallel)
+
+
+def test_world_cup_2023_quarter_final_pairings():
+    knockout = WORLD_CUP_2023.knockout
+    quarter_finals = list(zip(knockout[::2], knockout[1::2]))
+
+    assert quarter_finals == [
+        (("1A", "2C"), ("1E", "2G")),
+        (("1C", "2A"), ("1G", "2E")),
+        (("1B", "2D"), ("1F", "2H")),
+        (("1D", "2B"), ("1H", "2F")),
+    ]
@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+
+from predictors.xgb_forest import (
+    create_search,
+    log_candidate_times,
+    post_process_predictions,
+    process_input_data,
+    split_threads,
+)
+
+y_preds = np.array([[0.5, 0.3, 0.2], [0.6, 0.2, 0.2], [0.02, 0.9, 0.08]])
+submission_template = pd.DataFrame({"group": ["A", "Knockout", "Knockout"]})
+
+
+def test_post_process_predictions_redistributes_knockout_draws():
+    submission = post_process_predictions(y_preds, submission_template)
+
+    np.testing.assert_allclose(
+        submission[["p_team1_win", "p_team2_win", "p_draw"]].to_numpy(),
+        [
+            [0.5, 0.3, 0.2],
+            [0.75, 0.25, 0.0],
+            [0.02 + 0.02 / 0.92 * 0.08, 1 - 0.02 - 0.02 / 0.92 * 0.08, 0.0],
+        ],
+    )
+
+
+def test_post_process_predictions_clips():
+    submission = post_process_predictions(
+        y_preds, submission_template, probability_clip=0.05
+    )
+
+    assert submission["p_draw"].tolist() == [0.2, 0.05, 0.05]
+    assert submission["p_team1_win"].min() == 0.05
+    assert (submission["p_team2_win"] <= 0.95).all()
+
+
+def test_split_threads():
+    assert split_threads(8) == (8, 1)
+    assert split_threads(8, search_jobs=2) == (2, 4)
+    assert split_threads(3, search_jobs=5) == (3, 1)
+
+
+def test_cpu_search_logs_each_candidate():
+    rng = np.random.default_rng(0)
+    n = 400
+    df = pd.DataFrame(
+        {
+            "home_rating": rng.integers(1300, 2100, n),
+            "away_rating": rng.integers(1300, 2100, n),
+            "match_type": rng.choice(["MatchType.WORLD_CUP", "MatchType.FRIENDLY"], n),
+            "home_ranking": rng.integers(1, 50, n),
+            "away_ranking": rng.integers(1, 50, n),
+            "home_recent_scored": rng.integers(0, 15, n),
+            "away_recent_scored": rng.integers(0, 15, n),
+            "home_recent_conceded": rng.integers(0, 15, n),
+            "away_recent_conceded": rng.integers(0, 15, n),
+        }
+    )
+    y = np.where(df["home_rating"] > df["away_rating"], 0, 1)
+    y[::4] = 2
+
+    search = create_search("cpu", n_threads=2, cv=3, verbose=0)
+    search.fit(process_input_data(df), y)
+    times = log_candidate_times(search)
+
+    assert search.estimator.tree_method == "hist"
+    assert search.n_jobs == 2
+    assert len(times) > 12
+    assert (times["fit_time"] > 0).all()
+
+
+def test_create_search_defaults_to_cpu():
+    search = create_search(n_threads=2, verbose=0)
+
+    assert search.estimator.get_params()["tree_method"] == "hist"
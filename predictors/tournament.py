@@ -0,0 +1,297 @@
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from itertools import combinations
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from model.entities import MatchType
+from model.instrumentation import add_profile_arguments, finish_profile, start_profile
+from model.ratings import DEFAULT_GOAL_INDEX, ELORater
+from model.results import ResultsDataset
+
+_KNOCKOUT_STAGES = {
+    32: "round_of_32",
+    16: "round_of_16",
+    8: "quarter_final",
+    4: "semi_final",
+    2: "final",
+    1: "winner",
+}
+
+
+@dataclass
+class TournamentFormat:
+    """Group stage followed by a single elimination bracket.
+
+    ``knockout`` pairs group slots such as ``("1A", "2C")`` for the first
+    knockout round; later rounds pair the winners of consecutive matches.
+    """
+
+    groups: Dict[str, List[str]]
+    knockout: List[Tuple[str, str]]
+
+    @property
+    def teams(self) -> List[str]:
+        return [team for group in self.groups.values() for team in group]
+
+    @property
+    def stages(self) -> List[str]:
+        n_teams = 2 * len(self.knockout)
+        stages = ["group"]
+        while n_teams >= 1:
+            stages.append(_KNOCKOUT_STAGES[n_teams])
+            n_teams //= 2
+        return stages
+
+
+WORLD_CUP_2023 = TournamentFormat(
+    groups={
+        "A": ["New Zealand", "Norway", "Philippines", "Switzerland"],
+        "B": ["Australia", "Republic of Ireland", "Nigeria", "Canada"],
+        "C": ["Spain", "Costa Rica", "Zambia", "Japan"],
+        "D": ["England", "Haiti", "Denmark", "China PR"],
+        "E": ["United States", "Vietnam", "Netherlands", "Portugal"],
+        "F": ["France", "Jamaica", "Brazil", "Panama"],
+        "G": ["Sweden", "South Africa", "Italy", "Argentina"],
+        "H": ["Germany", "Morocco", "Colombia", "South Korea"],
+    },
+    knockout=[
+        ("1A", "2C"),
+        ("1E", "2G"),
+        ("1C", "2A"),
+        ("1G", "2E"),
+        ("1B", "2D"),
+        ("1F", "2H"),
+        ("1D", "2B"),
+        ("1H", "2F"),
+    ],
+)
+
+
+class TournamentSimulator:
+    """Plays ``n_simulations`` copies of a tournament side by side.
+
+    Every fixture is played for all simulations at once. Ratings are held per
+    simulation and updated after each match, so a team's form carries through
+    its own simulated tournament.
+    """
+
+    def __init__(
+        self,
+        tournament: TournamentFormat,
+        ratings: np.ndarray,
+        n_simulations: int,
+        rng: np.random.Generator,
+        mean_goals: float = 2.6,
+        k: float = MatchType.WORLD_CUP.value,
+        goal_index: Tuple[float, float, float] = DEFAULT_GOAL_INDEX,
+    ):
+        self.tournament = tournament
+        self.n_simulations = n_simulations
+        self.rng = rng
+        self.mean_goals = mean_goals
+        self.k = k
+        self.goal_index = goal_index
+        # One row per team so a fixed fixture reads a contiguous row
+        self.ratings = np.repeat(
+            np.asarray(ratings, dtype=np.float64)[:, None], n_simulations, axis=1
+        )
+        self._flat_ratings = self.ratings.reshape(-1)
+        self._columns = np.arange(n_simulations)
+
+    def _index(self, team) -> Union[slice, np.ndarray]:
+        if np.isscalar(team):
+            return slice(team * self.n_simulations, (team + 1) * self.n_simulations)
+        return team * self.n_simulations + self._columns
+
+    def goal_index_table(self, max_goal_difference: int) -> np.ndarray:
+        goal_two, goal_offset, goal_scale = self.goal_index
+        goal_difference = np.arange(max_goal_difference + 1)
+        return np.where(
+            goal_difference <= 1,
+            1.0,
+            np.where(
+                goal_difference == 2,
+                goal_two,
+                (goal_offset + goal_difference) / goal_scale,
+            ),
+        )
+
+    def play(self, home, away) -> Tuple[np.ndarray, np.ndarray]:
+        """Play one fixture in every simulation.
+
+        ``home`` and ``away`` are team codes, either one per simulation or a
+        single code shared by all simulations.
+        """
+        home_index = self._index(home)
+        away_index = self._index(away)
+        home_rating = self._flat_ratings[home_index]
+        away_rating = self._flat_ratings[away_index]
+        expected = ELORater.calculate_expected_result(home_rating - away_rating)
+
+        home_goals = self.rng.poisson(self.mean_goals * expected)
+        away_goals = self.rng.poisson(self.mean_goals * (1 - expected))
+
+        goal_difference = home_goals - away_goals
+        margin = np.abs(goal_difference)
+        G = self.goal_index_table(margin.max())[margin]
+        W = 0.5 + 0.5 * np.sign(goal_difference)
+        points_change = np.trunc(self.k * G * (W - expected))
+
+        self._flat_ratings[home_index] = home_rating + points_change
+        self._flat_ratings[away_index] = away_rating - points_change
+        return home_goals, away_goals
+
+    def play_group(self, team_codes: List[int]) -> np.ndarray:
+        n_teams = len(team_codes)
+        points = np.zeros((self.n_simulations, n_teams), dtype=np.int64)
+        goal_difference = np.zeros_like(points)
+        scored = np.zeros_like(points)
+        result_points = np.array([0, 1, 3])
+
+        for i, j in combinations(range(n_teams), 2):
+            home_goals, away_goals = self.play(team_codes[i], team_codes[j])
+            result = np.sign(home_goals - away_goals)
+            points[:, i] += result_points[1 + result]
+            points[:, j] += result_points[1 - result]
+            goal_difference[:, i] += home_goals - away_goals
+            goal_difference[:, j] += away_goals - home_goals
+            scored[:, i] += home_goals
+            scored[:, j] += away_goals
+
+        # Points, goal difference, goals scored, then drawing of lots. Packed
+        # into one key since lexsort over many short rows is much slower.
+        key = (points * 1024 + goal_difference + 512) * 1024 + scored
+        standings = np.argsort(-(key + self.rng.random(key.shape)), axis=-1)
+        return np.asarray(team_codes)[standings]
+
+    def play_knockout(self, home: np.ndarray, away: np.ndarray) -> np.ndarray:
+        home_goals, away_goals = self.play(home, away)
+        penalties = self.rng.random(self.n_simulations) < 0.5
+        home_wins = (home_goals > away_goals) | ((home_goals == away_goals) & penalties)
+        return np.where(home_wins, home, away)
+
+    def run(self) -> np.ndarray:
+        team_codes = {team: code for code, team in enumerate(self.tournament.teams)}
+        n_teams = len(team_codes)
+        reached = [np.full(n_teams, self.n_simulations, dtype=np.int64)]
+
+        slots = {}
+        for group, teams in self.tournament.groups.items():
+            standings = self.play_group([team_codes[team] for team in teams])
+            for position in range(standings.shape[1]):
+                slots[f"{position + 1}{group}"] = standings[:, position]
+
+        remaining = [slots[slot] for pair in self.tournament.knockout for slot in pair]
+        while remaining:
+            reached.append(np.bincount(np.concatenate(remaining), minlength=n_teams))
+            if len(remaining) == 1:
+                break
+            remaining = [
+                self.play_knockout(home, away)
+                for home, away in zip(remaining[::2], remaining[1::2])
+            ]
+
+        return np.stack(reached)
+
+
+def _simulate_chunk(
+    tournament: TournamentFormat,
+    ratings: np.ndarray,
+    n_simulations: int,
+    seed: np.random.SeedSequence,
+    kwargs: Dict,
+) -> np.ndarray:
+    simulator = TournamentSimulator(
+        tournament, ratings, n_simulations, np.random.default_rng(seed), **kwargs
+    )
+    return simulator.run()
+
+
+def simulate_tournament(
+    tournament: TournamentFormat,
+    ratings: np.ndarray,
+    n_simulations: int = 100_000,
+    n_workers: Optional[int] = 1,
+    chunk_size: int = 50_000,
+    seed: Optional[int] = None,
+    **kwargs,
+) -> pd.DataFrame:
+    """Probability of each team reaching each stage of ``tournament``.
+
+    Simulations run in chunks of ``chunk_size`` with one seed per chunk, so the
+    result for a given seed does not depend on ``n_workers``.
+    """
+    chunks = [chunk_size] * (n_simulations // chunk_size)
+    if n_simulations % chunk_size:
+        chunks.append(n_simulations % chunk_size)
+    seeds = np.random.SeedSequence(seed).spawn(len(chunks))
+    args = [
+        (tournament, ratings, chunk, chunk_seed, kwargs)
+        for chunk, chunk_seed in zip(chunks, seeds)
+    ]
+
+    if n_workers == 1:
+        counts = [_simulate_chunk(*chunk_args) for chunk_args in args]
+    else:
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            counts = list(executor.map(_simulate_chunk, *zip(*args)))
+
+    return pd.DataFrame(
+        np.sum(counts, axis=0).T / n_simulations,
+        index=pd.Index(tournament.teams, name="team"),
+        columns=tournament.stages,
+    )
+
+
+def get_tournament_ratings(
+    results: ResultsDataset, tournament: TournamentFormat, date: datetime
+) -> np.ndarray:
+    ratings = []
+    for team_name in tournament.teams:
+        team = results.team_registry.get(results.remap_team_name(team_name))
+        if team is None:
+            raise KeyError(f"Unknown team {team_name}")
+        ratings.append(team.get_rating(date))
+    return np.array(ratings, dtype=np.float64)
+
+
+if __name__ == "__main__":
+    from data_ingestor.ingestor import create_dataset_from_file
+
+    parser = ArgumentParser()
+    parser.add_argument("raw_data", help="Match results file to rate teams", type=Path)
+    parser.add_argument("--date", type=str, default="2023-07-20")
+    parser.add_argument("--n_simulations", type=int, default=100_000)
+    parser.add_argument("--n_workers", type=int, default=None)
+    parser.add_argument("--chunk_size", type=int, default=50_000)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--output_file", type=str, default="tournament_odds.csv")
+
+    add_profile_arguments(parser)
+
+    args = parser.parse_args()
+    start_profile(args)
+    try:
+        results = create_dataset_from_file(args.raw_data)
+        ratings = get_tournament_ratings(
+            results, WORLD_CUP_2023, datetime.strptime(args.date, "%Y-%m-%d")
+        )
+        odds = simulate_tournament(
+            WORLD_CUP_2023,
+            ratings,
+            n_simulations=args.n_simulations,
+            n_workers=args.n_workers,
+            chunk_size=args.chunk_size,
+            seed=args.seed,
+        )
+        odds = odds.sort_values("winner", ascending=False)
+        print(odds.head(10))
+        odds.to_csv(args.output_file)
+    finally:
+        finish_profile(args)
@@ -1,44 +1,85 @@
+import os
+import time
 from argparse import ArgumentParser
 from datetime import datetime
 from pathlib import Path
+from typing import Optional, Tuple
 
 import numpy as np
 import pandas as pd
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401
 from sklearn.metrics import log_loss
-from sklearn.model_selection import GridSearchCV, train_test_split
+from sklearn.model_selection import (
+    GridSearchCV,
+    HalvingGridSearchCV,
+    train_test_split,
+)
 from xgboost import XGBClassifier
 
+from model.entities import MatchType
+from model.instrumentation import add_profile_arguments, finish_profile, start_profile
+
+# Fixed so a batch holding only some match types gets the same category codes
+# as the training data, which saw all of them
+MATCH_TYPE_CATEGORIES = sorted(match_type.name for match_type in MatchType)
+
+TREE_METHODS = {"gpu": "gpu_hist", "cpu": "hist"}
+
+PARAMETERS = {
+    "max_depth": range(2, 5, 1),
+    "n_estimators": range(20, 100, 40),
+    "learning_rate": [0.1, 0.05],
+}
+
+FEATURE_COLUMNS = [
+    "home_rating",
+    "away_rating",
+    "match_type",
+    "home_ranking",
+    "away_ranking",
+    "home_recent_scored",
+    "away_recent_scored",
+    "home_recent_conceded",
+    "away_recent_conceded",
+]
+
 
 def remove_enum_from_str(name: str) -> str:
     return name.split(".")[-1]
 
 
+def adjust_probabilities(
+    y_preds: np.ndarray, knockout: np.ndarray, probability_clip: float = 0.0
+) -> np.ndarray:
+    """Return team1 win, team2 win and draw probabilities as rows."""
+    p_team1_win, p_team2_win, p_draw = probabilities = np.array(
+        y_preds, dtype=np.float64
+    ).T.copy()
+
+    # Knockout matches cannot be drawn, so share the draw probability out
+    # between the teams in proportion to their win probabilities
+    p1, p2, p_ko_draw = p_team1_win[knockout], p_team2_win[knockout], p_draw[knockout]
+    p_team1_win[knockout] = p1 + p1 / (p1 + p2) * p_ko_draw
+    p_team2_win[knockout] = p2 + p2 / (p1 + p2) * p_ko_draw
+    p_draw[knockout] = 0
+
+    return np.clip(
+        probabilities, probability_clip, 1 - probability_clip, out=probabilities
+    )
+
+
 def post_process_predictions(
-    y_preds: np.ndarray, submission_template: pd.DataFrame
+    y_preds: np.ndarray,
+    submission_template: pd.DataFrame,
+    probability_clip: float = 0.0,
 ) -> pd.DataFrame:
     submission = submission_template.copy()
-    submission["p_team1_win"] = y_preds[:, 0]
-    submission["p_team2_win"] = y_preds[:, 1]
-    submission["p_draw"] = y_preds[:, 2]
-
-    for idx, row in submission.iterrows():
-        if row["group"] == "Knockout":
-            p1_adjusted = (
-                row["p_team1_win"]
-                + row["p_team1_win"]
-                / (row["p_team1_win"] + row["p_team2_win"])
-                * row["p_draw"]
-            )
-            p2_adjusted = (
-                row["p_team2_win"]
-                + row["p_team2_win"]
-                / (row["p_team1_win"] + row["p_team2_win"])
-                * row["p_draw"]
-            )
-            submission.loc[idx, "p_team1_win"] = p1_adjusted
-            submission.loc[idx, "p_team2_win"] = p2_adjusted
-            submission.loc[idx, "p_draw"] = 0
-
+    knockout = (submission["group"] == "Knockout").to_numpy()
+    probabilities = adjust_probabilities(y_preds, knockout, probability_clip)
+    for column, column_probabilities in zip(
+        ["p_team1_win", "p_team2_win", "p_draw"], probabilities
+    ):
+        submission[column] = column_probabilities
     return submission
 
 
@@ -48,20 +89,90 @@ def process_input_data(df: pd.DataFrame) -> pd.DataFrame:
 
     for col in categorical_vars:
         df[col] = df[col].astype("category")
+    df["match_type"] = pd.Categorical(
+        df["match_type"], categories=MATCH_TYPE_CATEGORIES
+    )
 
-    return df[
-        [
-            "home_rating",
-            "away_rating",
-            "match_type",
-            "home_ranking",
-            "away_ranking",
-            "home_recent_scored",
-            "away_recent_scored",
-            "home_recent_conceded",
-            "away_recent_conceded",
-        ]
-    ]
+    return df[FEATURE_COLUMNS]
+
+
+def split_threads(
+    n_threads: int, search_jobs: Optional[int] = None
+) -> Tuple[int, int]:
+    """Split a thread budget between search workers and XGBoost threads.
+
+    The training data is small, so by default every thread runs its own
+    candidate fit and each model gets a single thread.
+    """
+    search_jobs = max(1, min(search_jobs or n_threads, n_threads))
+    return search_jobs, max(1, n_threads // search_jobs)
+
+
+def create_search(
+    mode: str = "cpu",
+    tree_method: Optional[str] = None,
+    n_threads: Optional[int] = None,
+    search_jobs: Optional[int] = None,
+    cv: int = 5,
+    verbose: int = 2,
+):
+    tree_method = tree_method or TREE_METHODS[mode]
+    if mode == "gpu":
+        model = XGBClassifier(
+            objective="multi:softmax",
+            tree_method=tree_method,
+            num_class=3,
+            enable_categorical=True,
+        )
+        return GridSearchCV(
+            estimator=model,
+            param_grid=PARAMETERS,
+            scoring="neg_log_loss",
+            n_jobs=8,
+            cv=cv,
+            verbose=verbose,
+            return_train_score=True,
+        )
+
+    search_jobs, model_jobs = split_threads(n_threads or os.cpu_count(), search_jobs)
+    model = XGBClassifier(
+        objective="multi:softmax",
+        tree_method=tree_method,
+        num_class=3,
+        enable_categorical=True,
+        n_jobs=model_jobs,
+    )
+    # Successive halving: every candidate is scored on a fraction of the
+    # data and only the best third goes on to three times as many samples
+    return HalvingGridSearchCV(
+        estimator=model,
+        param_grid=PARAMETERS,
+        scoring="neg_log_loss",
+        factor=3,
+        min_resources="exhaust",
+        n_jobs=search_jobs,
+        cv=cv,
+        verbose=verbose,
+        random_state=1,
+    )
+
+
+def log_candidate_times(search) -> pd.DataFrame:
+    results = pd.DataFrame(search.cv_results_)
+    times = pd.DataFrame(
+        {
+            "iter": results.get("iter", 0),
+            "n_resources": results.get("n_resources", np.nan),
+            "params": results["params"],
+            "fit_time": results["mean_fit_time"] * search.n_splits_,
+            "score_time": results["mean_score_time"] * search.n_splits_,
+            "score": results["mean_test_score"],
+        }
+    )
+    with pd.option_context("display.max_colwidth", None, "display.width", 200):
+        print(times.to_string(index=False))
+    print(f"Total fit time: {times['fit_time'].sum():.1f}s")
+    return times
 
 
 if __name__ == "__main__":
@@ -91,86 +202,94 @@ if __name__ == "__main__":
         default=0.0,
     )
 
+    parser.add_argument(
+        "--mode",
+        help="cpu uses hist with a thread budget and successive halving, gpu "
+        "runs the full grid search with gpu_hist and needs a CUDA device",
+        choices=list(TREE_METHODS),
+        default="cpu",
+    )
+
     parser.add_argument(
         "--tree_method",
         "-t",
-        help="Tree method for XGBClassifier",
+        help="Tree method for XGBClassifier, defaults to the one for --mode",
         type=str,
-        default="gpu_hist"
+        default=None,
     )
 
-    args = parser.parse_args()
-
-    train_df = pd.read_csv(args.training_data)
-    train_df["date"] = pd.to_datetime(train_df["date"], format="%d/%m/%Y")
-    if args.start_date:
-        start_date = datetime.strptime(args.start_date, "%d/%m/%Y")
-        train_df = train_df[train_df["date"] >= start_date].copy()
+    parser.add_argument(
+        "--n_threads",
+        help="Total threads for --mode cpu, defaults to the CPU count",
+        type=int,
+        default=None,
+    )
 
-    y = train_df.pop("result")
-    X = process_input_data(train_df)
+    parser.add_argument(
+        "--search_jobs",
+        help="Parallel candidate fits for --mode cpu, the rest of the thread "
+        "budget goes to XGBoost",
+        type=int,
+        default=None,
+    )
 
-    X_train, X_val, y_train, y_val = train_test_split(X, y, random_state=1)
+    add_profile_arguments(parser)
 
-    model = XGBClassifier(
-        objective="multi:softmax",
-        tree_method=args.tree_method,
-        num_class=3,
-        enable_categorical=True,
-    )
+    args = parser.parse_args()
+    start_profile(args)
+    try:
+        train_df = pd.read_csv(args.training_data)
+        train_df["date"] = pd.to_datetime(train_df["date"], format="%d/%m/%Y")
+        if args.start_date:
+            start_date = datetime.strptime(args.start_date, "%d/%m/%Y")
+            train_df = train_df[train_df["date"] >= start_date].copy()
 
-    parameters = {
-        "max_depth": range(2, 5, 1),
-        "n_estimators": range(20, 100, 40),
-        "learning_rate": [0.1, 0.05],
-    }
+        y = train_df.pop("result")
+        X = process_input_data(train_df)
 
-    grid_search = GridSearchCV(
-        estimator=model,
-        param_grid=parameters,
-        scoring="neg_log_loss",
-        n_jobs=8,
-        cv=5,
-        verbose=2,
-        return_train_score=True,
-    )
+        X_train, X_val, y_train, y_val = train_test_split(X, y, random_state=1)
 
-    grid_search.fit(X, y)
+        grid_search = create_search(
+            args.mode, args.tree_method, args.n_threads, args.search_jobs
+        )
 
-    test_df = pd.read_csv("womens_test_data.csv")
-    y_test = test_df.pop("result")
-    X_test = process_input_data(test_df)
+        start = time.perf_counter()
+        grid_search.fit(X, y)
+        print(f"Search took {time.perf_counter() - start:.1f}s")
+        log_candidate_times(grid_search)
 
-    y_test_preds = grid_search.best_estimator_.predict_proba(X_test)
+        test_df = pd.read_csv("womens_test_data.csv")
+        y_test = test_df.pop("result")
+        X_test = process_input_data(test_df)
 
-    print(f"Best parameters: {grid_search.best_params_}")
-    print(f"Log loss: {log_loss(y_test, y_test_preds):.3f}")
+        y_test_preds = grid_search.best_estimator_.predict_proba(X_test)
 
-    filename = args.tree_method + "_model.json"
-    print(f"Saving model as {filename}")
-    best_model = grid_search.best_estimator_
-    best_model.save_model(filename)
+        print(f"Best parameters: {grid_search.best_params_}")
+        print(f"Log loss: {log_loss(y_test, y_test_preds):.3f}")
 
-    if args.probability_clip != 0:
-        print(
-            f"Clipped Log loss: {log_loss(y_test, y_test_preds.clip(args.probability_clip, 1-args.probability_clip)):.3f}"
-        )
+        filename = (args.tree_method or TREE_METHODS[args.mode]) + "_model.json"
+        print(f"Saving model as {filename}")
+        best_model = grid_search.best_estimator_
+        best_model.save_model(filename)
 
-    submission_df = pd.read_csv(args.submission_data)
-    X_submission = process_input_data(submission_df)
+        if args.probability_clip != 0:
+            print(
+                f"Clipped Log loss: {log_loss(y_test, y_test_preds.clip(args.probability_clip, 1-args.probability_clip)):.3f}"
+            )
 
-    y_preds = grid_search.best_estimator_.predict_proba(X_submission)
-    np.savetxt("raw_predictions.csv", y_preds, delimiter=",")
+        submission_df = pd.read_csv(args.submission_data)
+        X_submission = process_input_data(submission_df)
 
-    submission_template = pd.read_csv(
-        "./rss-wwc-2023-prediction-competition/submission-template.csv"
-    )
-    submission = post_process_predictions(y_preds, submission_template)
+        y_preds = grid_search.best_estimator_.predict_proba(X_submission)
+        np.savetxt("raw_predictions.csv", y_preds, delimiter=",")
 
-    submission[["p_team1_win", "p_team2_win", "p_draw"]] = (
-        submission[["p_team1_win", "p_team2_win", "p_draw"]]
-        .copy()
-        .clip(args.probability_clip, 1 - args.probability_clip)
-    )
+        submission_template = pd.read_csv(
+            "./rss-wwc-2023-prediction-competition/submission-template.csv"
+        )
+        submission = post_process_predictions(
+            y_preds, submission_template, probability_clip=args.probability_clip
+        )
 
-    submission.to_csv(args.output_file, index=False)
+        submission.to_csv(args.output_file, index=False)
+    finally:
+        finish_profile(args)
@@ -0,0 +1,71 @@
+import sqlite3
+from typing import Iterator, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+
+from model.results import ResultsDataset
+from readers.kaggle import KAGGLE_COLUMNS, KAGGLE_DTYPES, day_aligned_chunks
+
+RESULTS_QUERY = (
+    "SELECT time, competition, home_team, away_team, score_home, score_away, "
+    "neutral FROM results WHERE status = 'FINISHED' ORDER BY time"
+)
+
+
+def results_to_frame(rows: Sequence[Tuple]) -> DataFrame:
+    """Scraped ``(time, competition, home_team, away_team, score_home,
+    score_away, neutral)`` rows laid out like ``read_kaggle_data``.
+
+    The competition is the tournament. The table has no match date, so the
+    day a result was written is used.
+    """
+    time, competition, home_team, away_team, home_score, away_score, neutral = zip(
+        *rows
+    )
+    dates = pd.to_datetime(pd.Series(time))
+    if dates.dt.tz is not None:
+        dates = dates.dt.tz_localize(None)
+    return pd.DataFrame(
+        {
+            "date": dates.dt.normalize(),
+            "home_team": [ResultsDataset.remap_team_name(team) for team in home_team],
+            "away_team": [ResultsDataset.remap_team_name(team) for team in away_team],
+            "home_score": home_score,
+            "away_score": away_score,
+            "tournament": competition,
+            "city": np.nan,
+            "country": np.nan,
+            # SQLite hands booleans back as 0 and 1
+            "neutral": [bool(value) for value in neutral],
+        },
+        columns=KAGGLE_COLUMNS,
+    ).astype(KAGGLE_DTYPES)
+
+
+def read_database_chunks(
+    conn,
+    chunk_size: int = 50_000,
+    query: str = RESULTS_QUERY,
+) -> Iterator[DataFrame]:
+    """Stream finished results from the scraper's ``results`` table.
+
+    On Postgres the rows stay behind a named, server-side cursor and only
+    ``chunk_size`` are held at a time. Each frame ends on a day boundary, so
+    passing the frames in turn to ``append_data_from_df`` never treats part
+    of a day as late results.
+    """
+    if isinstance(conn, sqlite3.Connection):
+        cur = conn.cursor()
+    else:
+        cur = conn.cursor(name="read_results")
+        cur.itersize = chunk_size
+    try:
+        cur.execute(query)
+        yield from day_aligned_chunks(
+            results_to_frame(rows)
+            for rows in iter(lambda: cur.fetchmany(chunk_size), [])
+        )
+    finally:
+        cur.close()
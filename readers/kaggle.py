@@ -1,8 +1,98 @@
 from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional, Union
 
 import pandas as pd
 from pandas import DataFrame
 
+from model.instrumentation import timed
 
-def read_kaggle_data(csv_file: Path) -> DataFrame:
-    return pd.read_csv(csv_file)
+DATE_FORMAT = "%Y-%m-%d"
+
+KAGGLE_COLUMNS = [
+    "date",
+    "home_team",
+    "away_team",
+    "home_score",
+    "away_score",
+    "tournament",
+    "city",
+    "country",
+    "neutral",
+]
+
+# Repeated strings as categories and scores as int8 take a fraction of the
+# memory of object columns and int64
+KAGGLE_DTYPES = {
+    "home_team": "category",
+    "away_team": "category",
+    "home_score": "int8",
+    "away_score": "int8",
+    "tournament": "category",
+    "city": "category",
+    "country": "category",
+    "neutral": "bool",
+}
+
+
+@timed("read_kaggle_data")
+def read_kaggle_data(
+    csv_file: Path, chunksize: Optional[int] = None, engine: Optional[str] = None
+) -> Union[DataFrame, Iterator[DataFrame]]:
+    """Read a results file in the Kaggle layout with ``KAGGLE_DTYPES``.
+
+    With ``chunksize``, returns an iterator of frames of about that many rows,
+    each ending on a day boundary as ``day_aligned_chunks`` does. The
+    ``engine`` is passed on to ``pd.read_csv``; ``"pyarrow"`` parses in
+    parallel but needs pyarrow installed and does not support ``chunksize``.
+    """
+    # Header names are matched ignoring surrounding whitespace
+    columns = {
+        column.strip(): column for column in pd.read_csv(csv_file, nrows=0).columns
+    }
+    dtype = {
+        columns[name]: dtype for name, dtype in KAGGLE_DTYPES.items() if name in columns
+    }
+    if chunksize is not None:
+        if engine == "pyarrow":
+            raise ValueError("The pyarrow engine does not support chunksize")
+        chunks = pd.read_csv(csv_file, dtype=dtype, chunksize=chunksize, engine=engine)
+        return day_aligned_chunks(_apply_schema(chunk, columns) for chunk in chunks)
+    return _apply_schema(pd.read_csv(csv_file, dtype=dtype, engine=engine), columns)
+
+
+def _apply_schema(df: DataFrame, columns: Dict[str, str]) -> DataFrame:
+    df = df.rename(
+        columns={column: name for name, column in columns.items() if name != column}
+    )
+    if "date" in df.columns:
+        dates = df["date"]
+        if dates.dtype == object:
+            dates = dates.str.strip()
+        df["date"] = pd.to_datetime(dates, format=DATE_FORMAT)
+    return df
+
+
+def day_aligned_chunks(frames: Iterable[DataFrame]) -> Iterator[DataFrame]:
+    """Frames of results in date order, regrouped to end on day boundaries.
+
+    Each frame's last day is carried into the next one, so passing the
+    frames in turn to ``append_data_from_df`` never treats part of a day as
+    late results.
+    """
+    carried: Optional[DataFrame] = None
+    for df in frames:
+        if carried is not None:
+            # Categories differ between frames, so they are rebuilt afterwards
+            dtypes = {
+                column: "category" if isinstance(dtype, pd.CategoricalDtype) else dtype
+                for column, dtype in df.dtypes.items()
+            }
+            df = pd.concat([carried, df]).astype(dtypes)
+        if df.empty:
+            continue
+        last_day = df["date"] == df["date"].iloc[-1]
+        carried = df[last_day]
+        if not last_day.all():
+            yield df[~last_day].reset_index(drop=True)
+    if carried is not None:
+        yield carried.reset_index(drop=True)
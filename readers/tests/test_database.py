@@ -0,0 +1,60 @@
+import sqlite3
+from datetime import datetime
+
+import pandas as pd
+
+from data_ingestor.ingestor import create_dataset_from_db
+from model.results import ResultsDataset
+from readers.database import read_database_chunks
+from readers.kaggle import KAGGLE_COLUMNS
+
+WORLD_CUP = "FIFA World Cup"
+
+
+def results_db():
+    conn = sqlite3.connect(":memory:")
+    conn.execute(
+        "CREATE TABLE results (competition TEXT, neutral BOOLEAN, home_team TEXT, "
+        "away_team TEXT, stage TEXT, score_home INTEGER, score_away INTEGER, "
+        "status TEXT, time TIMESTAMP)"
+    )
+    rows = [
+        ("Spain", "Zambia", 5, 0, "FINISHED", datetime(2023, 7, 26, 12)),
+        ("Japan", "Costa Rica", 2, 0, "FINISHED", datetime(2023, 7, 26, 18)),
+        ("USA", "Netherlands", 1, 1, "FINISHED", datetime(2023, 7, 27, 4)),
+        ("Japan", "Spain", 4, 0, "FINISHED", datetime(2023, 7, 31, 10)),
+        ("Zambia", "Costa Rica", 1, 0, "IN_PLAY", datetime(2023, 7, 31, 10)),
+    ]
+    # The USA match is a friendly, the rest were played at the World Cup
+    conn.executemany(
+        "INSERT INTO results VALUES (?, ?, ?, ?, 'GROUP', ?, ?, ?, ?)",
+        [
+            ("Friendly", False, *row) if row[0] == "USA" else (WORLD_CUP, True, *row)
+            for row in rows
+        ],
+    )
+    return conn
+
+
+def test_chunks_end_on_day_boundaries():
+    chunks = list(read_database_chunks(results_db(), chunk_size=1))
+
+    assert [len(chunk) for chunk in chunks] == [2, 1, 1]
+    assert list(chunks[0].columns) == KAGGLE_COLUMNS
+    assert chunks[1].loc[0, "home_team"] == "United States"
+    assert chunks[1].loc[0, "tournament"] == "Friendly"
+    assert not chunks[1].loc[0, "neutral"]
+    assert chunks[0]["tournament"].tolist() == [WORLD_CUP] * 2
+    assert chunks[0]["neutral"].tolist() == [True, True]
+    assert chunks[0]["date"].tolist() == [pd.Timestamp(2023, 7, 26)] * 2
+
+
+def test_create_dataset_from_db_matches_single_frame():
+    streamed = create_dataset_from_db(results_db(), chunk_size=1)
+    expected = ResultsDataset()
+    expected.append_data_from_df(pd.concat(read_database_chunks(results_db())))
+
+    assert len(streamed.matches) == 4
+    assert streamed.matches == expected.matches
+    assert streamed.teams == expected.teams
+    assert create_dataset_from_db(results_db(), streamed).matches == expected.matches
@@ -1,8 +1,11 @@
 from pathlib import Path
 
+import numpy as np
+import pandas as pd
+import pytest
 from pytest import fixture
 
-from readers.kaggle import read_kaggle_data
+from readers.kaggle import KAGGLE_COLUMNS, read_kaggle_data
 
 
 @fixture(scope="session")
@@ -22,3 +25,45 @@ def test_read_kaggle_data(dummy_csv_file):
     df = read_kaggle_data(Path(dummy_csv_file))
 
     assert len(df) == 2
+
+
+def test_read_kaggle_data_schema(dummy_csv_file):
+    df = read_kaggle_data(Path(dummy_csv_file))
+
+    assert list(df.columns) == list(KAGGLE_COLUMNS)
+    assert df["date"].tolist() == [pd.Timestamp(1969, 11, 1)] * 2
+    assert isinstance(df["home_team"].dtype, pd.CategoricalDtype)
+    assert df["home_team"].tolist() == ["Italy", "Denmark"]
+    assert df["home_score"].dtype == np.int8
+    assert df["neutral"].tolist() == [False, True]
+
+
+def test_read_kaggle_data_chunks(tmp_path, dummy_csv_file):
+    csv_file = tmp_path / "results.csv"
+    csv_file.write_text(
+        dummy_csv_file.read_text()
+        + "1969-11-02,France,Denmark,2,2,Euro,Reims,France,FALSE\n"
+    )
+    chunks = list(read_kaggle_data(csv_file, chunksize=1))
+
+    # Chunks end on day boundaries, so both matches on the first day share one
+    assert [len(chunk) for chunk in chunks] == [2, 1]
+    assert isinstance(chunks[0]["home_team"].dtype, pd.CategoricalDtype)
+    assert chunks[0]["home_team"].tolist() == ["Italy", "Denmark"]
+    assert pd.concat(chunks, ignore_index=True)[["date", "away_score"]].equals(
+        read_kaggle_data(csv_file)[["date", "away_score"]]
+    )
+
+
+def test_read_kaggle_data_pyarrow(tmp_path):
+    pytest.importorskip("pyarrow")
+    csv_file = tmp_path / "results.csv"
+    csv_file.write_text(
+        "date,home_team,away_team,home_score,away_score,tournament,city,country,"
+        "neutral\n1969-11-01,Italy,France,1,0,Euro,Novara,Italy,FALSE\n"
+    )
+
+    df = read_kaggle_data(csv_file, engine="pyarrow")
+
+    assert df["home_score"].dtype == np.int8
+    assert df["date"].tolist() == [pd.Timestamp(1969, 11, 1)]
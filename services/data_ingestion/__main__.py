@@ -3,7 +3,9 @@ from pathlib import Path
 
 import pandas as pd
 
-from data_ingestor.ingestor import create_dataset_from_file
+from data_ingestor.ingestor import create_dataset_from_db, create_dataset_from_file
+from model.instrumentation import add_profile_arguments, finish_profile, start_profile
+from services.database import ConnectionPool
 
 if __name__ == "__main__":
     parser = ArgumentParser()
@@ -23,19 +25,69 @@ if __name__ == "__main__":
         default="submission_data.csv",
     )
 
-    args = parser.parse_args()
+    saved_state = parser.add_mutually_exclusive_group()
+    saved_state.add_argument(
+        "--state_file",
+        help="Saved dataset state; only results newer than it are replayed",
+        type=Path,
+        default=None,
+    )
+    saved_state.add_argument(
+        "--snapshot",
+        help="Directory of a computed dataset snapshot; results in the raw data "
+        "that it does not have yet are added to it",
+        type=Path,
+        default=None,
+    )
+
+    parser.add_argument(
+        "--chunksize",
+        help="Read and rate the raw data this many rows at a time",
+        type=int,
+        default=None,
+    )
 
-    print(f"Reading data from {args.raw_data}...")
-    results = create_dataset_from_file(Path(args.raw_data))
+    parser.add_argument(
+        "--database_url",
+        help="Also ingest the finished results stored by the scraper in this "
+        "database, e.g. $DATABASE_URL or sqlite:///results.db",
+        type=str,
+        default=None,
+    )
+
+    add_profile_arguments(parser)
+
+    args = parser.parse_args()
+    start_profile(args)
+    try:
+        print(f"Reading data from {args.raw_data}...")
+        results = create_dataset_from_file(
+            Path(args.raw_data),
+            state_file=args.state_file,
+            snapshot=args.snapshot,
+            chunksize=args.chunksize,
+        )
 
-    print(f"Reading sample submission from {args.sample_submission}")
-    submission_df = pd.read_csv(args.sample_submission)
+        if args.database_url is not None:
+            print("Reading live results from the database...")
+            pool = ConnectionPool.from_url(args.database_url)
+            try:
+                with pool.connection() as conn:
+                    n_matches = len(results.matches)
+                    create_dataset_from_db(conn, results)
+                    print(f"Added {len(results.matches) - n_matches} live results")
+            finally:
+                pool.close()
 
-    print(f"Generating training output {args.training_output}...")
-    results.write_results_to_csv(Path(args.training_output))
+        print(f"Reading sample submission from {args.sample_submission}")
+        submission_df = pd.read_csv(args.sample_submission)
 
-    print(f"Generating test output {args.submission_output}...")
-    test_df = results.create_test_df(submission_df)
-    test_df.to_csv(args.submission_output, index=False)
+        print(f"Generating training output {args.training_output}...")
+        results.write_results_to_csv(Path(args.training_output))
 
+        print(f"Generating test output {args.submission_output}...")
+        test_df = results.create_test_df(submission_df)
+        test_df.to_csv(args.submission_output, index=False)
+    finally:
+        finish_profile(args)
     print("Done!")
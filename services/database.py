@@ -0,0 +1,54 @@
+import os
+import queue
+import sqlite3
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+
+class ConnectionPool:
+    """Keeps up to ``max_idle`` open connections from ``connect`` for reuse."""
+
+    def __init__(self, connect: Callable, max_idle: int = 4):
+        self.connect = connect
+        self._idle = queue.LifoQueue(maxsize=max_idle)
+
+    @classmethod
+    def from_url(cls, url: str, max_idle: int = 4) -> "ConnectionPool":
+        """Postgres for ``postgres://`` URLs and SQLite for ``sqlite:///path``."""
+        if url.startswith("sqlite:///"):
+            path = url[len("sqlite:///") :]
+            return cls(lambda: sqlite3.connect(path, check_same_thread=False), max_idle)
+
+        def connect():
+            import psycopg2
+
+            return psycopg2.connect(url)
+
+        return cls(connect, max_idle)
+
+    @classmethod
+    def from_env(cls, variable: str = "DATABASE_URL", **kwargs) -> "ConnectionPool":
+        return cls.from_url(os.environ[variable], **kwargs)
+
+    @contextmanager
+    def connection(self) -> Iterator:
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            conn = self.connect()
+        try:
+            yield conn
+        except Exception:
+            conn.close()
+            raise
+        try:
+            self._idle.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
@@ -0,0 +1,45 @@
+from argparse import ArgumentParser
+from pathlib import Path
+
+from model.instrumentation import add_profile_arguments, finish_profile, start_profile
+from services.prediction.service import DEFAULT_DATE, PredictionService, create_server
+
+if __name__ == "__main__":
+    parser = ArgumentParser()
+    parser.add_argument(
+        "model", help="Saved XGBoost model, e.g. hist_model.json", type=Path
+    )
+    parser.add_argument(
+        "snapshot", help="Directory of a computed dataset snapshot", type=Path
+    )
+    parser.add_argument("--host", type=str, default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument(
+        "--date",
+        help="Date for fixtures without one, yyyy-mm-dd format",
+        type=str,
+        default=DEFAULT_DATE,
+    )
+
+    add_profile_arguments(parser)
+
+    args = parser.parse_args()
+    start_profile(args)
+    try:
+        print(f"Loading model {args.model} and snapshot {args.snapshot}...")
+        service = PredictionService.from_files(
+            args.model, args.snapshot, default_date=args.date
+        )
+        service.warm_up()
+
+        server = create_server(service, args.host, args.port)
+        print(f"Serving predictions on http://{args.host}:{server.server_address[1]}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            print(f"Latency: {service.stats()}")
+    finally:
+        finish_profile(args)
@@ -0,0 +1,178 @@
+import json
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+from scipy.special import softmax
+from xgboost import XGBClassifier
+
+from model.entities import MatchType
+from model.results import ResultsDataset
+from model.snapshot import load_snapshot
+from predictors.xgb_forest import (
+    FEATURE_COLUMNS,
+    MATCH_TYPE_CATEGORIES,
+    adjust_probabilities,
+)
+
+DEFAULT_DATE = "2023-07-20"
+_FIXTURE_FIELDS = {"team1", "team2", "date", "match_type", "group"}
+
+
+class PredictionService:
+    """Answers fixture queries from a loaded model and an in-memory dataset.
+
+    A fixture is a dict with ``team1`` and ``team2`` and optionally ``date``
+    (yyyy-mm-dd), ``match_type`` (a ``MatchType`` name) and ``group``, where a
+    group of ``"Knockout"`` moves the draw probability onto the two teams.
+    """
+
+    def __init__(
+        self,
+        model: XGBClassifier,
+        results: ResultsDataset,
+        default_date: str = DEFAULT_DATE,
+        max_latencies: int = 10000,
+    ):
+        self.model = model
+        self.results = results
+        self.default_date = default_date
+        self.latencies = deque(maxlen=max_latencies)
+        self.n_requests = 0
+        # Queries only read the dataset; the lock just guards the request stats
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_files(cls, model_path: Path, snapshot: Path, **kwargs):
+        model = XGBClassifier()
+        model.load_model(model_path)
+        return cls(model, load_snapshot(snapshot), **kwargs)
+
+    def predict(self, fixtures: List[Dict]) -> List[Dict]:
+        start = time.perf_counter()
+        predictions = self._predict(fixtures)
+        with self._lock:
+            self.latencies.append(time.perf_counter() - start)
+            self.n_requests += 1
+        return predictions
+
+    def _predict(self, fixtures: List[Dict]) -> List[Dict]:
+        if not fixtures:
+            return []
+        match_types = [
+            MatchType[fixture.get("match_type", "WORLD_CUP")] for fixture in fixtures
+        ]
+        features = self.results.fixture_features(
+            [fixture["team1"] for fixture in fixtures],
+            [fixture["team2"] for fixture in fixtures],
+            [
+                datetime.strptime(fixture.get("date", self.default_date), "%Y-%m-%d")
+                for fixture in fixtures
+            ],
+            match_types,
+        )
+        features["match_type"] = [
+            MATCH_TYPE_CATEGORIES.index(match_type.name) for match_type in match_types
+        ]
+        knockout = np.array(
+            [fixture.get("group") == "Knockout" for fixture in fixtures]
+        )
+
+        y_preds = self.predict_proba(features[FEATURE_COLUMNS].to_numpy(np.float64))
+        p_team1_win, p_team2_win, p_draw = adjust_probabilities(y_preds, knockout)
+        return [
+            {
+                "team1": team1,
+                "team2": team2,
+                "p_team1_win": p1,
+                "p_team2_win": p2,
+                "p_draw": p_d,
+            }
+            for team1, team2, p1, p2, p_d in zip(
+                features["home_team"].tolist(),
+                features["away_team"].tolist(),
+                p_team1_win.tolist(),
+                p_team2_win.tolist(),
+                p_draw.tolist(),
+            )
+        ]
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        # Same probabilities as XGBClassifier.predict_proba without building a
+        # DMatrix from a DataFrame, which dominates the latency of small batches
+        booster = self.model.get_booster()
+        if self.model.objective == "multi:softmax":
+            return softmax(booster.inplace_predict(X, predict_type="margin"), axis=1)
+        return booster.inplace_predict(X)
+
+    def warm_up(self) -> None:
+        team1, team2 = [team.name for team in self.results.teams[:2]]
+        self._predict([{"team1": team1, "team2": team2}])
+
+    def stats(self) -> Dict:
+        latencies = np.array(self.latencies) * 1000
+        stats = {"requests": self.n_requests}
+        if len(latencies):
+            stats["p50_ms"] = float(np.percentile(latencies, 50))
+            stats["p99_ms"] = float(np.percentile(latencies, 99))
+        return stats
+
+
+def validate_fixtures(payload) -> List[Dict]:
+    """The fixtures of a ``/predict`` request body, or ``ValueError``."""
+    if not isinstance(payload, dict) or not isinstance(payload.get("fixtures"), list):
+        raise ValueError("Expected an object with a list of fixtures")
+    for fixture in payload["fixtures"]:
+        if not isinstance(fixture, dict):
+            raise ValueError(f"Fixture {fixture!r} is not an object")
+        for name, value in fixture.items():
+            if name not in _FIXTURE_FIELDS:
+                raise ValueError(f"Unknown fixture field {name!r}")
+            if not isinstance(value, str):
+                raise ValueError(f"Fixture field {name!r} must be a string")
+        for name in ["team1", "team2"]:
+            if name not in fixture:
+                raise ValueError(f"Fixture is missing {name!r}")
+    return payload["fixtures"]
+
+
+def create_server(
+    service: PredictionService, host: str = "127.0.0.1", port: int = 8000
+) -> ThreadingHTTPServer:
+    class PredictionHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path == "/stats":
+                self._send(200, service.stats())
+            elif self.path == "/health":
+                self._send(200, {"status": "ok"})
+            else:
+                self._send(404, {"error": f"Unknown path {self.path}"})
+
+        def do_POST(self):
+            if self.path != "/predict":
+                self._send(404, {"error": f"Unknown path {self.path}"})
+                return
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                fixtures = validate_fixtures(json.loads(self.rfile.read(length)))
+                self._send(200, {"predictions": service.predict(fixtures)})
+            except (KeyError, ValueError) as e:
+                self._send(400, {"error": str(e)})
+
+        def _send(self, status: int, body: Dict) -> None:
+            payload = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format, *args):
+            pass
+
+    return ThreadingHTTPServer((host, port), PredictionHandler)
@@ -0,0 +1,150 @@
+import json
+import threading
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+import numpy as np
+import pandas as pd
+from pytest import approx, fixture, raises
+from xgboost import XGBClassifier
+
+from model.results import ResultsDataset
+from model.snapshot import save_snapshot
+from predictors.xgb_forest import process_input_data
+from services.prediction.service import (
+    PredictionService,
+    create_server,
+    validate_fixtures,
+)
+
+
+@fixture(scope="module")
+def service(tmp_path_factory):
+    df = pd.DataFrame(
+        {
+            "date": ["2022-11-17", "2022-11-19", "2022-11-21", "2022-11-24"],
+            "home_team": ["China", "Norway", "China", "Norway"],
+            "away_team": ["Norway", "Denmark", "Denmark", "United States"],
+            "home_score": [4, 4, 2, 1],
+            "away_score": [0, 0, 2, 2],
+            "tournament": ["FIFA World Cup"] * 4,
+            "city": ["Guangzhou"] * 4,
+            "country": ["China"] * 4,
+            "neutral": [False, True, False, True],
+        }
+    )
+    results = ResultsDataset()
+    results.populate_data_from_df(df, columnar=True)
+    results.calculate_ratings()
+
+    rng = np.random.default_rng(0)
+    train_df = pd.DataFrame(
+        {
+            "home_rating": rng.integers(1300, 2100, 300),
+            "away_rating": rng.integers(1300, 2100, 300),
+            "match_type": rng.choice(
+                ["MatchType.WORLD_CUP", "MatchType.FRIENDLY"], 300
+            ),
+            "home_ranking": rng.integers(1, 50, 300),
+            "away_ranking": rng.integers(1, 50, 300),
+            "home_recent_scored": rng.integers(0, 15, 300),
+            "away_recent_scored": rng.integers(0, 15, 300),
+            "home_recent_conceded": rng.integers(0, 15, 300),
+            "away_recent_conceded": rng.integers(0, 15, 300),
+        }
+    )
+    y = np.where(train_df["home_rating"] > train_df["away_rating"], 0, 1)
+    y[::5] = 2
+    model = XGBClassifier(n_estimators=5, tree_method="hist", enable_categorical=True)
+    model.fit(process_input_data(train_df), y)
+
+    directory = tmp_path_factory.mktemp("service")
+    model.save_model(directory / "model.json")
+    save_snapshot(results, directory / "snapshot")
+    return PredictionService.from_files(
+        directory / "model.json", directory / "snapshot", default_date="2022-12-01"
+    )
+
+
+def test_predict_matches_model(service):
+    fixtures = [
+        {"team1": "China", "team2": "USA"},
+        {"team1": "Norway", "team2": "Denmark", "group": "Knockout"},
+        {"team1": "Denmark", "team2": "China", "match_type": "FRIENDLY"},
+    ]
+    predictions = service.predict(fixtures)
+
+    features = service.results.fixture_features(
+        ["China", "Norway", "Denmark"],
+        ["United States", "Denmark", "China"],
+        pd.Timestamp("2022-12-01"),
+    )
+    features.loc[2, "match_type"] = "MatchType.FRIENDLY"
+    y_preds = service.model.predict_proba(process_input_data(features))
+
+    assert [p["team2"] for p in predictions] == ["United States", "Denmark", "China"]
+    assert predictions[0]["p_team1_win"] == y_preds[0, 0]
+    assert predictions[2]["p_draw"] == y_preds[2, 2]
+    assert predictions[1]["p_draw"] == 0
+    assert predictions[1]["p_team1_win"] + predictions[1]["p_team2_win"] == approx(1)
+    assert service.predict(fixtures[2:]) == predictions[2:]
+    assert service.stats()["requests"] == 2
+
+
+def test_http_server(service):
+    server = create_server(service, port=0)
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        body = json.dumps({"fixtures": [{"team1": "China", "team2": "Norway"}]})
+        request = Request(f"{url}/predict", data=body.encode(), method="POST")
+        with urlopen(request) as response:
+            predictions = json.load(response)["predictions"]
+        with urlopen(f"{url}/stats") as response:
+            stats = json.load(response)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert predictions == service.predict([{"team1": "China", "team2": "Norway"}])
+    assert stats["p99_ms"] >= stats["p50_ms"] > 0
+
+
+def test_http_server_rejects_bad_payloads(service):
+    server = create_server(service, port=0)
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    statuses = []
+    try:
+        for body in [
+            {"home_team": 1},
+            [{"team1": "China", "team2": "Norway"}],
+            {"fixtures": [{"team1": 1, "team2": "Norway"}]},
+        ]:
+            data = json.dumps(body).encode()
+            request = Request(f"{url}/predict", data=data, method="POST")
+            with raises(HTTPError) as error:
+                urlopen(request)
+            statuses.append(error.value.code)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert statuses == [400, 400, 400]
+
+
+def test_validate_fixtures():
+    fixtures = [{"team1": "China", "team2": "Norway", "group": "Knockout"}]
+    assert validate_fixtures({"fixtures": fixtures}) == fixtures
+
+    for payload in [
+        {"fixtures": "China"},
+        {"fixtures": [["China", "Norway"]]},
+        {"fixtures": [{"team1": "China"}]},
+        {"fixtures": [{"team1": "China", "team2": "Norway", "venue": "Perth"}]},
+        {"fixtures": [{"team1": "China", "team2": "Norway", "date": 20230720}]},
+    ]:
+        with raises(ValueError):
+            validate_fixtures(payload)
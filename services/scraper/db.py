@@ -0,0 +1,128 @@
+import sqlite3
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from services.scraper.matches import MatchResult
+
+TABLE_SQL = (
+    "CREATE TABLE IF NOT EXISTS results ("
+    "competition TEXT NOT NULL DEFAULT 'FIFA World Cup', "
+    "neutral BOOLEAN NOT NULL DEFAULT TRUE, home_team TEXT NOT NULL, away_team TEXT NOT NULL, stage TEXT NOT NULL, "
+    "score_home INTEGER, score_away INTEGER, status TEXT, time TIMESTAMP)"
+)
+# Columns added since the table was first created, with their definitions.
+# Rows from before then were World Cup results, read as neutral venues.
+_ADDED_COLUMNS = {
+    "competition": "TEXT NOT NULL DEFAULT 'FIFA World Cup'",
+    "neutral": "BOOLEAN NOT NULL DEFAULT TRUE",
+}
+INDEX_SQL = [
+    # Tables from before results were kept per competition
+    "DROP INDEX IF EXISTS results_fixture",
+    # ON CONFLICT needs a unique index on the conflict target
+    "CREATE UNIQUE INDEX IF NOT EXISTS results_competition_fixture "
+    "ON results (competition, home_team, away_team, stage)",
+]
+
+_COLUMNS = [
+    "competition",
+    "neutral",
+    "home_team",
+    "away_team",
+    "stage",
+    "score_home",
+    "score_away",
+    "status",
+]
+
+# SQLite builds before 3.32 allow at most 999 parameters per statement, and
+# each row binds its columns plus the scrape time
+ROWS_PER_STATEMENT = 999 // (len(_COLUMNS) + 1)
+
+
+def ensure_schema(conn) -> None:
+    """Create the results table, or bring an older one up to date."""
+    with conn:
+        cur = conn.cursor()
+        cur.execute(TABLE_SQL)
+        cur.execute("SELECT * FROM results WHERE 1 = 0")
+        existing = {column[0] for column in cur.description}
+        for name, definition in _ADDED_COLUMNS.items():
+            if name not in existing:
+                cur.execute(f"ALTER TABLE results ADD COLUMN {name} {definition}")
+        for statement in INDEX_SQL:
+            cur.execute(statement)
+
+
+def upsert_sql(n_rows: int, placeholder: str = "%s") -> str:
+    """Multi-row insert that updates a fixture already in the table.
+
+    Rows are only rewritten when their status or score changed, so a
+    repeated scrape leaves finished results and their times alone.
+    """
+    row = "(" + ", ".join([placeholder] * (len(_COLUMNS) + 1)) + ")"
+    return (
+        f"INSERT INTO results ({', '.join(_COLUMNS)}, time) "
+        f"VALUES {', '.join([row] * n_rows)} "
+        "ON CONFLICT (competition, home_team, away_team, stage) DO UPDATE SET "
+        "score_home = excluded.score_home, score_away = excluded.score_away, "
+        "status = excluded.status, time = excluded.time "
+        "WHERE results.status <> excluded.status "
+        "OR results.score_home <> excluded.score_home "
+        "OR results.score_away <> excluded.score_away"
+    )
+
+
+def result_rows(
+    results: Sequence[MatchResult], time: Optional[datetime] = None
+) -> List[Tuple]:
+    """One row per fixture, the last scraped result winning.
+
+    Postgres refuses to update the same row twice in one statement, so
+    duplicate fixtures are dropped here rather than sent.
+    """
+    time = time or datetime.now()
+    rows: Dict[Tuple[str, str, str, str], Tuple] = {}
+    for result in results:
+        key = (
+            result.competition,
+            result.home_team,
+            result.away_team,
+            result.match_stage.value,
+        )
+        rows[key] = (
+            result.competition,
+            result.neutral,
+            result.home_team,
+            result.away_team,
+            result.match_stage.value,
+            result.home_score,
+            result.away_score,
+            result.event_status.value,
+            time,
+        )
+    return list(rows.values())
+
+
+def write_results(
+    conn,
+    results: Sequence[MatchResult],
+    time: Optional[datetime] = None,
+    rows_per_statement: int = ROWS_PER_STATEMENT,
+) -> int:
+    """Upsert a scrape's results in one transaction, returning rows changed."""
+    rows = result_rows(results, time)
+    if not rows:
+        return 0
+    placeholder = "?" if isinstance(conn, sqlite3.Connection) else "%s"
+    changed = 0
+    with conn:
+        cur = conn.cursor()
+        for start in range(0, len(rows), rows_per_statement):
+            batch = rows[start : start + rows_per_statement]
+            cur.execute(
+                upsert_sql(len(batch), placeholder),
+                [value for row in batch for value in row],
+            )
+            changed += cur.rowcount
+    return changed
@@ -0,0 +1,202 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence
+
+from services.database import ConnectionPool
+from services.scraper.db import ensure_schema, write_results
+from services.scraper.matches import MatchResult, MatchStage, current_stage
+from services.scraper.polling import fetch_page, parse_match_rows, row_to_result
+
+
+@dataclass
+class Source:
+    """A competition page; its ``name`` is stored with each of its results.
+
+    Results count as knockout matches from ``knockout_from`` on, and as
+    group matches throughout when it is not set. ``neutral`` competitions
+    are played at neutral venues.
+    """
+
+    name: str
+    url: str
+    knockout_from: Optional[datetime] = None
+    neutral: bool = False
+
+    def match_stage(self, now: Optional[datetime] = None) -> MatchStage:
+        if self.knockout_from is None:
+            return MatchStage.GROUP
+        return current_stage(now, self.knockout_from)
+
+
+def parse_sources(
+    values: Sequence[str],
+    knockout_from: Sequence[str] = (),
+    neutral: Sequence[str] = (),
+) -> List[Source]:
+    """Sources from ``name=url`` strings, a bare URL being its own name.
+
+    ``knockout_from`` holds ``name=yyyy-mm-dd`` strings giving the day each
+    named competition's knockout rounds start, and ``neutral`` the names of
+    competitions played at neutral venues.
+    """
+    sources = []
+    for value in values:
+        name, separator, url = value.partition("=")
+        sources.append(Source(name, url) if separator else Source(value, value))
+
+    by_name = {source.name: source for source in sources}
+    for value in knockout_from:
+        name, _, date = value.rpartition("=")
+        if name not in by_name:
+            raise ValueError(f"No source named {name!r} for {value!r}")
+        by_name[name].knockout_from = datetime.strptime(date, "%Y-%m-%d")
+    for name in neutral:
+        if name not in by_name:
+            raise ValueError(f"No source named {name!r}")
+        by_name[name].neutral = True
+    return sources
+
+
+class BatchWriter:
+    """Collects results from every source and upserts them in batches.
+
+    Writes run in a worker thread so fetches carry on meanwhile; the lock
+    keeps one transaction in flight at a time.
+    """
+
+    def __init__(self, pool: ConnectionPool, batch_size: int = 500):
+        self.pool = pool
+        self.batch_size = batch_size
+        self.pending: List[MatchResult] = []
+        self.n_written = 0
+        self.n_batches = 0
+        self._lock = asyncio.Lock()
+
+    async def add(self, results: List[MatchResult]) -> None:
+        self.pending.extend(results)
+        if len(self.pending) >= self.batch_size:
+            await self.flush()
+
+    async def flush(self) -> None:
+        async with self._lock:
+            batch, self.pending = self.pending, []
+            if batch:
+                self.n_written += await asyncio.to_thread(self._write, batch)
+                self.n_batches += 1
+
+    def _write(self, batch: List[MatchResult]) -> int:
+        with self.pool.connection() as conn:
+            return write_results(conn, batch)
+
+
+async def scrape_source(
+    source: Source,
+    semaphore: asyncio.Semaphore,
+    writer: BatchWriter,
+    match_stage: Optional[MatchStage] = None,
+    timeout: float = 30,
+) -> Dict:
+    timing = {
+        "source": source.name,
+        "wait_seconds": 0.0,
+        "fetch_seconds": 0.0,
+        "parse_seconds": 0.0,
+        "rows": 0,
+        "results": 0,
+        "error": None,
+    }
+    start = time.perf_counter()
+    async with semaphore:
+        fetched = time.perf_counter()
+        timing["wait_seconds"] = fetched - start
+        try:
+            html = await asyncio.to_thread(fetch_page, source.url, timeout)
+        except Exception as e:
+            timing["fetch_seconds"] = time.perf_counter() - fetched
+            timing["error"] = repr(e)
+            return timing
+    parsed = time.perf_counter()
+    timing["fetch_seconds"] = parsed - fetched
+
+    rows = parse_match_rows(html)
+    match_stage = match_stage or source.match_stage()
+    results = [
+        result
+        for result in (
+            row_to_result(row, match_stage, source.name, source.neutral) for row in rows
+        )
+        if result is not None
+    ]
+    timing["parse_seconds"] = time.perf_counter() - parsed
+    timing["rows"] = len(rows)
+    timing["results"] = len(results)
+    await writer.add(results)
+    return timing
+
+
+async def scrape_sources(
+    sources: Sequence[Source],
+    pool: ConnectionPool,
+    max_concurrency: int = 8,
+    batch_size: int = 500,
+    match_stage: Optional[MatchStage] = None,
+    timeout: float = 30,
+) -> List[Dict]:
+    """Fetch every source with at most ``max_concurrency`` requests in flight.
+
+    Each source's results get its own stage unless ``match_stage`` is given.
+    Returns one timing record per source; a failing source records its
+    error without stopping the others.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+    writer = BatchWriter(pool, batch_size)
+    timings = await asyncio.gather(
+        *[
+            scrape_source(source, semaphore, writer, match_stage, timeout)
+            for source in sources
+        ]
+    )
+    await writer.flush()
+    return list(timings)
+
+
+def run_sources(
+    sources: Sequence[Source], pool: ConnectionPool, **kwargs
+) -> List[Dict]:
+    """Scrape ``sources`` once into a database whose schema is already set up."""
+    return asyncio.run(scrape_sources(sources, pool, **kwargs))
+
+
+def format_timing(timing: Dict) -> str:
+    summary = (
+        f"{timing['source']}: {timing['results']} results from {timing['rows']} "
+        f"rows, waited {timing['wait_seconds']:.2f}s, fetched in "
+        f"{timing['fetch_seconds']:.2f}s, parsed in {timing['parse_seconds']:.3f}s"
+    )
+    if timing["error"]:
+        summary += f", failed: {timing['error']}"
+    return summary
+
+
+def poll_sources(
+    sources: Sequence[Source],
+    pool: ConnectionPool,
+    interval: Optional[float] = None,
+    max_polls: Optional[int] = None,
+    **kwargs,
+) -> None:
+    """Scrape ``sources`` every ``interval`` seconds, or once without one."""
+    with pool.connection() as conn:
+        ensure_schema(conn)
+    n_polls = 0
+    while True:
+        start = time.perf_counter()
+        for timing in run_sources(sources, pool, **kwargs):
+            print(format_timing(timing))
+        print(f"Scraped {len(sources)} sources in {time.perf_counter() - start:.2f}s")
+        n_polls += 1
+        if interval is None or n_polls == max_polls:
+            return
+        time.sleep(max(0.0, interval - (time.perf_counter() - start)))
@@ -0,0 +1,48 @@
+from dataclasses import dataclass
+from datetime import datetime
+from enum import Enum
+from typing import Optional
+
+# Results scraped without a named competition come from the World Cup page,
+# under the tournament name used in the Kaggle results
+DEFAULT_COMPETITION = "FIFA World Cup"
+# The 2023 knockout rounds started on the 5th of August
+WORLD_CUP_KNOCKOUT_FROM = datetime(2023, 8, 5)
+
+
+class EventStatus(Enum):
+    PENDING = "PENDING"
+    IN_PLAY = "IN_PLAY"
+    FINISHED = "FINISHED"
+    UNKNOWN = "UNKNOWN"
+
+
+class MatchStage(Enum):
+    GROUP = "GROUP"
+    KNOCKOUT = "KNOCKOUT"
+
+
+@dataclass
+class MatchResult:
+    home_team: str
+    away_team: str
+    home_score: int
+    away_score: int
+    event_status: EventStatus
+    match_stage: MatchStage
+    competition: str = DEFAULT_COMPETITION
+    neutral: bool = True
+
+
+def get_status(event_stage: str) -> EventStatus:
+    if event_stage == "Finished":
+        return EventStatus.FINISHED
+    else:
+        return EventStatus.UNKNOWN
+
+
+def current_stage(
+    now: Optional[datetime] = None, knockout_from: datetime = WORLD_CUP_KNOCKOUT_FROM
+) -> MatchStage:
+    now = now or datetime.now()
+    return MatchStage.GROUP if now < knockout_from else MatchStage.KNOCKOUT
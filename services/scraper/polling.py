@@ -0,0 +1,269 @@
+import hashlib
+import time
+from html.parser import HTMLParser
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.request import urlopen
+
+from services.database import ConnectionPool
+from services.scraper.db import ensure_schema, write_results
+from services.scraper.matches import (
+    DEFAULT_COMPETITION,
+    EventStatus,
+    MatchResult,
+    MatchStage,
+    current_stage,
+    get_status,
+)
+
+ROW_FIELDS = {
+    "event__stage": "stage",
+    "event__participant--home": "home_team",
+    "event__participant--away": "away_team",
+    "event__score--home": "home_score",
+    "event__score--away": "away_score",
+}
+
+# Reads every match row in one script evaluation instead of five
+# find_element round trips per match
+ROWS_SCRIPT = """
+var fields = arguments[0];
+return Array.from(document.querySelectorAll(".event__match")).map(function (row) {
+    var values = {};
+    Object.keys(fields).forEach(function (cls) {
+        var element = row.querySelector("." + cls);
+        values[fields[cls]] = element ? element.textContent.trim() : null;
+    });
+    return values;
+});
+"""
+
+_VOID_TAGS = {"area", "br", "col", "embed", "hr", "img", "input", "link", "meta"}
+
+
+class MatchRowParser(HTMLParser):
+    """Collects the ``ROW_FIELDS`` text of each ``event__match`` element."""
+
+    def __init__(self):
+        super().__init__()
+        self.rows: List[Dict[str, Optional[str]]] = []
+        self._field: Optional[str] = None
+        self._depth = 0
+        self._text: List[str] = []
+
+    def handle_starttag(self, tag, attrs):
+        if self._field is not None:
+            if tag not in _VOID_TAGS:
+                self._depth += 1
+            return
+        classes = (dict(attrs).get("class") or "").split()
+        if "event__match" in classes:
+            self.rows.append(dict.fromkeys(ROW_FIELDS.values()))
+        elif self.rows and tag not in _VOID_TAGS:
+            for cls in classes:
+                if cls in ROW_FIELDS:
+                    self._field = ROW_FIELDS[cls]
+                    self._depth = 0
+                    self._text = []
+                    break
+
+    def handle_endtag(self, tag):
+        if self._field is None:
+            return
+        if self._depth:
+            self._depth -= 1
+            return
+        self.rows[-1][self._field] = " ".join("".join(self._text).split())
+        self._field = None
+
+    def handle_data(self, data):
+        if self._field is not None:
+            self._text.append(data)
+
+
+def parse_match_rows(html: str) -> List[Dict[str, Optional[str]]]:
+    parser = MatchRowParser()
+    parser.feed(html)
+    parser.close()
+    return parser.rows
+
+
+def fetch_page(url: str, timeout: float = 30) -> str:
+    with urlopen(url, timeout=timeout) as response:
+        charset = response.headers.get_content_charset() or "utf-8"
+        return response.read().decode(charset)
+
+
+class HtmlSource:
+    """Fetches the page without a browser; ``file://`` URLs work too."""
+
+    def __init__(self, url: str, timeout: float = 30):
+        self.url = url
+        self.timeout = timeout
+
+    def rows(self) -> List[Dict[str, Optional[str]]]:
+        return parse_match_rows(fetch_page(self.url, self.timeout))
+
+    def close(self) -> None:
+        pass
+
+
+class BrowserSource:
+    """Keeps one browser on the page, which updates live scores itself."""
+
+    def __init__(self, scraper):
+        self.scraper = scraper
+        self._loaded = False
+
+    def rows(self) -> List[Dict[str, Optional[str]]]:
+        if not self._loaded:
+            self.scraper.driver.get(self.scraper.url)
+            self._loaded = True
+        return self.scraper.driver.execute_script(ROWS_SCRIPT, ROW_FIELDS)
+
+    def close(self) -> None:
+        self.scraper.close()
+
+
+def row_to_result(
+    row: Dict[str, Optional[str]],
+    match_stage: MatchStage,
+    competition: str = DEFAULT_COMPETITION,
+    neutral: bool = True,
+) -> Optional[MatchResult]:
+    """A finished result from a scraped row, ``None`` for anything else."""
+    if any(value is None for value in row.values()):
+        return None
+    event_status = get_status(row["stage"])
+    if event_status != EventStatus.FINISHED:
+        return None
+    try:
+        home_score, away_score = int(row["home_score"]), int(row["away_score"])
+    except ValueError:
+        return None
+    return MatchResult(
+        home_team=row["home_team"].replace(" W", ""),
+        away_team=row["away_team"].replace(" W", ""),
+        home_score=home_score,
+        away_score=away_score,
+        event_status=event_status,
+        match_stage=match_stage,
+        competition=competition,
+        neutral=neutral,
+    )
+
+
+def _digest(values) -> bytes:
+    return hashlib.blake2b(repr(values).encode(), digest_size=16).digest()
+
+
+def _row_key(
+    row: Dict[str, Optional[str]], match_stage: MatchStage
+) -> Tuple[str, str, str]:
+    return row["home_team"], row["away_team"], match_stage.value
+
+
+class ChangeDetector:
+    """Remembers a hash per match row and the page, to pass on only changes."""
+
+    def __init__(self):
+        self.page_hash: Optional[bytes] = None
+        self.row_hashes: Dict[Tuple[str, str, str], bytes] = {}
+
+    def changed(
+        self, rows: List[Dict[str, Optional[str]]], match_stage: MatchStage
+    ) -> List[Dict[str, Optional[str]]]:
+        """Rows that are new or differ since the last call for ``match_stage``.
+
+        The same fixture can be played in a group and again in a knockout
+        round, so rows are told apart by their stage as well as their teams.
+        """
+        page_hash = _digest((match_stage.value, rows))
+        if page_hash == self.page_hash:
+            return []
+        self.page_hash = page_hash
+
+        changed = []
+        for row in rows:
+            key = _row_key(row, match_stage)
+            row_hash = _digest(sorted(row.items()))
+            if self.row_hashes.get(key) != row_hash:
+                self.row_hashes[key] = row_hash
+                changed.append(row)
+        return changed
+
+
+class PollingScraper:
+    """Polls ``source`` every ``interval`` seconds and writes changed results.
+
+    Rows whose write fails are forgotten by the change detector, so they
+    are retried on the next poll.
+    """
+
+    def __init__(
+        self,
+        source,
+        pool: ConnectionPool,
+        interval: float = 60,
+        stage: Callable[[], MatchStage] = current_stage,
+        sleep: Callable[[float], None] = time.sleep,
+        competition: str = DEFAULT_COMPETITION,
+        neutral: bool = True,
+    ):
+        self.source = source
+        self.pool = pool
+        self.interval = interval
+        self.stage = stage
+        self.competition = competition
+        self.neutral = neutral
+        self.sleep = sleep
+        self.detector = ChangeDetector()
+        self.n_polls = 0
+        self.n_written = 0
+
+    def poll_once(self) -> List[MatchResult]:
+        """Write the results that changed since the last poll.
+
+        A poll is counted whether it succeeds or raises.
+        """
+        try:
+            return self._poll()
+        finally:
+            self.n_polls += 1
+
+    def _poll(self) -> List[MatchResult]:
+        match_stage = self.stage()
+        rows = self.detector.changed(self.source.rows(), match_stage)
+        results = [
+            result
+            for result in (
+                row_to_result(row, match_stage, self.competition, self.neutral)
+                for row in rows
+            )
+            if result is not None
+        ]
+        if not results:
+            return []
+        try:
+            with self.pool.connection() as conn:
+                self.n_written += write_results(conn, results)
+        except Exception:
+            self.detector.page_hash = None
+            for row in rows:
+                self.detector.row_hashes.pop(_row_key(row, match_stage), None)
+            raise
+        return results
+
+    def run(self, max_polls: Optional[int] = None) -> None:
+        with self.pool.connection() as conn:
+            ensure_schema(conn)
+        while max_polls is None or self.n_polls < max_polls:
+            start = time.monotonic()
+            try:
+                results = self.poll_once()
+            except Exception as e:
+                print(f"Poll failed: {e!r}")
+            else:
+                if results:
+                    print(f"Wrote {len(results)} changed results")
+            if max_polls is None or self.n_polls < max_polls:
+                self.sleep(max(0.0, self.interval - (time.monotonic() - start)))
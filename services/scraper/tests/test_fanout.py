@@ -0,0 +1,99 @@
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+from services.database import ConnectionPool
+from services.scraper.db import ensure_schema
+from services.scraper.fanout import parse_sources, run_sources
+from services.scraper.matches import MatchStage
+
+FIXTURE = (Path(__file__).parent / "data" / "flashscore_live.html").read_bytes()
+
+
+@pytest.fixture
+def server():
+    state = {"active": 0, "max_active": 0}
+    lock = threading.Lock()
+
+    class PageHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            with lock:
+                state["active"] += 1
+                state["max_active"] = max(state["max_active"], state["active"])
+            time.sleep(0.1)
+            with lock:
+                state["active"] -= 1
+            if self.path == "/missing":
+                self.send_error(404)
+                return
+            page = FIXTURE
+            if self.path == "/friendlies":
+                page = page.replace(b"Spain W", b"Brazil W")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(page)))
+            self.end_headers()
+            self.wfile.write(page)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), PageHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}", state
+    server.shutdown()
+    server.server_close()
+
+
+def test_run_sources_bounded_concurrency(server, tmp_path):
+    url, state = server
+    sources = parse_sources(
+        [f"{name}={url}/{name}" for name in ["world_cup", "friendlies", "missing"]]
+        + [f"{url}/qualifiers"],
+        knockout_from=["world_cup=2023-08-05"],
+    )
+    pool = ConnectionPool.from_url(f"sqlite:///{tmp_path / 'results.db'}")
+    with pool.connection() as conn:
+        ensure_schema(conn)
+
+    timings = run_sources(sources, pool, max_concurrency=2)
+    with pool.connection() as conn:
+        rows = conn.execute(
+            "SELECT competition, home_team, away_team, stage FROM results"
+        ).fetchall()
+    pool.close()
+
+    assert state["max_active"] == 2
+    assert [timing["source"] for timing in timings] == [
+        "world_cup",
+        "friendlies",
+        "missing",
+        f"{url}/qualifiers",
+    ]
+    assert [timing["results"] for timing in timings] == [1, 1, 0, 1]
+    assert "404" in timings[2]["error"]
+    assert all(timing["fetch_seconds"] >= 0.1 for timing in timings)
+    # The same fixture is kept once per competition, each with its own stage
+    assert sorted(rows) == [
+        ("friendlies", "Brazil", "Zambia", "GROUP"),
+        (f"{url}/qualifiers", "Spain", "Zambia", "GROUP"),
+        ("world_cup", "Spain", "Zambia", "KNOCKOUT"),
+    ]
+
+
+def test_parse_sources_knockout_from():
+    sources = parse_sources(
+        ["world_cup=https://example.com/wc", "https://example.com/friendlies"],
+        knockout_from=["world_cup=2023-08-05"],
+    )
+
+    assert sources[0].match_stage(datetime(2023, 8, 4)) == MatchStage.GROUP
+    assert sources[0].match_stage(datetime(2023, 8, 5)) == MatchStage.KNOCKOUT
+    assert sources[1].match_stage(datetime(2023, 8, 5)) == MatchStage.GROUP
+    with pytest.raises(ValueError):
+        parse_sources(["https://example.com/wc"], knockout_from=["wc=2023-08-05"])
@@ -0,0 +1,133 @@
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from services.database import ConnectionPool
+from services.scraper.matches import MatchStage
+from services.scraper.polling import (
+    ChangeDetector,
+    HtmlSource,
+    PollingScraper,
+    parse_match_rows,
+)
+
+FIXTURE = Path(__file__).parent / "data" / "flashscore_live.html"
+
+
+def test_parse_match_rows():
+    rows = parse_match_rows(FIXTURE.read_text())
+
+    assert [row["home_team"] for row in rows] == ["Spain W", "Japan W", "Japan W"]
+    assert rows[0] == {
+        "stage": "Finished",
+        "home_team": "Spain W",
+        "away_team": "Zambia W",
+        "home_score": "5",
+        "away_score": "0",
+    }
+    assert rows[1]["stage"] == "67'"
+    assert rows[2]["stage"] is None
+
+
+def test_polling_writes_only_changes(tmp_path):
+    page = tmp_path / "live.html"
+    page.write_text(FIXTURE.read_text())
+    pool = ConnectionPool.from_url(f"sqlite:///{tmp_path / 'results.db'}")
+    sleeps = []
+    scraper = PollingScraper(
+        HtmlSource(page.as_uri()),
+        pool,
+        interval=30,
+        stage=lambda: MatchStage.GROUP,
+        sleep=sleeps.append,
+    )
+
+    scraper.run(max_polls=2)
+    assert scraper.n_written == 1
+    assert len(sleeps) == 1 and 0 < sleeps[0] <= 30
+
+    page.write_text(FIXTURE.read_text().replace("67<span>&apos;</span>", "Finished"))
+    results = scraper.poll_once()
+    assert [(result.home_team, result.away_team) for result in results] == [
+        ("Japan", "Costa Rica")
+    ]
+    with pool.connection() as conn:
+        rows = conn.execute(
+            "SELECT home_team, away_team, score_home, score_away, stage "
+            "FROM results ORDER BY home_team"
+        ).fetchall()
+    pool.close()
+
+    assert rows == [
+        ("Japan", "Costa Rica", 2, 0, "GROUP"),
+        ("Spain", "Zambia", 5, 0, "GROUP"),
+    ]
+
+
+def test_change_detector_keys_rows_by_stage():
+    rows = parse_match_rows(FIXTURE.read_text())
+    detector = ChangeDetector()
+
+    assert detector.changed(rows, MatchStage.GROUP) == rows
+    assert detector.changed(rows, MatchStage.GROUP) == []
+    assert detector.changed(rows, MatchStage.KNOCKOUT) == rows
+    assert len(detector.row_hashes) == 2 * len(rows)
+
+
+class ListSource:
+    def __init__(self, rows):
+        self._rows = rows
+        self.n_calls = 0
+
+    def rows(self):
+        self.n_calls += 1
+        return self._rows
+
+
+def test_failed_write_forgets_rows():
+    finished = parse_match_rows(FIXTURE.read_text())[0]
+    # The same fixture twice with different scores is passed on twice
+    rows = [{**finished, "home_score": "4"}, finished]
+
+    def connect():
+        raise RuntimeError("database unavailable")
+
+    scraper = PollingScraper(
+        ListSource(rows), ConnectionPool(connect), stage=lambda: MatchStage.GROUP
+    )
+    with pytest.raises(RuntimeError):
+        scraper.poll_once()
+    assert scraper.detector.row_hashes == {}
+    assert scraper.detector.page_hash is None
+
+
+def test_failed_writes_count_one_poll_each(tmp_path):
+    def connect():
+        conn = sqlite3.connect(tmp_path / "results.db")
+        # Writes to the results table fail, as with the database down
+        conn.set_authorizer(
+            lambda action, table, *args: (
+                sqlite3.SQLITE_DENY
+                if action == sqlite3.SQLITE_INSERT and table == "results"
+                else sqlite3.SQLITE_OK
+            )
+        )
+        return conn
+
+    source = ListSource(parse_match_rows(FIXTURE.read_text()))
+    sleeps = []
+    scraper = PollingScraper(
+        source,
+        ConnectionPool(connect),
+        interval=30,
+        stage=lambda: MatchStage.GROUP,
+        sleep=sleeps.append,
+    )
+
+    scraper.run(max_polls=4)
+
+    assert scraper.n_polls == 4
+    assert source.n_calls == 4
+    assert len(sleeps) == 3
+    assert scraper.n_written == 0
@@ -0,0 +1,103 @@
+import sqlite3
+from datetime import datetime
+
+from services.database import ConnectionPool
+from services.scraper.db import (
+    ROWS_PER_STATEMENT,
+    ensure_schema,
+    upsert_sql,
+    write_results,
+)
+from services.scraper.matches import EventStatus, MatchResult, MatchStage
+
+
+def result(home_team, away_team, home_score, away_score, status=EventStatus.FINISHED):
+    return MatchResult(
+        home_team, away_team, home_score, away_score, status, MatchStage.GROUP
+    )
+
+
+def test_write_results_upserts_in_one_statement(tmp_path):
+    pool = ConnectionPool.from_url(f"sqlite:///{tmp_path / 'results.db'}")
+    statements = []
+    with pool.connection() as conn:
+        ensure_schema(conn)
+        conn.set_trace_callback(statements.append)
+        changed = write_results(
+            conn,
+            [
+                result("Spain", "Zambia", 1, 0, EventStatus.IN_PLAY),
+                result("Japan", "Zambia", 5, 0),
+                result("Spain", "Zambia", 5, 0),
+            ],
+            time=datetime(2023, 7, 26, 12),
+        )
+    assert changed == 2
+    assert [s.split()[0] for s in statements] == ["BEGIN", "INSERT", "COMMIT"]
+
+    with pool.connection() as conn:
+        changed = write_results(
+            conn,
+            [result("Spain", "Zambia", 5, 0), result("Japan", "Spain", 4, 0)],
+            time=datetime(2023, 7, 31, 12),
+        )
+        rows = conn.execute(
+            "SELECT home_team, away_team, score_home, status, time FROM results "
+            "ORDER BY time, home_team"
+        ).fetchall()
+    pool.close()
+
+    assert changed == 1
+    assert rows == [
+        ("Japan", "Zambia", 5, "FINISHED", "2023-07-26 12:00:00"),
+        ("Spain", "Zambia", 5, "FINISHED", "2023-07-26 12:00:00"),
+        ("Japan", "Spain", 4, "FINISHED", "2023-07-31 12:00:00"),
+    ]
+
+
+def test_write_results_batches_within_sqlite_parameter_limit():
+    assert upsert_sql(ROWS_PER_STATEMENT, "?").count("?") <= 999
+
+    conn = sqlite3.connect(":memory:")
+    ensure_schema(conn)
+    statements = []
+    conn.set_trace_callback(statements.append)
+    n_results = 2 * ROWS_PER_STATEMENT + 1
+    changed = write_results(
+        conn, [result(f"Team {i}", "Zambia", 1, 0) for i in range(n_results)]
+    )
+    conn.close()
+
+    assert changed == n_results
+    assert [s.split()[0] for s in statements].count("INSERT") == 3
+
+
+def test_ensure_schema_upgrades_tables_without_competition():
+    conn = sqlite3.connect(":memory:")
+    conn.execute(
+        "CREATE TABLE results (home_team TEXT NOT NULL, away_team TEXT NOT NULL, "
+        "stage TEXT NOT NULL, score_home INTEGER, score_away INTEGER, status TEXT, "
+        "time TIMESTAMP)"
+    )
+    conn.execute(
+        "CREATE UNIQUE INDEX results_fixture ON results (home_team, away_team, stage)"
+    )
+    conn.execute(
+        "INSERT INTO results VALUES ('Spain', 'Zambia', 'GROUP', 5, 0, 'FINISHED', "
+        "'2023-07-26 12:00:00')"
+    )
+    ensure_schema(conn)
+    ensure_schema(conn)
+
+    friendly = result("Spain", "Zambia", 2, 2)
+    friendly.competition = "Friendly"
+    changed = write_results(
+        conn, [result("Spain", "Zambia", 5, 1), friendly], time=datetime(2023, 8, 1)
+    )
+    rows = conn.execute(
+        "SELECT competition, score_away FROM results ORDER BY competition"
+    ).fetchall()
+    conn.close()
+
+    assert changed == 2
+    assert rows == [("FIFA World Cup", 1), ("Friendly", 2)]
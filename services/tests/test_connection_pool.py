@@ -0,0 +1,23 @@
+import sqlite3
+
+from services.database import ConnectionPool
+
+
+def test_pool_reuses_connections():
+    opened = []
+
+    def connect():
+        opened.append(sqlite3.connect(":memory:"))
+        return opened[-1]
+
+    pool = ConnectionPool(connect, max_idle=1)
+    with pool.connection() as first:
+        pass
+    with pool.connection() as second:
+        with pool.connection() as third:
+            pass
+    pool.close()
+
+    assert first is second
+    assert third is not second
+    assert len(opened) == 2